@@ -0,0 +1,183 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process ICMP echo prober.
+
+Echo requests are sent from unprivileged ICMP datagram sockets
+(``socket(AF_INET, SOCK_DGRAM, IPPROTO_ICMP)``), which Linux allows for
+the groups listed in ``net.ipv4.ping_group_range``. When such a socket
+cannot be opened, or the target is a host name, the ``ping``/``ping6``
+command is executed instead.
+"""
+
+import random
+import socket
+import struct
+import time
+
+import netaddr
+from oslo_log import log as logging
+
+from tacker.agent.linux import utils as linux_utils
+
+
+LOG = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+_ECHO_HEADER = struct.Struct('!BBHHH')
+_ECHO_PAYLOAD = b'tacker-monitor-ping'
+
+# Address families for which an ICMP datagram socket could not be opened.
+_unsupported_families = set()
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(family, seq):
+    # NOTE: The kernel replaces the identifier of datagram ICMP sockets
+    # with the socket's own one and recomputes the checksum for ICMPv6.
+    if family == socket.AF_INET6:
+        return _ECHO_HEADER.pack(ICMPV6_ECHO_REQUEST, 0, 0, 0,
+                                 seq) + _ECHO_PAYLOAD
+    header = _ECHO_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, 0, seq)
+    checksum = _checksum(header + _ECHO_PAYLOAD)
+    return _ECHO_HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum, 0,
+                             seq) + _ECHO_PAYLOAD
+
+
+def _open_socket(family):
+    if family in _unsupported_families:
+        return None
+    proto = (socket.IPPROTO_ICMPV6 if family == socket.AF_INET6
+             else socket.IPPROTO_ICMP)
+    try:
+        return socket.socket(family, socket.SOCK_DGRAM, proto)
+    except OSError as e:
+        LOG.warning("Unprivileged ICMP sockets are not available (%s), "
+                    "falling back to the ping command", e)
+        _unsupported_families.add(family)
+        return None
+
+
+def _receive_replies(sock, family, pending, replied, deadline):
+    reply_type = (ICMPV6_ECHO_REPLY if family == socket.AF_INET6
+                  else ICMP_ECHO_REPLY)
+    while len(replied) < len(set(pending.values())):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        sock.settimeout(remaining)
+        try:
+            data, address = sock.recvfrom(1024)
+        except socket.timeout:
+            return
+        if len(data) < _ECHO_HEADER.size:
+            continue
+        icmp_type, _code, _checksum, _ident, seq = _ECHO_HEADER.unpack_from(
+            data)
+        target = pending.get(seq)
+        if (icmp_type == reply_type and target is not None and
+                netaddr.IPAddress(address[0]) == netaddr.IPAddress(target)):
+            replied.add(target)
+
+
+def _ping_with_socket(sock, family, targets, count, timeout, interval):
+    pending = {}
+    replied = set()
+    seq = random.randint(0, 0xffff)
+    for attempt in range(count):
+        for target in targets:
+            if target in replied:
+                continue
+            seq = (seq + 1) & 0xffff
+            try:
+                sock.sendto(_echo_request(family, seq), (target, 0))
+            except OSError as e:
+                LOG.warning("Cannot send ICMP echo request to %(ip)s: "
+                            "%(error)s", {'ip': target, 'error': e})
+                continue
+            pending[seq] = target
+        wait = timeout if attempt == count - 1 else interval
+        _receive_replies(sock, family, pending, replied,
+                         time.monotonic() + wait)
+        if len(replied) == len(targets):
+            break
+    return {target: target in replied for target in targets}
+
+
+def _ping_with_command(target, count, timeout, interval, **execute_kwargs):
+    cmd_ping = 'ping6' if netaddr.valid_ipv6(target) else 'ping'
+    ping_cmd = [cmd_ping,
+                '-c', count,
+                '-W', timeout,
+                '-i', interval,
+                target]
+    try:
+        linux_utils.execute(ping_cmd, check_exit_code=True,
+                            **execute_kwargs)
+        return True
+    except RuntimeError:
+        return False
+
+
+def ping(targets, count, timeout, interval, **execute_kwargs):
+    """Ping many targets at once.
+
+    Echo requests to all targets of the same address family are sent from
+    a single ICMP datagram socket. A target is reachable when at least one
+    of its ``count`` requests is answered.
+
+    :param targets: list of IP addresses or host names to ping
+    :param count: number of echo requests to send to each target
+    :param timeout: seconds to wait for a response after the last request
+    :param interval: seconds to wait between requests
+    :param execute_kwargs: passed to linux_utils.execute when the ping
+                           command has to be used
+    :return: dict mapping each target to True if it replied, else False
+    """
+    results = {}
+    by_family = {}
+    for target in targets:
+        if netaddr.valid_ipv6(target):
+            by_family.setdefault(socket.AF_INET6, []).append(target)
+        elif netaddr.valid_ipv4(target):
+            by_family.setdefault(socket.AF_INET, []).append(target)
+        else:
+            # NOTE: Host names are resolved by the ping command.
+            results[target] = _ping_with_command(
+                target, count, timeout, interval, **execute_kwargs)
+
+    for family, family_targets in by_family.items():
+        sock = _open_socket(family)
+        if sock is None:
+            for target in family_targets:
+                results[target] = _ping_with_command(
+                    target, count, timeout, interval, **execute_kwargs)
+            continue
+        try:
+            results.update(_ping_with_socket(
+                sock, family, family_targets, int(count), float(timeout),
+                float(interval)))
+        finally:
+            sock.close()
+    return results
@@ -11,10 +11,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import threading
+import time
+
+import eventlet
+from eventlet import queue
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from six.moves.urllib import parse
+import webob.exc
+
 from tacker._i18n import _
 from tacker.vnfm.monitor_drivers.token import Token
 from tacker import wsgi
@@ -36,14 +43,40 @@ OPTS = [
         help=_('Project domain name for alarm monitoring')),
 ]
 
+RECEIVER_OPTS = [
+    cfg.BoolOpt('async_dispatch', default=False,
+        help=_('Accept alarms with 202 and dispatch them to their '
+               'monitoring policy actions in the background')),
+    cfg.IntOpt('dedup_window', default=60, min=0,
+        help=_('Seconds during which alarms for the same VNF, monitoring '
+               'policy and action are dropped after one was accepted, '
+               'when async_dispatch is enabled. 0 disables it')),
+    cfg.IntOpt('queue_size', default=100, min=1,
+        help=_('Maximum number of alarms waiting to be dispatched, when '
+               'async_dispatch is enabled. Further alarms are rejected '
+               'with 503')),
+    cfg.IntOpt('dispatch_workers', default=4, min=1,
+        help=_('Number of alarms dispatched concurrently, when '
+               'async_dispatch is enabled')),
+]
+
 cfg.CONF.register_opts(OPTS, 'alarm_auth')
+cfg.CONF.register_opts(RECEIVER_OPTS, 'alarm_receiver')
 
 
 def config_opts():
-    return [('alarm_auth', OPTS)]
+    return [('alarm_auth', OPTS),
+            ('alarm_receiver', RECEIVER_OPTS)]
 
 
 class AlarmReceiver(wsgi.Middleware):
+    def __init__(self, application):
+        super(AlarmReceiver, self).__init__(application)
+        self._queue = None
+        self._queue_lock = threading.Lock()
+        # Monotonic time at which each deduplication key was last accepted
+        self._accepted = {}
+
     def process_request(self, req):
         LOG.debug('Process request: %s', req)
         if req.method != 'POST':
@@ -52,6 +85,59 @@ class AlarmReceiver(wsgi.Middleware):
         if not self.handle_url(url):
             return
         prefix, info, params = self.handle_url(req.url)
+        if cfg.CONF.alarm_receiver.async_dispatch:
+            return self._accept_alarm(req, prefix, info)
+        self._prepare_request(req, prefix, info)
+
+    def _accept_alarm(self, req, prefix, info):
+        # The credential is part of the key so that alarms which would be
+        # rejected by the trigger API cannot suppress the valid ones.
+        key = tuple(info[3:7])
+        window = cfg.CONF.alarm_receiver.dedup_window
+        # NOTE: The body is read from the client while copying the request,
+        # so this must not be done while holding the lock.
+        req = req.copy()
+        now = time.monotonic()
+        with self._queue_lock:
+            self._accepted = {k: t for k, t in self._accepted.items()
+                              if now - t < window}
+            if key in self._accepted:
+                LOG.debug('Alarm %s dropped as a duplicate', info[3:6])
+                return webob.exc.HTTPAccepted()
+            if self._queue is None:
+                self._start_dispatchers()
+            try:
+                self._queue.put_nowait((req, prefix, info))
+            except queue.Full:
+                LOG.warning('Alarm %s rejected, %d alarms are waiting to '
+                            'be dispatched', info[3:6], self._queue.qsize())
+                return webob.exc.HTTPServiceUnavailable()
+            if window:
+                self._accepted[key] = now
+        return webob.exc.HTTPAccepted()
+
+    def _start_dispatchers(self):
+        self._queue = queue.LightQueue(cfg.CONF.alarm_receiver.queue_size)
+        for _i in range(cfg.CONF.alarm_receiver.dispatch_workers):
+            eventlet.spawn_n(self._dispatch_alarms)
+
+    def _dispatch_alarms(self):
+        while True:
+            self._dispatch_alarm(*self._queue.get())
+
+    def _dispatch_alarm(self, req, prefix, info):
+        try:
+            self._prepare_request(req, prefix, info)
+            response = req.get_response(self.application)
+        except Exception:
+            LOG.exception('Failed to dispatch alarm %s', info[3:6])
+            return
+        if response.status_int >= 400:
+            LOG.warning('Alarm %(alarm)s failed with %(status)s: %(body)s',
+                        {'alarm': info[3:6], 'status': response.status,
+                         'body': response.body})
+
+    def _prepare_request(self, req, prefix, info):
         auth = cfg.CONF.keystone_authtoken
         alarm_auth = cfg.CONF.alarm_auth
         token = Token(username=alarm_auth.username,
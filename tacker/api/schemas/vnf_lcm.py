@@ -226,3 +226,14 @@ heal = {
     },
     'additionalProperties': False,
 }
+
+query_params_v1 = {
+    'type': 'object',
+    'properties': {
+        'filter': {'type': 'string', 'minLength': 1},
+        'exclude_default': {'format': 'exclude_default'},
+        'nextpage_opaque_marker': {'type': 'string', 'minLength': 1,
+                                   'maxLength': 255},
+    },
+    'additionalProperties': False,
+}
@@ -35,11 +35,13 @@ def schema(request_body_schema):
 
     """
 
+    # NOTE: The validator is built once per schema, when the API method is
+    # decorated, as validate() does not modify it.
+    schema_validator = validators._SchemaValidator(request_body_schema)
+
     def add_validator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            schema_validator = validators._SchemaValidator(
-                request_body_schema)
             try:
                 schema_validator.validate(kwargs['body'])
             except KeyError:
@@ -62,6 +64,8 @@ def query_schema(query_params_schema):
                                 query parameters.
     """
 
+    schema_validator = validators._SchemaValidator(query_params_schema)
+
     def add_validator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -80,8 +84,6 @@ def query_schema(query_params_schema):
 
             query_opts = {}
             query_opts.update(req.GET)
-            schema_validator = validators._SchemaValidator(
-                query_params_schema)
             schema_validator.validate(query_opts)
 
             return func(*args, **kwargs)
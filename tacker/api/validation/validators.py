@@ -123,12 +123,13 @@ class _SchemaValidator(object):
 
     """
     validator_org = jsonschema.Draft7Validator
+    validator_cls = jsonschema.validators.extend(validator_org,
+                                                 validators={})
 
     def __init__(self, schema):
-        validator_cls = jsonschema.validators.extend(self.validator_org,
-                                                     validators={})
         format_checker = FormatChecker()
-        self.validator = validator_cls(schema, format_checker=format_checker)
+        self.validator = self.validator_cls(schema,
+                                            format_checker=format_checker)
 
     def validate(self, *args, **kwargs):
         try:
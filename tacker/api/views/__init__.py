@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from six.moves.urllib import parse
 
 from tacker.api.common import attribute_filter
 from tacker.common import exceptions as exception
@@ -20,6 +21,15 @@ from tacker.common import exceptions as exception
 
 class BaseViewBuilder(object):
 
+    @staticmethod
+    def get_next_page_link(request, marker):
+        """Return the Link header to the page following marker."""
+        params = [(key, value) for key, value in request.GET.items()
+                  if key != 'nextpage_opaque_marker']
+        params.append(('nextpage_opaque_marker', marker))
+        return '<%s?%s>; rel="next"' % (request.path_url,
+                                        parse.urlencode(params))
+
     @classmethod
     def validate_filter(cls, filters=None):
         if not filters:
@@ -13,11 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from tacker.api import views as base
 from tacker.common import utils
 from tacker.objects import fields
+from tacker.objects import vnf_instance as _vnf_instance
 
 
-class ViewBuilder(object):
+class ViewBuilder(base.BaseViewBuilder):
+
+    FLATTEN_ATTRIBUTES = _vnf_instance.VnfInstance.FLATTEN_ATTRIBUTES
 
     def _get_links(self, vnf_instance):
         links = {
@@ -54,8 +58,9 @@ class ViewBuilder(object):
 
         return {"_links": links}
 
-    def _get_vnf_instance_info(self, vnf_instance):
-        vnf_instance_dict = vnf_instance.to_dict()
+    def _get_vnf_instance_info(self, vnf_instance, exclude_default=False):
+        vnf_instance_dict = vnf_instance.to_dict(
+            include_instantiated_info=not exclude_default)
         vnf_instance_dict = utils.convert_snakecase_to_camelcase(
             vnf_instance_dict)
 
@@ -70,6 +75,7 @@ class ViewBuilder(object):
     def show(self, vnf_instance):
         return self._get_vnf_instance_info(vnf_instance)
 
-    def index(self, vnf_instances):
-        return [self._get_vnf_instance_info(vnf_instance)
+    def index(self, vnf_instances, exclude_default=False):
+        return [self._get_vnf_instance_info(vnf_instance,
+                                            exclude_default=exclude_default)
                 for vnf_instance in vnf_instances]
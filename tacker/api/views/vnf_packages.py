@@ -77,9 +77,8 @@ class ViewBuilder(base.BaseViewBuilder):
 
         return response
 
-    def index(self, request, vnf_packages, all_fields=True,
-            exclude_fields=None, fields=None, exclude_default=False):
-
+    def _get_include_fields(self, all_fields=True, exclude_fields=None,
+            fields=None, exclude_default=False):
         # Find out which fields are to be returned in the response.
         if all_fields:
             include_fields = set(self.FLATTEN_ATTRIBUTES.keys())
@@ -118,5 +117,28 @@ class ViewBuilder(base.BaseViewBuilder):
 
             include_fields = set(self.FLATTEN_ATTRIBUTES.keys()) - \
                 exclude_fields
+        return include_fields
+
+    def get_expected_attrs(self, all_fields=True, exclude_fields=None,
+            fields=None, exclude_default=False):
+        """Return the relationships of the VNF packages used by index()."""
+        include_fields = self._get_include_fields(all_fields=all_fields,
+            exclude_fields=exclude_fields, fields=fields,
+            exclude_default=exclude_default)
+
+        expected_attrs = []
+        if include_fields.intersection(
+                _vnf_package.VnfPackage.simple_instantiated_attributes):
+            expected_attrs.append('vnfd')
+        if any(field.startswith('softwareImages')
+               for field in include_fields):
+            expected_attrs.append('vnf_deployment_flavours')
+        return expected_attrs
+
+    def index(self, request, vnf_packages, all_fields=True,
+            exclude_fields=None, fields=None, exclude_default=False):
+        include_fields = self._get_include_fields(all_fields=all_fields,
+            exclude_fields=exclude_fields, fields=fields,
+            exclude_default=exclude_default)
         return [self._get_vnf_package(vnf_package,
             include_fields=include_fields)for vnf_package in vnf_packages]
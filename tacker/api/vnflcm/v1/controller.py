@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
 from oslo_utils import uuidutils
 
 import six
@@ -33,6 +34,9 @@ from tacker.vnfm import vim_client
 from tacker import wsgi
 
 
+CONF = cfg.CONF
+
+
 def check_vnf_state(action, instantiation_state=None, task_state=(None,)):
     """Decorator to check vnf states are valid for particular action.
 
@@ -203,11 +207,38 @@ class VnfLcmController(wsgi.Controller):
         return self._view_builder.show(vnf_instance)
 
     @wsgi.response(http_client.OK)
-    @wsgi.expected_errors((http_client.FORBIDDEN))
+    @wsgi.expected_errors((http_client.BAD_REQUEST, http_client.FORBIDDEN))
+    @validation.query_schema(vnf_lcm.query_params_v1)
     def index(self, request):
         context = request.environ['tacker.context']
-        vnf_instances = objects.VnfInstanceList.get_all(context)
-        return self._view_builder.index(vnf_instances)
+
+        filters = self._view_builder.validate_filter(
+            request.GET.get('filter'))
+        exclude_default = 'exclude_default' in request.GET
+
+        # instantiated_vnf_info is not returned with exclude_default, so it
+        # is neither joined nor lazy-loaded.
+        expected_attrs = [] if exclude_default else ['instantiated_vnf_info']
+
+        # One more VNF instance than the page size is requested to find out
+        # whether there is a next page.
+        page_size = CONF.vnf_lcm.list_page_size
+        vnf_instances = objects.VnfInstanceList.get_by_filters(
+            context, filters=filters, expected_attrs=expected_attrs,
+            limit=page_size + 1 if page_size else None,
+            marker=request.GET.get('nextpage_opaque_marker'))
+
+        headers = {}
+        if page_size and len(vnf_instances) > page_size:
+            vnf_instances = vnf_instances[:page_size]
+            headers['Link'] = self._view_builder.get_next_page_link(
+                request, vnf_instances[-1].id)
+
+        result = self._view_builder.index(vnf_instances,
+                                          exclude_default=exclude_default)
+        if headers:
+            return wsgi.ResponseObject(result, headers=headers)
+        return result
 
     @check_vnf_state(action="delete",
         instantiation_state=[fields.VnfInstanceState.NOT_INSTANTIATED],
@@ -14,6 +14,8 @@
 #    under the License.
 
 from io import BytesIO
+import os
+
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import excutils
@@ -21,6 +23,7 @@ from oslo_utils import uuidutils
 import six
 from six.moves import http_client
 import webob
+import webob.static
 import zipfile
 from zipfile import ZipFile
 
@@ -42,6 +45,9 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
+# Maximum number of ranges of a request for VNF package content.
+MAX_BYTE_RANGES = 64
+
 
 class VnfPkgmController(wsgi.Controller):
 
@@ -139,12 +145,32 @@ class VnfPkgmController(wsgi.Controller):
 
         filters = self._view_builder.validate_filter(filters)
 
-        vnf_packages = vnf_package_obj.VnfPackagesList.get_by_filters(
-            request.context, read_deleted='no', filters=filters)
+        # Only load the relationships needed by the requested fields.
+        expected_attrs = self._view_builder.get_expected_attrs(
+            all_fields=all_fields, exclude_fields=exclude_fields,
+            fields=fields, exclude_default=exclude_default)
 
-        return self._view_builder.index(request, vnf_packages,
+        # One more VNF package than the page size is requested to find out
+        # whether there is a next page.
+        page_size = CONF.vnf_package.list_page_size
+        vnf_packages = vnf_package_obj.VnfPackagesList.get_by_filters(
+            request.context, read_deleted='no', filters=filters,
+            expected_attrs=expected_attrs,
+            limit=page_size + 1 if page_size else None,
+            marker=request.GET.get('nextpage_opaque_marker'))
+
+        headers = {}
+        if page_size and len(vnf_packages) > page_size:
+            vnf_packages = vnf_packages[:page_size]
+            headers['Link'] = self._view_builder.get_next_page_link(
+                request, vnf_packages[-1].id)
+
+        result = self._view_builder.index(request, vnf_packages,
                 all_fields=all_fields, exclude_fields=exclude_fields,
                 fields=fields, exclude_default=exclude_default)
+        if headers:
+            return wsgi.ResponseObject(result, headers=headers)
+        return result
 
     @wsgi.response(http_client.NO_CONTENT)
     @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
@@ -188,6 +214,14 @@ class VnfPkgmController(wsgi.Controller):
             raise webob.exc.HTTPConflict(explanation=msg % {"id": id,
                     "onboarding": fields.PackageOnboardingStateType.ONBOARDED})
 
+        # The content of a VNF package cannot change once it is onboarded,
+        # so its hash is used as entity tag.
+        if vnf_package.hash:
+            request.response.etag = vnf_package.hash
+            if vnf_package.hash in request.if_none_match:
+                request.response.status_int = http_client.NOT_MODIFIED
+                return request.response
+
         if vnf_package.size == 0:
 
             try:
@@ -206,39 +240,32 @@ class VnfPkgmController(wsgi.Controller):
 
         return self._download(
             request.response, range_val, id, vnf_package.location_glance_store,
-            zip_file_size)
+            zip_file_size, environ=request.environ)
+
+    def _download(self, response, range_val, uuid, location, zip_file_size,
+                  environ=None):
+        csar_path = glance_store.get_csar_local_path(uuid, location,
+                                                     zip_file_size)
+        if isinstance(range_val, list):
+            return self._download_ranges(response, range_val, uuid, location,
+                                         zip_file_size, csar_path)
 
-    def _download(self, response, range_val, uuid, location, zip_file_size):
         offset, chunk_size = 0, None
         if range_val:
             if isinstance(range_val, webob.byterange.Range):
-                response_end = zip_file_size - 1
-                # NOTE(sameert): webob parsing is zero-indexed.
-                # i.e.,to download first 5 bytes of a 10 byte image,
-                # request should be "bytes=0-4" and the response would be
-                # "bytes 0-4/10".
-                # Range if validated, will never have 'start' object as None.
-                if range_val.start >= 0:
-                    offset = range_val.start
-                else:
-                    # NOTE(sameert): Negative start values needs to be
-                    # processed to allow suffix-length for Range request
-                    # like "bytes=-2" as per rfc7233.
-                    if abs(range_val.start) < zip_file_size:
-                        offset = zip_file_size + range_val.start
-
-                if range_val.end is not None and range_val.end < zip_file_size:
-                    chunk_size = range_val.end - offset
-                    response_end = range_val.end - 1
-                else:
-                    chunk_size = zip_file_size - offset
+                offset, chunk_size, response_end = self._get_range_offsets(
+                    range_val, zip_file_size)
 
             response.status_int = 206
 
         response.headers['Content-Type'] = 'application/zip'
 
-        response.app_iter = self._get_csar_zip_data(uuid,
-            location, offset, chunk_size)
+        if csar_path:
+            response.app_iter = self._get_csar_file_data(
+                csar_path, offset, chunk_size, environ)
+        else:
+            response.app_iter = self._get_csar_zip_data(uuid,
+                location, offset, chunk_size)
         # NOTE(sameert): In case of a full zip download, when
         # chunk_size was none, reset it to zip.size to set the
         # response header's Content-Length.
@@ -252,6 +279,75 @@ class VnfPkgmController(wsgi.Controller):
         response.headers['Content-Length'] = six.text_type(chunk_size)
         return response
 
+    @staticmethod
+    def _get_range_offsets(range_val, zip_file_size):
+        """Return the offset, size and last byte of a validated range."""
+        response_end = zip_file_size - 1
+        offset = 0
+        # NOTE(sameert): webob parsing is zero-indexed.
+        # i.e.,to download first 5 bytes of a 10 byte image,
+        # request should be "bytes=0-4" and the response would be
+        # "bytes 0-4/10".
+        # Range if validated, will never have 'start' object as None.
+        if range_val.start >= 0:
+            offset = range_val.start
+        else:
+            # NOTE(sameert): Negative start values needs to be
+            # processed to allow suffix-length for Range request
+            # like "bytes=-2" as per rfc7233.
+            if abs(range_val.start) < zip_file_size:
+                offset = zip_file_size + range_val.start
+
+        if range_val.end is not None and range_val.end < zip_file_size:
+            chunk_size = range_val.end - offset
+            response_end = range_val.end - 1
+        else:
+            chunk_size = zip_file_size - offset
+        return offset, chunk_size, response_end
+
+    def _download_ranges(self, response, ranges, uuid, location,
+                         zip_file_size, csar_path=None):
+        """Send several ranges as a multipart/byteranges response."""
+        boundary = uuidutils.generate_uuid(dashed=False)
+        parts = []
+        content_length = 0
+        for range_val in ranges:
+            offset, chunk_size, response_end = self._get_range_offsets(
+                range_val, zip_file_size)
+            part_headers = ('\r\n--%s\r\n'
+                            'Content-Type: application/zip\r\n'
+                            'Content-Range: bytes %s-%s/%s\r\n\r\n' % (
+                                boundary, offset, response_end,
+                                zip_file_size)).encode('ascii')
+            data = None
+            if not csar_path:
+                # NOTE: The iterators of the store are opened before the
+                # response is sent, so that an invalid location is still
+                # reported with an error status.
+                data = self._get_csar_zip_data(uuid, location, offset,
+                                               chunk_size)
+            parts.append((part_headers, offset, chunk_size, data))
+            content_length += len(part_headers) + chunk_size
+        closing = ('\r\n--%s--\r\n' % boundary).encode('ascii')
+        content_length += len(closing)
+
+        def _app_iter():
+            for part_headers, offset, chunk_size, data in parts:
+                yield part_headers
+                if data is None:
+                    data = self._get_csar_file_data(csar_path, offset,
+                                                    chunk_size)
+                for chunk in data:
+                    yield chunk
+            yield closing
+
+        response.status_int = 206
+        response.headers['Content-Type'] = (
+            'multipart/byteranges; boundary=%s' % boundary)
+        response.app_iter = _app_iter()
+        response.headers['Content-Length'] = six.text_type(content_length)
+        return response
+
     def _get_csar_zip_data(self, uuid, location, offset=0, chunk_size=None):
         try:
             resp, size = glance_store.load_csar_iter(
@@ -261,15 +357,35 @@ class VnfPkgmController(wsgi.Controller):
             raise webob.exc.HTTPServerError(explanation=msg)
         return resp
 
+    def _get_csar_file_data(self, csar_path, offset=0, chunk_size=None,
+                            environ=None):
+        """Return an iterator over a CSAR read from a local file.
+
+        The file wrapper of the WSGI server, which can send the file with
+        sendfile(), is used when the data ends at the end of the file.
+        """
+        csar_file = open(csar_path, 'rb')
+        file_wrapper = (environ or {}).get('wsgi.file_wrapper')
+        if file_wrapper and (chunk_size is None or offset + chunk_size ==
+                             os.fstat(csar_file.fileno()).st_size):
+            csar_file.seek(offset)
+            return file_wrapper(csar_file)
+
+        limit = offset + chunk_size if chunk_size is not None else None
+        return webob.static.FileIter(csar_file).app_iter_range(
+            seek=offset, limit=limit)
+
     def _get_range_from_request(self, request, zip_file_size):
+        """Return the Range or list of Ranges requested, or None.
+
+        A list is returned when several ranges are requested. Ranges which
+        start after the end of the VNF package are then ignored, and the
+        others are sorted and coalesced when they overlap or are adjacent.
+        """
         range_str = request._headers.environ.get('HTTP_RANGE')
         if range_str is not None:
-            # NOTE(sameert): We do not support multi range requests.
             if ',' in range_str:
-                msg = _("Requests with multiple ranges are not supported in "
-                       "Tacker. You may make multiple single-range requests "
-                       "instead.")
-                raise webob.exc.HTTPBadRequest(explanation=msg)
+                return self._get_ranges(range_str, zip_file_size)
 
             range_ = webob.byterange.Range.parse(range_str)
             if range_ is None:
@@ -288,6 +404,51 @@ class VnfPkgmController(wsgi.Controller):
                     explanation=msg)
             return range_
 
+    def _get_ranges(self, range_str, zip_file_size):
+        unit, _sep, range_specs = range_str.partition('=')
+        range_specs = range_specs.split(',')
+        # NOTE: Limit the number of ranges of a request, which can be used
+        # to amplify the load of the server as described in rfc7233.
+        if len(range_specs) > MAX_BYTE_RANGES:
+            msg = _("Requests with more than %d ranges are not supported "
+                    "in Tacker.") % MAX_BYTE_RANGES
+            raise webob.exc.HTTPBadRequest(explanation=msg)
+
+        ranges = []
+        for range_spec in range_specs:
+            range_ = webob.byterange.Range.parse(
+                '%s=%s' % (unit.strip(), range_spec.strip()))
+            if range_ is None:
+                range_err_msg = _("The byte range passed in the 'Range' "
+                    "header did not match any available byte range in the "
+                    "VNF package file")
+                raise webob.exc.HTTPRequestRangeNotSatisfiable(
+                    explanation=range_err_msg)
+            if range_.start < zip_file_size:
+                offset, chunk_size, _end = self._get_range_offsets(
+                    range_, zip_file_size)
+                ranges.append((offset, offset + chunk_size))
+
+        if not ranges:
+            msg = _("Invalid start positions in Range header. "
+                    "At least one start position MUST be in the inclusive "
+                    "range [0, %s].") % (zip_file_size - 1)
+            raise webob.exc.HTTPRequestRangeNotSatisfiable(explanation=msg)
+
+        # NOTE: Overlapping and adjacent ranges are coalesced as allowed by
+        # rfc7233, so that the bytes sent for a request never exceed the
+        # size of the VNF package.
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        ranges = [webob.byterange.Range(start, end) for start, end in merged]
+        if len(ranges) == 1:
+            return ranges[0]
+        return ranges
+
     @wsgi.response(http_client.ACCEPTED)
     @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
                            http_client.CONFLICT))
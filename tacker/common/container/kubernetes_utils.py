@@ -13,24 +13,150 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
 import re
 import six
 import tempfile
+import threading
+import weakref
 
 from cryptography import fernet
 from kubernetes import client
 from kubernetes.client import api_client
-from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+
+from tacker.common import utils
+import tacker.conf
 
 LOG = logging.getLogger(__name__)
-CONF = cfg.CONF
+CONF = tacker.conf.CONF
+
+# Attributes of auth_plugin which identify the ApiClient built from it.
+_CLIENT_AUTH_ATTRS = ('auth_url', 'username', 'password', 'bearer_token',
+                      'ssl_ca_cert')
+
+# ApiClients keyed by auth_url and a fingerprint of the credentials they
+# were created with.
+_api_client_cache = None
+_api_client_cache_lock = threading.Lock()
+
+
+def _get_api_client_cache():
+    global _api_client_cache
+    if not CONF.vim_client.k8s_api_client_cache_size:
+        return None
+    if _api_client_cache is None:
+        with _api_client_cache_lock:
+            if _api_client_cache is None:
+                _api_client_cache = utils.LRUCache(
+                    CONF.vim_client.k8s_api_client_cache_size,
+                    on_evict=_close_api_client)
+    return _api_client_cache
+
+
+def _close_api_client(cache_key, k8s_client):
+    """Close the connections of an ApiClient dropped from the cache.
+
+    Its CA certificate file is removed once the ApiClient is no longer
+    referenced, as requests in progress may still open connections.
+    """
+    LOG.debug('Closing the Kubernetes API client of %s', cache_key[0])
+    k8s_client.close()
+
+
+def _get_api_client_cache_key(auth_plugin):
+    auth_attrs = {attr: auth_plugin.get(attr) for attr in _CLIENT_AUTH_ATTRS}
+    fingerprint = hashlib.sha256(
+        jsonutils.dump_as_bytes(auth_attrs, sort_keys=True)).hexdigest()
+    return (auth_plugin.get('auth_url'), fingerprint)
+
+
+def is_api_client_cache_enabled():
+    """Whether the CA certificate file of a VIM is managed by the cache.
+
+    Drivers only have to write the CA certificate of a VIM to a temporary
+    file when this returns False.
+    """
+    return bool(CONF.vim_client.k8s_api_client_cache_size)
+
+
+def invalidate_api_clients(auth_url):
+    """Drop the cached ApiClients of the VIMs using a Kubernetes endpoint."""
+    if _api_client_cache is None:
+        return
+    auth_url = (auth_url or '').rstrip('/')
+    for key in _api_client_cache.keys():
+        if (key[0] or '').rstrip('/') == auth_url:
+            k8s_client = _api_client_cache.pop(key)
+            if k8s_client is not None:
+                _close_api_client(key, k8s_client)
+
+
+def _format_ca_cert(ca_cert):
+    ca_cert = re.sub(r'\s', '\n', ca_cert)
+    ca_cert = re.sub(r'BEGIN\nCERT', r'BEGIN CERT', ca_cert)
+    return re.sub(r'END\nCERT', r'END CERT', ca_cert)
+
+
+def _write_ca_cert_file(ca_cert, fingerprint):
+    """Write the CA certificate used by a cached ApiClient.
+
+    Each ApiClient has its own file, prefixed with the fingerprint of the
+    credentials, which is removed with _remove_ca_cert_file() when the
+    ApiClient is garbage collected.
+    """
+    ca_cert_dir = os.path.join(CONF.state_path, 'k8s_ca_certs')
+    os.makedirs(ca_cert_dir, mode=0o700, exist_ok=True)
+    file_descriptor, file_path = tempfile.mkstemp(
+        dir=ca_cert_dir, prefix='%s-' % fingerprint, suffix='.pem')
+    try:
+        with os.fdopen(file_descriptor, 'w') as f:
+            f.write(_format_ca_cert(ca_cert))
+    except (IOError, OSError):
+        _remove_ca_cert_file(file_path)
+        raise Exception('Failed to create %s file', file_path)
+    LOG.debug('ca cert file successfully stored in %s', file_path)
+    return file_path
+
+
+def _remove_ca_cert_file(file_path):
+    try:
+        os.remove(file_path)
+    except OSError as e:
+        LOG.debug('Failed to remove %s: %s', file_path, e)
 
 
 class KubernetesHTTPAPI(object):
 
     def get_k8s_client(self, auth_plugin):
+        """Return the ApiClient of a VIM.
+
+        ApiClients are cached per credentials unless a CA certificate file
+        is given in auth_plugin, in which case that file is only valid
+        until the caller removes it.
+        """
+        cache = _get_api_client_cache()
+        if cache is None or auth_plugin.get('ca_cert_file') is not None:
+            return self._create_k8s_client(auth_plugin)
+
+        cache_key = _get_api_client_cache_key(auth_plugin)
+        k8s_client = cache.get(cache_key)
+        if k8s_client is None:
+            auth_plugin = dict(auth_plugin)
+            ca_cert = utils.none_from_string(auth_plugin.get('ssl_ca_cert'))
+            if ca_cert:
+                auth_plugin['ca_cert_file'] = _write_ca_cert_file(
+                    ca_cert, cache_key[1])
+            k8s_client = self._create_k8s_client(auth_plugin)
+            if ca_cert:
+                weakref.finalize(k8s_client, _remove_ca_cert_file,
+                                 auth_plugin['ca_cert_file'])
+            cache.set(cache_key, k8s_client)
+        return k8s_client
+
+    def _create_k8s_client(self, auth_plugin):
         config = client.Configuration()
         config.host = auth_plugin['auth_url']
         if ('username' in auth_plugin) and ('password' in auth_plugin)\
@@ -70,9 +196,7 @@ class KubernetesHTTPAPI(object):
     @staticmethod
     def create_ca_cert_tmp_file(ca_cert):
         file_descriptor, file_path = tempfile.mkstemp()
-        ca_cert = re.sub(r'\s', '\n', ca_cert)
-        ca_cert = re.sub(r'BEGIN\nCERT', r'BEGIN CERT', ca_cert)
-        ca_cert = re.sub(r'END\nCERT', r'END CERT', ca_cert)
+        ca_cert = _format_ca_cert(ca_cert)
         try:
             with open(file_path, 'w') as f:
                 if six.PY2:
@@ -79,6 +79,28 @@ class Coordinator(object):
         else:
             raise exceptions.LockCreationFailed('Coordinator uninitialized.')
 
+    def join_partitioned_group(self, group_id):
+        """Join a group and return a Tooz partitioner for it.
+
+        The partitioner spreads objects over the group members with a
+        consistent hash ring, which is updated on membership changes
+        by :meth:`run_watchers`.
+
+        :param str group_id: The group name that is used to identify it
+            across all nodes.
+        """
+        # NOTE: Tooz expects group id as a byte string.
+        group_name = (self.prefix + group_id).encode('ascii')
+        if self.coordinator is not None:
+            return self.coordinator.join_partitioned_group(group_name)
+        else:
+            raise exceptions.GroupJoinFailed('Coordinator uninitialized.')
+
+    def run_watchers(self):
+        """Run the callbacks of the group membership changes."""
+        if self.coordinator is not None:
+            return self.coordinator.run_watchers()
+
 
 COORDINATOR = Coordinator(prefix='tacker-')
 
@@ -14,12 +14,17 @@
 #    under the License.
 
 import os
+import posixpath
 import shutil
+import tempfile
 
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 from oslo_utils import excutils
+from oslo_utils import units
+from six.moves.urllib import parse as urlparse
 from toscaparser.tosca_template import ToscaTemplate
+import yaml
 import zipfile
 
 from tacker.common import exceptions
@@ -29,6 +34,10 @@ import tacker.conf
 CONF = tacker.conf.CONF
 LOG = logging.getLogger(__name__)
 
+TOSCA_META = 'TOSCA-Metadata/TOSCA.meta'
+# Files which are always extracted when a VNF package is onboarded.
+DEFINITION_FILE_EXTENSIONS = ('.yaml', '.yml', '.meta')
+
 
 def _check_type(custom_def, node_type, type_list):
     for node_data_type, node_data_type_value in custom_def.items():
@@ -269,10 +278,128 @@ def _get_data_from_csar(tosca, context, id):
     return vnf_data, flavours
 
 
+def _read_yaml_from_zip(zf, file_name):
+    try:
+        data = yaml.safe_load(zf.read(file_name))
+    except (KeyError, yaml.YAMLError):
+        data = None
+    if not isinstance(data, dict):
+        error_msg = ('The file "%s" in the CSAR does not contain valid YAML '
+                     'content.') % file_name
+        raise exceptions.InvalidCSAR(error_msg)
+    return data
+
+
+def _get_main_template(zf):
+    """Return the name of the file to start parsing the VNFD from.
+
+    Only TOSCA.meta, or the YAML file at the root of a CSAR without
+    TOSCA-Metadata directory, is read from the zip.
+    """
+    file_names = zf.namelist()
+    if TOSCA_META in file_names:
+        entry = _read_yaml_from_zip(zf, TOSCA_META).get('Entry-Definitions')
+        if not entry:
+            error_msg = ('The CSAR is missing the required metadata '
+                         '"Entry-Definitions" in "%s".') % TOSCA_META
+            raise exceptions.InvalidCSAR(error_msg)
+        if entry not in file_names:
+            error_msg = ('The "Entry-Definitions" file "%s" defined in the '
+                         'CSAR does not exist.') % entry
+            raise exceptions.InvalidCSAR(error_msg)
+        return entry
+
+    root_files = [file_name for file_name in file_names
+                  if '/' not in file_name and
+                  file_name.endswith(('.yaml', '.yml'))]
+    if len(root_files) != 1:
+        error_msg = ('CSAR file should contain only one root level yaml '
+                     'file. Found "%d" yaml file(s).') % len(root_files)
+        raise exceptions.InvalidCSAR(error_msg)
+    tosca_version = _read_yaml_from_zip(zf, root_files[0]).get(
+        'tosca_definitions_version')
+    if tosca_version == 'tosca_simple_yaml_1_0':
+        error_msg = ('The CSAR does not contain the required file '
+                     '"%s".') % TOSCA_META
+        raise exceptions.InvalidCSAR(error_msg)
+    return root_files[0]
+
+
+def _get_imported_files(imports):
+    for import_def in imports or []:
+        if isinstance(import_def, dict):
+            for value in import_def.values():
+                yield value.get('file') if isinstance(value, dict) else value
+        else:
+            yield import_def
+
+
+def _read_definition_files(zf, main_template):
+    """Read the main template and the templates it imports from the zip.
+
+    :returns: dict of the parsed templates, by file name in the zip
+    """
+    file_names = set(zf.namelist())
+    templates = {}
+    pending = [main_template]
+    while pending:
+        file_name = pending.pop()
+        if file_name in templates:
+            continue
+        templates[file_name] = _read_yaml_from_zip(zf, file_name)
+        for imported_file in _get_imported_files(
+                templates[file_name].get('imports')):
+            if not imported_file:
+                continue
+            imported_path = posixpath.normpath(posixpath.join(
+                posixpath.dirname(file_name), imported_file))
+            # NOTE: Other imports, such as URLs, are resolved by toscaparser.
+            if imported_path in file_names:
+                pending.append(imported_path)
+    return templates
+
+
+def _validate_artifact_files(zf, templates):
+    file_names = set(zf.namelist())
+    for file_name, tpl in templates.items():
+        topology_template = tpl.get('topology_template') or {}
+        node_templates = topology_template.get('node_templates') or {}
+        for node_tpl in node_templates.values():
+            for artifact in (node_tpl.get('artifacts') or {}).values():
+                # NOTE: The short notation of an artifact is its file.
+                if isinstance(artifact, dict):
+                    artifact_file = artifact.get('file')
+                else:
+                    artifact_file = artifact
+                if (not artifact_file or
+                        urlparse.urlparse(artifact_file).scheme):
+                    continue
+                artifact_path = posixpath.normpath(posixpath.join(
+                    posixpath.dirname(file_name), artifact_file))
+                if (posixpath.isabs(artifact_path) or
+                        artifact_path.split(posixpath.sep)[0] == '..'):
+                    error_msg = ('The resource "%s" is outside of the '
+                                 'CSAR.') % artifact_file
+                    raise exceptions.InvalidCSAR(error_msg)
+                if artifact_path not in file_names:
+                    error_msg = ('The resource "%s" does not '
+                                 'exist.') % artifact_file
+                    raise exceptions.InvalidCSAR(error_msg)
+
+
+def _is_extracted_on_demand(zip_info):
+    max_size = CONF.vnf_package.lazy_extract_size * units.Mi
+    return bool(max_size and zip_info.file_size > max_size and
+                not zip_info.filename.endswith(DEFINITION_FILE_EXTENSIONS))
+
+
 def extract_csar_zip_file(file_path, extract_path):
+    """Extract a CSAR, except the large files extract_csar_file() reads."""
     try:
         with zipfile.ZipFile(file_path, 'r') as zf:
-            zf.extractall(extract_path)
+            zf.extractall(extract_path, [
+                zip_info for zip_info in zf.infolist()
+                if not _is_extracted_on_demand(zip_info)])
     except (RuntimeError, zipfile.BadZipfile) as exp:
         with excutils.save_and_reraise_exception():
             LOG.error("Error encountered while extracting "
@@ -283,14 +410,80 @@ def extract_csar_zip_file(file_path, extract_path):
             raise exceptions.InvalidZipFile(path=file_path)
 
 
+def extract_csar_file(package_uuid, file_name):
+    """Return the path of a file of an onboarded CSAR.
+
+    The file is extracted from the CSAR zip if extract_csar_zip_file()
+    left it out.
+
+    :param file_name: path of the file relative to the root of the CSAR
+    :raises InvalidCSAR: if the file is outside of the CSAR or cannot be
+                         extracted from the CSAR zip
+    """
+    csar_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                             package_uuid)
+    dest_path = os.path.realpath(os.path.join(csar_path, file_name))
+    if not dest_path.startswith(os.path.realpath(csar_path) + os.sep):
+        error_msg = ('The resource "%(file)s" is outside of the VNF package '
+                     '%(uuid)s.') % {'file': file_name, 'uuid': package_uuid}
+        raise exceptions.InvalidCSAR(error_msg)
+    if os.path.isfile(dest_path):
+        return dest_path
+
+    zip_path = csar_path + '.zip'
+    temp_path = None
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            with zf.open(file_name) as src:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(dest_path))
+                with os.fdopen(fd, 'wb') as dest:
+                    shutil.copyfileobj(src, dest, units.Mi)
+        os.rename(temp_path, dest_path)
+    except (OSError, KeyError, zipfile.BadZipfile) as exp:
+        LOG.error("Failed to extract %(file)s from csar zip file "
+                  "%(path)s. Error: %(error)s.",
+                  {'file': file_name, 'path': zip_path,
+                   'error': encodeutils.exception_to_unicode(exp)})
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        error_msg = ('The resource "%(file)s" of the VNF package %(uuid)s '
+                     'cannot be extracted.') % {'file': file_name,
+                                                'uuid': package_uuid}
+        raise exceptions.InvalidCSAR(error_msg)
+    return dest_path
+
+
 def load_csar_data(context, package_uuid, zip_path):
 
     extract_zip_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
                                     package_uuid)
+    try:
+        # NOTE: Only the central directory and the definition files are
+        # read here, software images and other large artifacts are neither
+        # read nor extracted.
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            main_template = _get_main_template(zf)
+            _validate_artifact_files(
+                zf, _read_definition_files(zf, main_template))
+    except (RuntimeError, zipfile.BadZipfile) as exp:
+        LOG.error("Error encountered while reading csar zip file %(path)s. "
+                  "Error: %(error)s.",
+                  {'path': zip_path,
+                   'error': encodeutils.exception_to_unicode(exp)})
+        raise exceptions.InvalidZipFile(path=zip_path)
+    except exceptions.InvalidCSAR as exp:
+        with excutils.save_and_reraise_exception():
+            LOG.error("Error processing CSAR file %(path)s for vnf package"
+                      " %(uuid)s: Error: %(error)s. ",
+                      {'path': zip_path, 'uuid': package_uuid,
+                       'error': encodeutils.exception_to_unicode(exp)})
     extract_csar_zip_file(zip_path, extract_zip_path)
 
     try:
-        tosca = ToscaTemplate(zip_path, None, True)
+        tosca = ToscaTemplate(os.path.join(extract_zip_path, main_template),
+                              None, True)
         return _get_data_from_csar(tosca, context, package_uuid)
     except exceptions.InvalidCSAR as exp:
         with excutils.save_and_reraise_exception():
@@ -274,6 +274,10 @@ class LockCreationFailed(TackerException):
     message = _('Unable to create lock. Coordination backend not started.')
 
 
+class GroupJoinFailed(TackerException):
+    message = _('Unable to join group. Coordination backend not started.')
+
+
 class OrphanedObjectError(TackerException):
     msg_fmt = _('Cannot call %(method)s on orphaned %(objtype)s object')
 
@@ -286,6 +290,11 @@ class VNFPackageURLInvalid(Invalid):
     message = _("Failed to open URL %(url)s")
 
 
+class VNFPackageDownloadFailed(TackerException):
+    message = _("Failed to download VNF package from URL %(url)s: "
+                "%(error)s")
+
+
 class VnfPackageLocationInvalid(Invalid):
     message = _("Failed to find location: %(location)s")
 
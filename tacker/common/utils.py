@@ -18,6 +18,7 @@
 
 """Utilities and helper functions."""
 
+import collections
 import functools
 from functools import reduce
 import inspect
@@ -30,6 +31,8 @@ import signal
 import socket
 import string
 import sys
+import threading
+import time
 
 from eventlet.green import subprocess
 import netaddr
@@ -559,6 +562,66 @@ class LimitingReader(object):
         return result
 
 
+class LRUCache(object):
+    """Thread-safe mapping which evicts its least recently used items.
+
+    :param maxsize: maximum number of items kept in the cache
+    :param ttl: seconds after which an item expires once set, or None to
+                keep items until they are evicted
+    :param on_evict: callable called with the key and the value of the items
+                     evicted when the cache is full
+    """
+    def __init__(self, maxsize, ttl=None, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        # Values are stored with the monotonic time at which they expire
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return default
+            value, expires_at = self._items[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        evicted = []
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                evicted.append(self._items.popitem(last=False))
+        if self.on_evict is not None:
+            for evicted_key, (evicted_value, _expires_at) in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._items.pop(key, None)
+        return default if item is None else item[0]
+
+    def keys(self):
+        with self._lock:
+            return list(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
 class MemoryUnit(object):
 
     UNIT_SIZE_DEFAULT = 'B'
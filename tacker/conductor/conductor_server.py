@@ -41,6 +41,7 @@ from tacker.common import topics
 from tacker.common import utils
 from tacker import context as t_context
 from tacker.db.common_services import common_services_db
+from tacker.db.common_services import common_services_db_plugin
 from tacker.db.nfvo import nfvo_db
 from tacker.extensions import nfvo
 from tacker.glance_store import store as glance_store
@@ -51,6 +52,7 @@ from tacker.objects.vnf_package import VnfPackagesList
 from tacker.plugins.common import constants
 from tacker import service as tacker_service
 from tacker import version
+from tacker.vnflcm import utils as vnflcm_utils
 from tacker.vnflcm import vnflcm_driver
 from tacker.vnfm import plugin
 
@@ -130,6 +132,8 @@ def revert_upload_vnf_package(function):
                 # after correcting the csar zip file.
                 vnf_package.onboarding_state = (
                     fields.PackageOnboardingStateType.CREATED)
+                # Clear the number of bytes received before the failure.
+                vnf_package.size = 0
 
                 vnf_package.save()
 
@@ -145,6 +149,7 @@ class Conductor(manager.Manager):
         super(Conductor, self).__init__(host=self.conf.host)
         self.vnfm_plugin = plugin.VNFMPlugin()
         self.vnflcm_driver = vnflcm_driver.VnfLcmDriver()
+        self._cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
 
     def start(self):
         coordination.COORDINATOR.start()
@@ -270,8 +275,21 @@ class Conductor(manager.Manager):
         body = {"address_information": address_information,
                 "user_name": user_name,
                 "password": password}
+
+        def _report_progress(bytes_read):
+            # The size of a package being uploaded is the number of bytes
+            # received so far.
+            vnf_package.size = bytes_read
+            vnf_package.save()
+
+        # The CSAR is written to zip_path while it is stored, so that it does
+        # not need to be read back from glance_store.
+        zip_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                                vnf_package.id + '.zip')
         (location, size, checksum, multihash,
-         loc_meta) = glance_store.store_csar(context, vnf_package.id, body)
+         loc_meta) = glance_store.store_csar(
+            context, vnf_package.id, body,
+            progress_callback=_report_progress, csar_path=zip_path)
 
         vnf_package.onboarding_state = (
             fields.PackageOnboardingStateType.PROCESSING)
@@ -282,7 +300,8 @@ class Conductor(manager.Manager):
         vnf_package.size = size
         vnf_package.save()
 
-        zip_path = glance_store.load_csar(vnf_package.id, location)
+        if not os.path.isfile(zip_path):
+            zip_path = glance_store.load_csar(vnf_package.id, location)
         vnf_data, flavours = csar_utils.load_csar_data(
             context.elevated(), vnf_package.id, zip_path)
 
@@ -300,6 +319,7 @@ class Conductor(manager.Manager):
                 fields.PackageOnboardingStateType.ONBOARDED):
 
             _delete_csar(context, vnf_package)
+            vnflcm_utils.invalidate_vnf_package_cache(vnf_package.id)
 
         vnf_package.destroy(context)
 
@@ -407,6 +427,25 @@ class Conductor(manager.Manager):
                             {'zip': csar_path, 'folder': csar_zip_temp_path,
                              'uuid': vnf_pack.id})
 
+    @periodic_task.periodic_task(spacing=CONF.events.purge_interval)
+    def _run_purge_events(self, context):
+        """Delete the events older than CONF.events.retention_period"""
+
+        if not CONF.events.retention_period:
+            return
+        before = timeutils.utcnow() - datetime.timedelta(
+            seconds=CONF.events.retention_period)
+        try:
+            deleted = self._cos_db_plg.purge_events(
+                context.elevated(), before, CONF.events.purge_batch_size)
+        except Exception as e:
+            LOG.error("Failed to purge events older than %(before)s: "
+                      "%(error)s", {'before': before, 'error': e})
+            return
+        if deleted:
+            LOG.info("Purged %(count)d events older than %(before)s",
+                     {'count': deleted, 'before': before})
+
     @coordination.synchronized('{vnf_instance[id]}')
     def instantiate(self, context, vnf_instance, instantiate_vnf):
         # Check if vnf is already instantiated.
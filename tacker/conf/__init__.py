@@ -18,6 +18,9 @@ from oslo_config import cfg
 
 from tacker.conf import conductor
 from tacker.conf import coordination
+from tacker.conf import events
+from tacker.conf import vim_client
+from tacker.conf import vnf_lcm
 from tacker.conf import vnf_package
 
 CONF = cfg.CONF
@@ -26,4 +29,7 @@ CONF.import_group('keystone_authtoken', 'keystonemiddleware.auth_token')
 vnf_package.register_opts(CONF)
 conductor.register_opts(CONF)
 coordination.register_opts(CONF)
+events.register_opts(CONF)
+vim_client.register_opts(CONF)
+vnf_lcm.register_opts(CONF)
 glance_store.register_opts(CONF)
@@ -0,0 +1,91 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+
+CONF = cfg.CONF
+
+OPTS = [
+    cfg.BoolOpt('async_write',
+                default=False,
+                help=_("""
+Write VNF events to the database from a background thread.
+
+Events are queued in memory and written in batches with multi-row
+inserts, instead of one insert per event in the code path that logs it.
+Queued events are lost if the process is killed before they are written.
+
+Related options:
+    * batch_size
+    * flush_interval
+    * max_queue_size
+    * queue_timeout
+""")),
+    cfg.IntOpt('batch_size',
+               default=100,
+               min=1,
+               help=_("Maximum number of events written with a single "
+                      "insert")),
+    cfg.FloatOpt('flush_interval',
+                 default=1.0,
+                 min=0,
+                 help=_("Number of seconds an event may wait in the queue "
+                        "for its batch to fill up before it is written")),
+    cfg.IntOpt('max_queue_size',
+               default=10000,
+               min=1,
+               help=_("Maximum number of events waiting to be written")),
+    cfg.FloatOpt('queue_timeout',
+                 default=5.0,
+                 min=0,
+                 help=_("Number of seconds to wait for room in a full queue "
+                        "before writing the event synchronously")),
+    cfg.IntOpt('retention_period',
+               default=0,
+               min=0,
+               help=_("""
+Number of seconds events are kept in the database.
+
+Older events are deleted by a periodic task of tacker-conductor. Events are
+kept forever when set to 0.
+
+Related options:
+    * purge_interval
+    * purge_batch_size
+""")),
+    cfg.IntOpt('purge_interval',
+               default=3600,
+               min=1,
+               help=_("Seconds between runs of the periodic task deleting "
+                      "the events older than retention_period")),
+    cfg.IntOpt('purge_batch_size',
+               default=1000,
+               min=1,
+               help=_("Maximum number of events deleted in a single "
+                      "transaction")),
+]
+
+events_group = cfg.OptGroup('events',
+    title='events options',
+    help="""
+Options under this group are used to write the events of VNFs.
+""")
+
+
+def register_opts(conf):
+    conf.register_group(events_group)
+    conf.register_opts(OPTS, group=events_group)
+
+
+def list_opts():
+    return {events_group: OPTS}
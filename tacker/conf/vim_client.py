@@ -0,0 +1,93 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+
+CONF = cfg.CONF
+
+OPTS = [
+    cfg.IntOpt('session_cache_size',
+               default=64,
+               min=0,
+               help=_("""
+Maximum number of Keystone sessions to VIMs kept in memory.
+
+A session is shared by all the clients created with the same credentials,
+so that its token is reused until it is about to expire and its HTTP
+connections are kept open. The least recently used sessions are closed
+when the cache is full.
+
+Possible values:
+    * 0 to create a new session for each client
+    * Any positive number
+""")),
+    cfg.IntOpt('k8s_api_client_cache_size',
+               default=64,
+               min=0,
+               help=_("""
+Maximum number of Kubernetes API clients to VIMs kept in memory.
+
+An API client is shared by all the requests made with the same
+credentials, so that its HTTP connections are kept open. The CA
+certificate of a VIM is written once per API client to
+$state_path/k8s_ca_certs instead of a temporary file for each request. The
+least recently used clients are closed when the cache is full, and their
+CA certificate files are removed.
+
+Possible values:
+    * 0 to create a new API client for each request
+    * Any positive number
+""")),
+    cfg.IntOpt('auth_cache_size',
+               default=64,
+               min=0,
+               help=_("""
+Maximum number of VIMs whose decrypted credentials are kept in memory.
+
+Decrypting the credentials of a VIM requires to read its fernet key from
+the file system or Barbican. Decrypted credentials are only kept in
+memory, and are decrypted again when the VIM is updated. The least
+recently used ones are dropped when the cache is full.
+
+Possible values:
+    * 0 to decrypt the credentials of a VIM each time they are used
+    * Any positive number
+
+Related options:
+    * auth_cache_ttl
+""")),
+    cfg.IntOpt('auth_cache_ttl',
+               default=300,
+               min=1,
+               help=_("""
+Seconds during which the decrypted credentials of a VIM are kept in memory.
+
+Related options:
+    * auth_cache_size
+""")),
+]
+
+vim_client_group = cfg.OptGroup('vim_client',
+    title='vim_client options',
+    help="""
+Options under this group are used by the clients of VIMs.
+""")
+
+
+def register_opts(conf):
+    conf.register_group(vim_client_group)
+    conf.register_opts(OPTS, group=vim_client_group)
+
+
+def list_opts():
+    return {vim_client_group: OPTS}
@@ -0,0 +1,47 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+
+CONF = cfg.CONF
+
+OPTS = [
+    cfg.IntOpt('list_page_size',
+               default=0,
+               min=0,
+               help=_("""
+Maximum number of VNF instances returned by a single list request.
+
+When more VNF instances match the request, the response contains a Link
+header with rel="next", whose URI contains a nextpage_opaque_marker query
+parameter to get the next page, as described in ETSI GS NFV-SOL 013.
+
+Possible values:
+    * 0 to return all the VNF instances in a single response
+    * Any positive number
+"""))]
+
+vnf_lcm_group = cfg.OptGroup('vnf_lcm',
+    title='vnf_lcm options',
+    help="""
+Options under this group are used by the VNF lifecycle management API.
+""")
+
+
+def register_opts(conf):
+    conf.register_group(vnf_lcm_group)
+    conf.register_opts(OPTS, group=vnf_lcm_group)
+
+
+def list_opts():
+    return {vnf_lcm_group: OPTS}
@@ -56,6 +56,104 @@ Possible values:
 
 Related options:
     * None
+""")),
+    cfg.IntOpt('lazy_extract_size',
+               default=64,
+               min=0,
+               help=_("""
+Size in MiB above which files of a CSAR are extracted on demand.
+
+TOSCA.meta and the YAML files of a CSAR are always extracted when the
+VNF package is onboarded. Other files larger than this size, such as
+software images, are only extracted to vnf_package_csar_path the first
+time they are used.
+
+Possible values:
+    * 0 to extract all files when the VNF package is onboarded
+    * Any positive number
+
+Related options:
+    * vnf_package_csar_path
+""")),
+    cfg.IntOpt('vnfd_cache_size',
+               default=64,
+               min=0,
+               help=_("""
+Maximum number of parsed VNFDs and BaseHOTs kept in memory.
+
+VNF packages cannot change once they are onboarded, so the VNFD of a
+flavour and the BaseHOT of a package are only read from
+vnf_package_csar_path the first time a VNF is instantiated from them.
+The least recently used ones are evicted when the cache is full.
+
+Possible values:
+    * 0 to disable the cache
+    * Any positive number
+""")),
+    cfg.IntOpt('list_page_size',
+               default=0,
+               min=0,
+               help=_("""
+Maximum number of VNF packages returned by a single list request.
+
+When more VNF packages match the request, the response contains a Link
+header with rel="next", whose URI contains a nextpage_opaque_marker query
+parameter to get the next page, as described in ETSI GS NFV-SOL 013.
+
+Possible values:
+    * 0 to return all the VNF packages in a single response
+    * Any positive number
+""")),
+    cfg.IntOpt('uri_download_buffer_size',
+               default=1024,
+               min=1,
+               help=_("""
+Size in KiB of the chunks read ahead when downloading a CSAR from a URI.
+
+Possible values:
+    * Any positive number
+
+Related options:
+    * uri_download_retries
+""")),
+    cfg.IntOpt('uri_download_retries',
+               default=5,
+               min=0,
+               help=_("""
+Number of times a CSAR download from a URI is resumed after a failure.
+
+When the connection to the server is lost or times out, the download is
+resumed from the last byte received with a Range request, provided that
+the server supports byte ranges and the CSAR did not change in between.
+
+Possible values:
+    * 0 to fail the upload at the first connection failure
+    * Any positive number
+
+Related options:
+    * uri_download_timeout
+""")),
+    cfg.IntOpt('uri_download_timeout',
+               default=60,
+               min=1,
+               help=_("""
+Seconds to wait for the server when downloading a CSAR from a URI.
+
+Possible values:
+    * Any positive number
+""")),
+    cfg.IntOpt('uri_download_progress_interval',
+               default=10,
+               min=0,
+               help=_("""
+Seconds between two updates of the progress of a CSAR download.
+
+While a VNF package is in UPLOADING onboarding state, its size is the
+number of bytes of the CSAR received so far.
+
+Possible values:
+    * 0 to only set the size once the upload is completed
+    * Any positive number
 """))]
 
 vnf_package_group = cfg.OptGroup('vnf_package',
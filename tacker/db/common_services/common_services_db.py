@@ -29,3 +29,16 @@ class Event(model_base.BASE):
     timestamp = sa.Column(sa.DateTime, nullable=False)
     event_type = sa.Column(sa.String(64), nullable=False)
     event_details = sa.Column(types.Json)
+
+    # NOTE: Events are listed per resource or per type in timestamp order,
+    # and purged by timestamp. The primary key is appended to the indexes
+    # by InnoDB, which serves the (timestamp, id) keyset of get_events().
+    __table_args__ = (
+        sa.Index('events_resource_id_timestamp_idx',
+                 'resource_id', 'timestamp'),
+        sa.Index('events_resource_type_timestamp_idx',
+                 'resource_type', 'timestamp'),
+        sa.Index('events_event_type_timestamp_idx',
+                 'event_type', 'timestamp'),
+        sa.Index('events_timestamp_idx', 'timestamp'),
+    )
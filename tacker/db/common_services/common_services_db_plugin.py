@@ -31,6 +31,9 @@ LOG = logging.getLogger(__name__)
 EVENT_ATTRIBUTES = ('id', 'resource_id', 'resource_type', 'resource_state',
                     'timestamp', 'event_type', 'event_details')
 
+# Keyset used to page through events in the order they happened.
+EVENT_KEYSET = ('timestamp', 'id')
+
 
 class CommonServicesPluginDb(common_services.CommonServicesPluginBase,
                              db_base.CommonDbMixin):
@@ -71,18 +74,57 @@ class CommonServicesPluginDb(common_services.CommonServicesPluginBase,
                 error_str=str(e))
         return self._make_event_dict(event_db)
 
-    @log.log
-    def get_event(self, context, event_id, fields=None):
+    def create_events(self, context, events):
+        """Create many events with a single multi-row INSERT.
+
+        :param events: list of dicts with the res_id, res_type, res_state,
+                       evt_type, tstamp and details arguments of
+                       create_event()
+        """
+        if not events:
+            return
+        rows = [{'resource_id': event['res_id'],
+                 'resource_type': event['res_type'],
+                 'resource_state': event['res_state'],
+                 'event_details': event.get('details', ""),
+                 'event_type': event['evt_type'],
+                 'timestamp': event['tstamp']} for event in events]
+        try:
+            with context.session.begin(subtransactions=True):
+                context.session.execute(
+                    common_services_db.Event.__table__.insert(), rows)
+        except Exception as e:
+            LOG.exception("create events error: %s", str(e))
+            raise common_services.EventCreationFailureException(
+                error_str=str(e))
+
+    def _get_event(self, context, event_id):
         try:
-            events_db = self._get_by_id(context,
-                                        common_services_db.Event, event_id)
+            return self._get_by_id(context, common_services_db.Event,
+                                   event_id)
         except orm_exc.NoResultFound:
             raise common_services.EventNotFoundException(evt_id=event_id)
+
+    @log.log
+    def get_event(self, context, event_id, fields=None):
+        events_db = self._get_event(context, event_id)
         return self._make_event_dict(events_db, fields)
 
     @log.log
     def get_events(self, context, filters=None, fields=None, sorts=None,
-                   limit=None, marker_obj=None, page_reverse=False):
+                   limit=None, marker_obj=None, page_reverse=False,
+                   marker=None):
+        """List events.
+
+        Unless sorted by other keys, a page of events is ordered by
+        (timestamp, id) and starts after the marker event, which can be
+        given as an object (marker_obj) or as an event id (marker).
+        """
+        if limit and not set(dict(sorts or [])) - {'id'}:
+            ascending = dict(sorts or []).get('id', True)
+            sorts = [(key, ascending) for key in EVENT_KEYSET]
+        if marker_obj is None:
+            marker_obj = self._get_marker_obj(context, 'event', limit, marker)
         try:
             return self._get_collection(context, common_services_db.Event,
                                         self._make_event_dict,
@@ -92,3 +134,26 @@ class CommonServicesPluginDb(common_services.CommonServicesPluginBase,
             LOG.error("Failed to get event: %s", e.message)
             msg = "Id should be in UUID v4 format"
             raise common_services.InvalidFormat(error=msg)
+
+    def purge_events(self, context, before, batch_size):
+        """Delete the events that happened before a given time.
+
+        Events are deleted in batches of at most batch_size rows, each in
+        its own transaction, so that the table is not locked for long.
+
+        :returns: number of deleted events
+        """
+        model = common_services_db.Event
+        deleted = 0
+        while True:
+            with context.session.begin(subtransactions=True):
+                ids = [row.id for row in context.session.query(model.id).
+                       filter(model.timestamp < before).
+                       order_by(model.timestamp, model.id).
+                       limit(batch_size)]
+                if ids:
+                    context.session.query(model).filter(
+                        model.id.in_(ids)).delete(synchronize_session=False)
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                return deleted
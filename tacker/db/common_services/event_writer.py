@@ -0,0 +1,135 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Buffered writer of events, used when [events] async_write is enabled."""
+
+import atexit
+import queue
+import threading
+import time
+
+from oslo_log import log as logging
+
+import tacker.conf
+from tacker import context as t_context
+from tacker.db.common_services import common_services_db_plugin
+
+LOG = logging.getLogger(__name__)
+CONF = tacker.conf.CONF
+
+# Maximum number of seconds flush() waits for the batch being written by
+# the background thread.
+FLUSH_TIMEOUT = 10
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class EventWriter(object):
+    """Queues events and writes them in batches from a background thread.
+
+    A batch is written when it reaches [events] batch_size events or when
+    its first event has waited for [events] flush_interval seconds. When
+    the queue is full, write() blocks for up to [events] queue_timeout
+    seconds and then writes the event synchronously.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(CONF.events.max_queue_size)
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
+
+    def write(self, event):
+        """Queue an event.
+
+        :param event: dict with the res_id, res_type, res_state, evt_type,
+                      tstamp and details arguments of create_event()
+        """
+        self._start()
+        try:
+            self._queue.put(event, timeout=CONF.events.queue_timeout)
+        except queue.Full:
+            LOG.warning("Event queue is full, writing event of %s "
+                        "synchronously", event['res_id'])
+            self._write_batch([event])
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + CONF.events.flush_interval
+            while len(batch) < CONF.events.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            for _event in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch):
+        try:
+            self._cos_db_plg.create_events(
+                t_context.get_admin_context(), batch)
+        except Exception:
+            # NOTE: create_events() already logged the error, and retrying
+            # would make the queue grow while the database is unavailable.
+            LOG.error("Dropped %d events", len(batch))
+
+    def flush(self):
+        """Write the queued events from the calling thread.
+
+        Also waits for the batch being written by the background thread,
+        so that all the events written before are in the database.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(batch), CONF.events.batch_size):
+            self._write_batch(batch[start:start + CONF.events.batch_size])
+        for _event in batch:
+            self._queue.task_done()
+
+        deadline = time.monotonic() + FLUSH_TIMEOUT
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+def get_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = EventWriter()
+                atexit.register(_writer.flush)
+    return _writer
+
+
+def flush():
+    """Write the events queued by this process, if any."""
+    if _writer is not None:
+        _writer.flush()
@@ -0,0 +1,38 @@
+# Copyright 2020 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add indexes to events table
+
+Revision ID: c31f65e0d099
+Revises: d2e39e01d540
+Create Date: 2020-06-15 10:12:41.219487
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c31f65e0d099'
+down_revision = 'd2e39e01d540'
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_index('events_resource_id_timestamp_idx', 'events',
+                    ['resource_id', 'timestamp'])
+    op.create_index('events_resource_type_timestamp_idx', 'events',
+                    ['resource_type', 'timestamp'])
+    op.create_index('events_event_type_timestamp_idx', 'events',
+                    ['event_type', 'timestamp'])
+    op.create_index('events_timestamp_idx', 'events', ['timestamp'])
@@ -48,6 +48,12 @@ _ACTIVE_UPDATE_ERROR_DEAD = (
     constants.PENDING_SCALE_IN, constants.PENDING_SCALE_OUT, constants.ERROR,
     constants.PENDING_DELETE, constants.DEAD, constants.PENDING_HEAL)
 CREATE_STATES = (constants.PENDING_CREATE, constants.DEAD)
+VNF_KEY_LIST = ('id', 'tenant_id', 'name', 'description', 'instance_id',
+                'vim_id', 'placement_attr', 'vnfd_id', 'status',
+                'mgmt_ip_address', 'error_reason', 'created_at',
+                'updated_at')
+VNFD_KEY_LIST = ('id', 'tenant_id', 'name', 'description', 'mgmt_driver',
+                 'created_at', 'updated_at', 'template_source')
 
 
 ###########################################################################
@@ -209,10 +215,7 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
             'service_types': self._make_service_types_list(
                 vnfd.service_types)
         }
-        key_list = ('id', 'tenant_id', 'name', 'description',
-                    'mgmt_driver', 'created_at', 'updated_at',
-                    'template_source')
-        res.update((key, vnfd[key]) for key in key_list)
+        res.update((key, vnfd[key]) for key in VNFD_KEY_LIST)
         return self._fields(res, fields)
 
     def _make_dev_attrs_dict(self, dev_attrs_db):
@@ -226,13 +229,30 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
             self._make_vnfd_dict(vnf_db.vnfd),
             'attributes': self._make_dev_attrs_dict(vnf_db.attributes),
         }
-        key_list = ('id', 'tenant_id', 'name', 'description', 'instance_id',
-                    'vim_id', 'placement_attr', 'vnfd_id', 'status',
-                    'mgmt_ip_address', 'error_reason', 'created_at',
-                    'updated_at')
-        res.update((key, vnf_db[key]) for key in key_list)
+        res.update((key, vnf_db[key]) for key in VNF_KEY_LIST)
+        return self._fields(res, fields)
+
+    def _make_vnf_list_dict(self, vnf_db, fields=None):
+        res = dict((key, vnf_db[key]) for key in VNF_KEY_LIST)
+        if not fields or 'vnfd' in fields:
+            vnfd = vnf_db.vnfd
+            res['vnfd'] = dict((key, vnfd[key]) for key in VNFD_KEY_LIST)
+            res['vnfd']['service_types'] = self._make_service_types_list(
+                vnfd.service_types)
+        if not fields or 'attributes' in fields:
+            res['attributes'] = self._make_dev_attrs_dict(vnf_db.attributes)
         return self._fields(res, fields)
 
+    @staticmethod
+    def _vnf_list_loader_options(fields=None):
+        options = []
+        if not fields or 'vnfd' in fields:
+            options.append(orm.selectinload(VNF.vnfd).selectinload(
+                VNFD.service_types))
+        if not fields or 'attributes' in fields:
+            options.append(orm.selectinload(VNF.attributes))
+        return options
+
     @staticmethod
     def _mgmt_driver_name(vnf_dict):
         return vnf_dict['vnfd']['mgmt_driver']
@@ -712,8 +732,38 @@ class VNFMPluginDb(vnfm.VNFMPluginBase, db_base.CommonDbMixin):
         return self._make_vnf_dict(vnf_db, fields)
 
     def get_vnfs(self, context, filters=None, fields=None):
-        return self._get_collection(context, VNF, self._make_vnf_dict,
-                                    filters=filters, fields=fields)
+        """Return the VNFs matching filters.
+
+        The VNFD and the attributes of the VNFs are only loaded when fields
+        requires them, each with a single query for all the VNFs. The
+        'vnfd' of the returned dicts does not contain the 'attributes' of
+        the VNFD, so that the VNFD templates are not loaded.
+        """
+        query = self._get_collection_query(context, VNF, filters=filters)
+        query = query.options(*self._vnf_list_loader_options(fields))
+        return [self._make_vnf_list_dict(vnf_db, fields) for vnf_db in query]
+
+    def get_monitored_vnfs(self, context):
+        """Return the VNFs to register in the VNF monitor.
+
+        Only the VNFs with a monitoring policy and a management address are
+        returned, with a single query. Their VNFD and other attributes are
+        not loaded: the 'attributes' of the returned dicts only contain the
+        'monitoring_policy'.
+        """
+        query = (self._model_query(context, VNF).
+                 join(VNFAttribute, VNFAttribute.vnf_id == VNF.id).
+                 filter(VNFAttribute.key == 'monitoring_policy').
+                 filter(VNF.mgmt_ip_address.isnot(None)).
+                 add_columns(VNFAttribute.value))
+        vnfs = []
+        for vnf_db, monitoring_policy in query:
+            if not vnf_db.mgmt_ip_address:
+                continue
+            vnf = dict((key, vnf_db[key]) for key in VNF_KEY_LIST)
+            vnf['attributes'] = {'monitoring_policy': monitoring_policy}
+            vnfs.append(vnf)
+        return vnfs
 
     def set_vnf_error_status_reason(self, context, vnf_id, new_reason):
         with context.session.begin(subtransactions=True):
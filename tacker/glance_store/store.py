@@ -15,14 +15,17 @@
 
 import base64
 import os
+import time
 
 import glance_store
 from glance_store import exceptions as store_exceptions
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 from oslo_utils import units
+import requests
 from six.moves import urllib
 
+from tacker._i18n import _
 from tacker.common import exceptions
 from tacker.common import utils
 import tacker.conf
@@ -31,6 +34,12 @@ import tacker.conf
 CONF = tacker.conf.CONF
 LOG = logging.getLogger(__name__)
 
+# Seconds waited before the first attempt to resume a CSAR download, doubled
+# after each failed attempt.
+RESUME_INTERVAL = 1
+
+_http_session = None
+
 
 def initialize_glance_store():
     """Initialize glance store."""
@@ -38,10 +47,188 @@ def initialize_glance_store():
     glance_store.verify_default_store()
 
 
-def get_csar_data_iter(body):
+def _get_http_session():
+    """Return the HTTP session shared by the downloads of CSARs.
+
+    Its connection pool keeps the connections to the servers of the CSARs
+    open between downloads and between the requests of a resumed download.
+    """
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+    return _http_session
+
+
+class CsarURLReader(object):
+    """File-like reader of a CSAR downloaded from an HTTP(S) URL.
+
+    The response is read ahead in chunks of [vnf_package]
+    uri_download_buffer_size KiB. When the connection fails, the download is
+    resumed from the end of the last chunk received with a Range request, up
+    to [vnf_package] uri_download_retries times. Downloads are only resumed
+    from servers which support byte ranges and return an ETag or a
+    Last-Modified header, which is sent as If-Range header to make sure that
+    the CSAR did not change in between.
+
+    :param progress_callback: called with the number of bytes received so
+                              far, at most every [vnf_package]
+                              uri_download_progress_interval seconds
+    """
+
+    def __init__(self, url, user_name=None, password=None,
+                 progress_callback=None):
+        self.url = url
+        self.size = None
+        self.bytes_read = 0
+        self._auth = None
+        if user_name is not None or password is not None:
+            self._auth = (user_name or '', password or '')
+        self._progress_callback = progress_callback
+        self._progress_time = time.monotonic()
+        self._validator = None
+        self._retries = 0
+        self._response = None
+        self._chunks = None
+        self._buffer = b''
+        self._position = 0
+        self._open()
+
+    def _open(self):
+        # NOTE: The offsets of Range requests are offsets in the content as
+        # sent by the server, so it must not be compressed on the fly.
+        headers = {'Accept-Encoding': 'identity'}
+        if self.bytes_read:
+            headers['Range'] = 'bytes=%d-' % self.bytes_read
+            headers['If-Range'] = self._validator
+        response = _get_http_session().get(
+            self.url, headers=headers, auth=self._auth, stream=True,
+            timeout=CONF.vnf_package.uri_download_timeout)
+        try:
+            response.raise_for_status()
+            if self.bytes_read:
+                content_range = response.headers.get('Content-Range', '')
+                if (response.status_code != 206 or not
+                        content_range.startswith(
+                            'bytes %d-' % self.bytes_read)):
+                    raise exceptions.VNFPackageDownloadFailed(
+                        url=self.url,
+                        error=_("the VNF package changed or the server did "
+                                "not resume the download"))
+            else:
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit():
+                    self.size = int(content_length)
+                etag = response.headers.get('ETag')
+                if etag and not etag.startswith('W/'):
+                    self._validator = etag
+                else:
+                    self._validator = response.headers.get('Last-Modified')
+                if response.headers.get('Accept-Ranges') != 'bytes':
+                    self._validator = None
+        except Exception:
+            response.close()
+            raise
+
+        self._response = response
+        self._chunks = response.iter_content(
+            CONF.vnf_package.uri_download_buffer_size * units.Ki)
+
+    def _resume(self, error):
+        self._response.close()
+        while True:
+            if (self._validator is None or
+                    self._retries >= CONF.vnf_package.uri_download_retries):
+                raise exceptions.VNFPackageDownloadFailed(url=self.url,
+                                                          error=error)
+            self._retries += 1
+            LOG.warning("Download of VNF package from %(url)s failed after "
+                        "%(bytes)d bytes: %(error)s. Resuming it, attempt "
+                        "%(retry)d of %(retries)d.",
+                        {"url": self.url, "bytes": self.bytes_read,
+                         "error": error, "retry": self._retries,
+                         "retries": CONF.vnf_package.uri_download_retries})
+            time.sleep(RESUME_INTERVAL * 2 ** (self._retries - 1))
+            try:
+                self._open()
+                return
+            except requests.exceptions.RequestException as e:
+                error = encodeutils.exception_to_unicode(e)
+
+    def _next_chunk(self):
+        while True:
+            try:
+                chunk = next(self._chunks, b'')
+            except requests.exceptions.RequestException as e:
+                error = encodeutils.exception_to_unicode(e)
+            else:
+                if chunk:
+                    self.bytes_read += len(chunk)
+                    self._report_progress()
+                    return chunk
+                if self.size is None or self.bytes_read >= self.size:
+                    return b''
+                error = _("connection closed after %(bytes)d of %(size)d "
+                          "bytes") % {"bytes": self.bytes_read,
+                                      "size": self.size}
+            self._resume(error)
+
+    def _report_progress(self):
+        interval = CONF.vnf_package.uri_download_progress_interval
+        if self._progress_callback is None or not interval:
+            return
+        now = time.monotonic()
+        if now - self._progress_time < interval:
+            return
+        self._progress_time = now
+        LOG.debug("Downloaded %(bytes)d of %(size)s bytes of VNF package "
+                  "from %(url)s", {"bytes": self.bytes_read,
+                                   "size": self.size, "url": self.url})
+        try:
+            self._progress_callback(self.bytes_read)
+        except Exception:
+            LOG.warning("Failed to report the progress of the download of "
+                        "VNF package from %s", self.url, exc_info=True)
+
+    def read(self, length=-1):
+        result = bytearray()
+        while length is None or length < 0 or len(result) < length:
+            if self._position >= len(self._buffer):
+                self._buffer = self._next_chunk()
+                self._position = 0
+                if not self._buffer:
+                    break
+            end = len(self._buffer)
+            if length is not None and length >= 0:
+                end = min(end, self._position + length - len(result))
+            result += self._buffer[self._position:end]
+            self._position = end
+        return bytes(result)
+
+    def close(self):
+        self._response.close()
+
+
+class _CopyingReader(object):
+    """Reader which writes the data it reads to a file."""
+
+    def __init__(self, data, copy_file):
+        self.data = data
+        self.copy_file = copy_file
+
+    def read(self, length=None):
+        result = self.data.read(length)
+        self.copy_file.write(result)
+        return result
+
+
+def get_csar_data_iter(body, progress_callback=None):
     try:
         if isinstance(body, dict):
             url = body['address_information']
+            if urllib.parse.urlparse(url).scheme in ('http', 'https'):
+                return CsarURLReader(url, body['user_name'],
+                                     body['password'],
+                                     progress_callback=progress_callback)
             req = urllib.request.Request(url)
             if body['user_name'] is not None or body['password'] is not None:
                 _add_basic_auth(req, body['user_name'], body['password'])
@@ -57,26 +244,57 @@ def get_csar_data_iter(body):
         raise exceptions.VNFPackageURLInvalid(url=url)
 
 
-def store_csar(context, package_uuid, body):
+def _open_csar_copy(package_uuid, csar_path):
+    try:
+        return open(csar_path + '.part', 'wb')
+    except Exception as e:
+        LOG.warning("Failed to open %(path)s to copy csar of package "
+                    "%(uuid)s: %(error)s",
+                    {"path": csar_path, "uuid": package_uuid,
+                     "error": encodeutils.exception_to_unicode(e)})
+
 
-    data_iter = get_csar_data_iter(body)
+def store_csar(context, package_uuid, body, progress_callback=None,
+               csar_path=None):
+    """Store a CSAR in glance_store.
+
+    The checksum and hash of the CSAR are computed while it is stored. When
+    csar_path is given, the CSAR is also written to this file in the same
+    pass, unless the file cannot be created.
+
+    :param progress_callback: called with the number of bytes downloaded so
+                              far when body is the URL of the CSAR
+    """
+    data_iter = get_csar_data_iter(body, progress_callback=progress_callback)
+    data = utils.CooperativeReader(data_iter)
+    copy_file = None
+    if csar_path:
+        copy_file = _open_csar_copy(package_uuid, csar_path)
+        if copy_file:
+            data = _CopyingReader(data, copy_file)
     try:
         # store CSAR file in glance_store
         (location, size, checksum, multihash,
          loc_meta) = glance_store.add_to_backend_with_multihash(
             CONF, package_uuid,
             utils.LimitingReader(
-                utils.CooperativeReader(data_iter),
-                CONF.vnf_package.csar_file_size_cap * units.Gi),
+                data, CONF.vnf_package.csar_file_size_cap * units.Gi),
             0,
             CONF.vnf_package.hashing_algorithm,
             context=context)
+        if copy_file:
+            copy_file.close()
+            os.rename(copy_file.name, csar_path)
     except Exception as e:
         error = encodeutils.exception_to_unicode(e)
         LOG.warn("Failed to store csar data in glance store for "
                  "package %(uuid)s due to error: %(error)s",
                  {"uuid": package_uuid,
                  "error": error})
+        if copy_file:
+            copy_file.close()
+            if os.path.exists(copy_file.name):
+                os.remove(copy_file.name)
         raise exceptions.UploadFailedToGlanceStore(uuid=package_uuid,
                                                    error=error)
     finally:
@@ -133,6 +351,27 @@ def load_csar_iter(package_uuid, location, offset=0, chunk_size=None):
     return resp, size
 
 
+def get_csar_local_path(package_uuid, location, size):
+    """Return the path of a local file holding a CSAR, or None.
+
+    The copy of the CSAR written to vnf_package_csar_path when the package
+    was onboarded is preferred, then the file of the glance_store filesystem
+    backend. Files whose size is not the size of the CSAR are ignored.
+    """
+    paths = [os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                          package_uuid + ".zip")]
+    if location and location.startswith('file://'):
+        paths.append(urllib.parse.urlparse(location).path)
+
+    for path in paths:
+        try:
+            if os.path.getsize(path) == size:
+                return path
+        except OSError:
+            continue
+    return None
+
+
 def _get_csar_chunks(package_uuid, location, offset, chunk_size):
     try:
         resp, size = glance_store.backend.get_from_backend(location,
@@ -151,6 +390,6 @@ def _add_basic_auth(request, username, password):
     This function adds basic authentication information to a six.moves.urllib
     request.
     """
-    auth_str = base64.encodestring(('%s:%s' % (
+    auth_str = base64.b64encode(('%s:%s' % (
         username, password)).encode()).decode().strip()
     request.add_header('Authorization', 'Basic %s' % auth_str)
@@ -76,6 +76,9 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
         return auth_cred, file_descriptor
 
     def _create_ssl_ca_file(self, auth_cred):
+        if kubernetes_utils.is_api_client_cache_enabled():
+            # The CA certificate file is managed by the ApiClient cache.
+            return None
         ca_cert = utils.none_from_string(auth_cred.get('ssl_ca_cert'))
         if ca_cert:
             file_descriptor, file_path = \
@@ -135,6 +138,9 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
             vim_obj['auth_cred'].pop(u'key_type')
         if 'secret_uuid' in vim_obj['auth_cred']:
             vim_obj['auth_cred'].pop(u'secret_uuid')
+        # Clients created with former credentials of the VIM are not used
+        # anymore.
+        kubernetes_utils.invalidate_api_clients(vim_obj['auth_url'])
         self.authenticate_vim(vim_obj)
         self.discover_placement_attr(vim_obj)
         self.encode_vim_auth(vim_obj['id'],
@@ -147,6 +153,7 @@ class Kubernetes_Driver(abstract_vim_driver.VimAbstractDriver):
 
         Delete VIM keys from file system
         """
+        kubernetes_utils.invalidate_api_clients(vim_obj['auth_url'])
         self.delete_vim_auth(vim_obj['id'],
                              vim_obj['auth_cred'])
 
@@ -20,7 +20,6 @@ import yaml
 
 from keystoneauth1 import exceptions
 from keystoneauth1 import identity
-from keystoneauth1.identity import v3
 from keystoneauth1 import session
 from neutronclient.common import exceptions as nc_exceptions
 from neutronclient.v2_0 import client as neutron_client
@@ -140,11 +139,6 @@ class OpenStack_Driver(abstract_vim_driver.VimAbstractDriver,
                 keystone_version
         return auth_cred
 
-    def _get_auth_plugin(self, **kwargs):
-        auth_plugin = v3.Password(**kwargs)
-
-        return auth_plugin
-
     def _initialize_keystone(self, auth):
         ks_client = self.keystone.initialize_client(**auth)
         return ks_client
@@ -315,8 +309,7 @@ class OpenStack_Driver(abstract_vim_driver.VimAbstractDriver,
             auth_url=auth_url,
             verify=verify)
         auth_cred = self._get_auth_creds(vim_obj, keystone_version)
-        auth_plugin = self._get_auth_plugin(**auth_cred)
-        sess = session.Session(auth=auth_plugin)
+        sess = self.keystone.initialize_client(**auth_cred).session
         return client_type(session=sess)
 
     def _translate_ip_protocol(self, ip_proto):
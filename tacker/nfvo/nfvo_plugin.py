@@ -19,7 +19,6 @@ import os
 import time
 import yaml
 
-from cryptography import fernet
 import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -34,13 +33,11 @@ from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker.common import log
 from tacker.common import utils
-from tacker import context as t_context
 from tacker.db.nfvo import nfvo_db_plugin
 from tacker.db.nfvo import ns_db
 from tacker.db.nfvo import vnffg_db
 from tacker.extensions import common_services as cs
 from tacker.extensions import nfvo
-from tacker.keymgr import API as KEYMGR_API
 from tacker import manager
 from tacker.nfvo.workflows.vim_monitor import vim_monitor_utils
 from tacker.plugins.common import constants
@@ -195,6 +192,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
 
             vim_obj = super(NfvoPlugin, self).update_vim(
                 context, vim_id, vim_obj)
+            keystone.invalidate_clients(old_vim_obj['auth_url'])
+            vim_client.invalidate_vim_auth(vim_id)
             if old_auth_need_delete:
                 try:
                     self._vim_drivers.invoke(vim_type,
@@ -228,6 +227,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
         except Exception:
             LOG.exception("Failed to remove vim monitor")
         super(NfvoPlugin, self).delete_vim(context, vim_id)
+        keystone.invalidate_clients(vim_obj['auth_url'])
+        vim_client.invalidate_vim_auth(vim_id)
 
     @log.log
     def monitor_vim(self, context, vim_obj):
@@ -537,53 +538,8 @@ class NfvoPlugin(nfvo_db_plugin.NfvoPluginDb, vnffg_db.VnffgPluginDbMixin,
         return vim_obj
 
     def _build_vim_auth(self, vim_info):
-        LOG.debug('VIM id is %s', vim_info['id'])
-        vim_auth = vim_info['auth_cred']
-        vim_auth['password'] = self._decode_vim_auth(vim_info['id'],
-                                                     vim_auth)
-        vim_auth['auth_url'] = vim_info['auth_url']
-
-        # These attributes are needless for authentication
-        # from keystone, so we remove them.
-        needless_attrs = ['key_type', 'secret_uuid']
-        for attr in needless_attrs:
-            if attr in vim_auth:
-                vim_auth.pop(attr, None)
-        return vim_auth
-
-    def _decode_vim_auth(self, vim_id, auth):
-        """Decode Vim credentials
-
-        Decrypt VIM cred, get fernet Key from local_file_system or
-        barbican.
-        """
-        cred = auth['password'].encode('utf-8')
-        if auth.get('key_type') == 'barbican_key':
-            k_context = t_context.generate_tacker_service_context()
-            keystone_conf = CONF.keystone_authtoken
-            secret_uuid = auth['secret_uuid']
-            keymgr_api = KEYMGR_API(keystone_conf.auth_url)
-            secret_obj = keymgr_api.get(k_context, secret_uuid)
-            vim_key = secret_obj.payload
-        else:
-            vim_key = self._find_vim_key(vim_id)
-
-        f = fernet.Fernet(vim_key)
-        if not f:
-            LOG.warning('Unable to decode VIM auth')
-            raise nfvo.VimNotFoundException(vim_id=vim_id)
-        return f.decrypt(cred).decode('utf-8')
-
-    @staticmethod
-    def _find_vim_key(vim_id):
-        key_file = os.path.join(CONF.vim_keys.openstack, vim_id)
-        LOG.debug('Attempting to open key file for vim id %s', vim_id)
-        try:
-            with open(key_file, 'r') as f:
-                return f.read()
-        except Exception:
-            LOG.warning('VIM id invalid or key not found for  %s', vim_id)
-            raise nfvo.VimKeyNotFoundException(vim_id=vim_id)
+        # Shares the cache of decrypted auth of VimClient
+        return vim_client.VimClient()._build_vim_auth(vim_info)
 
     def _vim_resource_name_to_id(self, context, resource, name, vnf_id):
         """Converts a VIM resource name to its ID
@@ -10,13 +10,11 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import netaddr
-
 from mistral_lib import actions
 from oslo_config import cfg
 from oslo_log import log as logging
 
-from tacker.agent.linux import utils as linux_utils
+from tacker.agent.linux import icmp
 from tacker.common import rpc
 from tacker.common import topics
 from tacker.conductor.conductorrpc import vim_monitor_rpc
@@ -50,25 +48,13 @@ class PingVimAction(actions.Action):
         self.killed = True
 
     def _ping(self):
-
-        cmd_ping = 'ping'
-        if netaddr.valid_ipv6(self.targetip):
-            cmd_ping = 'ping6'
-
-        ping_cmd = [cmd_ping, '-c', self.count,
-                    '-W', self.timeout,
-                    '-i', self.interval,
-                    self.targetip]
-
-        try:
-            # NOTE(gongysh) since it is called in a loop, the debug log
-            # should be disabled to avoid eating up mistral executor.
-            linux_utils.execute(ping_cmd, check_exit_code=True,
-                                debuglog=False)
+        # NOTE(gongysh) since it is called in a loop, the debug log
+        # should be disabled to avoid eating up mistral executor.
+        if icmp.ping([self.targetip], self.count, self.timeout,
+                     self.interval, debuglog=False)[self.targetip]:
             return 'REACHABLE'
-        except RuntimeError:
-            LOG.warning(("Cannot ping ip address: %s"), self.targetip)
-            return 'UNREACHABLE'
+        LOG.warning(("Cannot ping ip address: %s"), self.targetip)
+        return 'UNREACHABLE'
 
     def _update(self, status):
         LOG.info("VIM %s changed to status %s", self.vim_id, status)
@@ -53,7 +53,13 @@ def _vnf_deployment_flavour_get_by_id(context, id, columns_to_join=None):
 
     if columns_to_join:
         for column in columns_to_join:
-            query = query.options(joinedload(column))
+            if column == 'software_images':
+                # Also load the metadata of the images, see
+                # _load_sw_images().
+                query = query.options(
+                    joinedload(column).joinedload('_metadata'))
+            else:
+                query = query.options(joinedload(column))
 
     result = query.first()
 
@@ -236,7 +242,8 @@ class VnfDeploymentFlavour(base.TackerObject, base.TackerPersistentObject):
             self.software_images = base.obj_make_list(
                 self._context, objects.VnfSoftwareImagesList(
                     self._context),
-                objects.VnfSoftwareImage, db_sw_images)
+                objects.VnfSoftwareImage, db_sw_images,
+                expected_attrs=['metadata'])
             self.obj_reset_changes(['software_images'])
 
     def to_dict(self, include_fields=None):
@@ -18,9 +18,11 @@ from oslo_utils import timeutils
 from oslo_utils import uuidutils
 from oslo_versionedobjects import base as ovoo_base
 from sqlalchemy.orm import joinedload
+from sqlalchemy_filters import apply_filters
 
 from tacker._i18n import _
 from tacker.common import exceptions
+from tacker.common import utils
 from tacker.db import api as db_api
 from tacker.db.db_sqlalchemy import api
 from tacker.db.db_sqlalchemy import models
@@ -100,6 +102,29 @@ def _vnf_instance_list(context, columns_to_join=None):
     return query.all()
 
 
+@db_api.context_manager.reader
+def _vnf_instance_list_by_filters(context, filters=None, columns_to_join=None,
+                                  limit=None, marker=None):
+    query = api.model_query(context, models.VnfInstance, read_deleted="no",
+                            project_only=True)
+
+    if columns_to_join:
+        for column in columns_to_join:
+            query = query.options(joinedload(column))
+
+    if filters:
+        query = apply_filters(query, filters)
+
+    # VNF instances are paged by id, the id of the last VNF instance of a
+    # page being the marker of the next one.
+    if marker:
+        query = query.filter(models.VnfInstance.id > marker)
+    if limit:
+        query = query.order_by(models.VnfInstance.id).limit(limit)
+
+    return query.all()
+
+
 def _make_vnf_instance_list(context, vnf_instance_list, db_vnf_instance_list,
                             expected_attrs):
     vnf_instance_cls = VnfInstance
@@ -119,6 +144,23 @@ def _make_vnf_instance_list(context, vnf_instance_list, db_vnf_instance_list,
 class VnfInstance(base.TackerObject, base.TackerPersistentObject,
                   base.TackerObjectDictCompat):
 
+    ALL_ATTRIBUTES = {
+        'id': ('id', 'string', 'VnfInstance'),
+        'vnfInstanceName': ('vnf_instance_name', 'string', 'VnfInstance'),
+        'vnfInstanceDescription': ('vnf_instance_description', 'string',
+                                   'VnfInstance'),
+        'instantiationState': ('instantiation_state', 'enum', 'VnfInstance',
+            fields.VnfInstanceStateField().valid_values),
+        'vnfdId': ('vnfd_id', 'string', 'VnfInstance'),
+        'vnfProvider': ('vnf_provider', 'string', 'VnfInstance'),
+        'vnfProductName': ('vnf_product_name', 'string', 'VnfInstance'),
+        'vnfSoftwareVersion': ('vnf_software_version', 'string',
+                               'VnfInstance'),
+        'vnfdVersion': ('vnfd_version', 'string', 'VnfInstance'),
+    }
+
+    FLATTEN_ATTRIBUTES = utils.flatten_dict(ALL_ATTRIBUTES.copy())
+
     # Version 1.0: Initial version
     VERSION = '1.0'
 
@@ -156,8 +198,14 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
 
             setattr(vnf_instance, key, db_vnf_instance[key])
 
-        VnfInstance._load_instantiated_vnf_info_from_db_object(context,
-                                           vnf_instance, db_vnf_instance)
+        if (expected_attrs is None or
+                'instantiated_vnf_info' in expected_attrs):
+            VnfInstance._load_instantiated_vnf_info_from_db_object(context,
+                                               vnf_instance, db_vnf_instance)
+        elif vnf_instance.obj_attr_is_set('instantiated_vnf_info'):
+            # Unset the default value so that instantiated_vnf_info is
+            # lazy-loaded by obj_load_attr when it is accessed.
+            delattr(vnf_instance, 'instantiated_vnf_info')
 
         vim_connection_info = db_vnf_instance['vim_connection_info']
         vim_connection_list = [objects.VimConnectionInfo.obj_from_primitive(
@@ -178,6 +226,28 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
                         db_vnf_instance['instantiated_vnf_info'])
             vnf_instance.instantiated_vnf_info = inst_vnf_info
 
+    def obj_load_attr(self, attrname):
+        if not self._context:
+            raise exceptions.OrphanedObjectError(
+                method='obj_load_attr', objtype=self.obj_name())
+        if attrname != 'instantiated_vnf_info' or 'id' not in self:
+            raise exceptions.ObjectActionError(
+                action='obj_load_attr',
+                reason=_('attribute %s not lazy-loadable') % attrname)
+
+        LOG.debug("Lazy-loading '%(attr)s' on %(name)s id %(id)s",
+                  {'attr': attrname,
+                   'name': self.obj_name(),
+                   'id': self.id,
+                   })
+
+        db_vnf_instance = _vnf_instance_get_by_id(
+            self._context, self.id, columns_to_join=[attrname])
+        self.instantiated_vnf_info = None
+        self._load_instantiated_vnf_info_from_db_object(
+            self._context, self, db_vnf_instance)
+        self.obj_reset_changes([attrname])
+
     @base.remotable
     def create(self):
         if self.obj_attr_is_set('id'):
@@ -234,7 +304,13 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
 
         _destroy_vnf_instance(context, self.id)
 
-    def to_dict(self):
+    def to_dict(self, include_instantiated_info=True):
+        """Return the VNF instance as a dict.
+
+        :param include_instantiated_info: whether instantiated_vnf_info and
+            vim_connection_info are returned for an instantiated VNF
+            instance. If not, instantiated_vnf_info is not lazy-loaded.
+        """
         data = {'id': self.id,
             'vnf_instance_name': self.vnf_instance_name,
             'vnf_instance_description': self.vnf_instance_description,
@@ -245,8 +321,10 @@ class VnfInstance(base.TackerObject, base.TackerPersistentObject,
             'vnf_software_version': self.vnf_software_version,
             'vnfd_version': self.vnfd_version}
 
-        if (self.instantiation_state == fields.VnfInstanceState.INSTANTIATED
-                and self.instantiated_vnf_info):
+        if (include_instantiated_info and
+                self.instantiation_state ==
+                fields.VnfInstanceState.INSTANTIATED and
+                self.instantiated_vnf_info):
             data.update({'instantiated_vnf_info':
                 self.instantiated_vnf_info.to_dict()})
 
@@ -282,3 +360,23 @@ class VnfInstanceList(ovoo_base.ObjectListBase, base.TackerObject):
                                               columns_to_join=expected_attrs)
         return _make_vnf_instance_list(context, cls(), db_vnf_instances,
                                        expected_attrs)
+
+    @base.remotable_classmethod
+    def get_by_filters(cls, context, filters=None, expected_attrs=None,
+                       limit=None, marker=None):
+        """Return the VNF instances matching filters.
+
+        :param filters: sqlalchemy-filters, as returned by
+            attribute_filter.parse_filter_rule()
+        :param expected_attrs: list of relationships to load eagerly, the
+            other ones are lazy-loaded. Defaults to instantiated_vnf_info.
+        :param limit: maximum number of VNF instances, ordered by id
+        :param marker: id of the last VNF instance of the previous page
+        """
+        if expected_attrs is None:
+            expected_attrs = ["instantiated_vnf_info"]
+        db_vnf_instances = _vnf_instance_list_by_filters(
+            context, filters=filters, columns_to_join=expected_attrs,
+            limit=limit, marker=marker)
+        return _make_vnf_instance_list(context, cls(), db_vnf_instances,
+                                       expected_attrs)
@@ -111,16 +111,30 @@ def _update_user_defined_data(context, package_uuid, user_data):
     return result
 
 
+def _get_loader_options(columns_to_join=None):
+    """Return the options eagerly loading the relationships to join.
+
+    The software images of the deployment flavours and their metadata are
+    loaded along with the flavours, instead of with one query per flavour
+    and image when they are converted to objects.
+    """
+    options = [joinedload('_metadata')]
+    for column in columns_to_join or []:
+        if column == 'vnf_deployment_flavours':
+            options.append(joinedload(column).joinedload(
+                'software_images').joinedload('_metadata'))
+        else:
+            options.append(joinedload(column))
+    return options
+
+
 @db_api.context_manager.reader
 def _vnf_package_get_by_id(context, package_uuid, columns_to_join=None):
 
     query = api.model_query(context, models.VnfPackage,
                             read_deleted="no", project_only=True). \
-        filter_by(id=package_uuid).options(joinedload('_metadata'))
-
-    if columns_to_join:
-        for column in columns_to_join:
-            query = query.options(joinedload(column))
+        filter_by(id=package_uuid).options(
+            *_get_loader_options(columns_to_join))
 
     result = query.first()
 
@@ -149,20 +163,20 @@ def _vnf_package_create(context, values, user_data=None):
 @db_api.context_manager.reader
 def _vnf_package_list(context, columns_to_join=None):
     query = api.model_query(context, models.VnfPackage, read_deleted="no",
-                            project_only=True).options(joinedload('_metadata'))
-
-    if columns_to_join:
-        for column in columns_to_join:
-            query = query.options(joinedload(column))
+                            project_only=True).options(
+        *_get_loader_options(columns_to_join))
 
     return query.all()
 
 
 @db_api.context_manager.reader
-def _vnf_package_list_by_filters(context, read_deleted=None, filters=None):
+def _vnf_package_list_by_filters(context, read_deleted=None, filters=None,
+                                 columns_to_join=None, limit=None,
+                                 marker=None):
     query = api.model_query(context, models.VnfPackage,
                             read_deleted=read_deleted,
-                            project_only=True).options(joinedload('_metadata'))
+                            project_only=True).options(
+        *_get_loader_options(columns_to_join))
 
     if filters:
         # Need to join VnfDeploymentFlavour, VnfSoftwareImage and
@@ -173,13 +187,20 @@ def _vnf_package_list_by_filters(context, read_deleted=None, filters=None):
         if 'VnfSoftwareImageMetadata' in filter_data:
             query = query.join(models.VnfDeploymentFlavour).join(
                 models.VnfSoftwareImage).join(
-                models.VnfSoftwareImageMetadata)
+                models.VnfSoftwareImageMetadata).distinct()
         elif 'VnfSoftwareImage' in filter_data:
             query = query.join(models.VnfDeploymentFlavour).join(
-                models.VnfSoftwareImage)
+                models.VnfSoftwareImage).distinct()
 
         query = apply_filters(query, filters)
 
+    # VNF packages are paged by id, the id of the last VNF package of a
+    # page being the marker of the next one.
+    if marker:
+        query = query.filter(models.VnfPackage.id > marker)
+    if limit:
+        query = query.order_by(models.VnfPackage.id).limit(limit)
+
     return query.all()
 
 
@@ -391,7 +412,8 @@ class VnfPackage(base.TackerObject, base.TackerPersistentObject,
         elif db_flavours:
             self.vnf_deployment_flavours = base.obj_make_list(
                 self._context, objects.VnfDeploymentFlavoursList(
-                    self._context), objects.VnfDeploymentFlavour, db_flavours)
+                    self._context), objects.VnfDeploymentFlavour, db_flavours,
+                expected_attrs=['software_images'])
             self.obj_reset_changes(['vnf_deployment_flavours'])
 
     def _load_vnfd(self, db_vnfd=_NO_DATA_SENTINEL):
@@ -594,8 +616,13 @@ class VnfPackage(base.TackerObject, base.TackerPersistentObject,
         if (self.onboarding_state ==
                 fields.PackageOnboardingStateType.ONBOARDED):
 
-            software_images = self.vnf_deployment_flavours.to_dict(
-                include_fields=include_fields)
+            software_images = None
+            # Avoid loading the flavours when no software image attribute
+            # is requested.
+            if any(field.startswith('softwareImages')
+                   for field in include_fields):
+                software_images = self.vnf_deployment_flavours.to_dict(
+                    include_fields=include_fields)
             if software_images:
                 vnf_package_response.update(
                     {'softwareImages': software_images})
@@ -627,8 +654,12 @@ class VnfPackagesList(ovoo_base.ObjectListBase, base.TackerObject):
                                        expected_attrs)
 
     @base.remotable_classmethod
-    def get_by_filters(cls, context, read_deleted=None, filters=None):
+    def get_by_filters(cls, context, read_deleted=None, filters=None,
+                       expected_attrs=None, limit=None, marker=None):
         db_vnf_packages = _vnf_package_list_by_filters(context,
                                             read_deleted=read_deleted,
-                                            filters=filters)
-        return _make_vnf_packages_list(context, cls(), db_vnf_packages)
+                                            filters=filters,
+                                            columns_to_join=expected_attrs,
+                                            limit=limit, marker=marker)
+        return _make_vnf_packages_list(context, cls(), db_vnf_packages,
+                                       expected_attrs)
@@ -81,6 +81,18 @@ def _vnf_resource_list(context, vnf_instance_id):
     return query.all()
 
 
+@db_api.context_manager.reader
+def _vnf_resource_list_by_identifier(context, resource_type,
+                                     resource_identifier):
+    # NOTE: Resources of the VIM, such as shared images, may be used by the
+    # VNF instances of any project.
+    query = api.model_query(context, models.VnfResource, read_deleted="no").\
+        filter_by(resource_type=resource_type,
+                  resource_identifier=resource_identifier)
+
+    return query.all()
+
+
 def _make_vnf_resources_list(context, vnf_resource_list, db_vnf_resource_list):
     vnf_resource_cls = VnfResource
 
@@ -174,3 +186,10 @@ class VnfResourceList(ovoo_base.ObjectListBase, base.TackerObject):
     def get_by_vnf_instance_id(cls, context, vnf_instance_id):
         db_vnf_resources = _vnf_resource_list(context, vnf_instance_id)
         return _make_vnf_resources_list(context, cls(), db_vnf_resources)
+
+    @base.remotable_classmethod
+    def get_by_resource_identifier(cls, context, resource_type,
+                                   resource_identifier):
+        db_vnf_resources = _vnf_resource_list_by_identifier(
+            context, resource_type, resource_identifier)
+        return _make_vnf_resources_list(context, cls(), db_vnf_resources)
@@ -30,6 +30,7 @@ from tacker._i18n import _
 from tacker.common import config
 from tacker.common import rpc as n_rpc
 from tacker import context
+from tacker.db.common_services import event_writer
 from tacker import wsgi
 
 
@@ -81,7 +82,7 @@ class WsgiService(service.ServiceBase):
             self.wsgi_app.wait()
 
     def stop(self):
-        pass
+        event_writer.flush()
 
     def reset(self):
         pass
@@ -228,6 +229,7 @@ class Service(n_rpc.Service):
             except Exception:
                 LOG.exception("Exception occurs when timer stops")
         self.timers = []
+        event_writer.flush()
 
     def wait(self):
         super(Service, self).wait()
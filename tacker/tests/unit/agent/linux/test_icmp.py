@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+from unittest import mock
+
+from tacker.agent.linux import icmp
+from tacker.tests import base
+
+
+class FakeIcmpSocket(object):
+    """Answers the echo requests sent to the given addresses."""
+
+    def __init__(self, family, reachable):
+        self.family = family
+        self.reachable = reachable
+        self.replies = []
+        self.sent = []
+        self.closed = False
+
+    def sendto(self, data, address):
+        self.sent.append(address[0])
+        if address[0] in self.reachable:
+            reply_type = (icmp.ICMPV6_ECHO_REPLY
+                          if self.family == socket.AF_INET6
+                          else icmp.ICMP_ECHO_REPLY)
+            self.replies.append((bytes([reply_type]) + data[1:], address))
+
+    def settimeout(self, timeout):
+        pass
+
+    def recvfrom(self, bufsize):
+        if not self.replies:
+            raise socket.timeout()
+        return self.replies.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+class TestIcmpPing(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestIcmpPing, self).setUp()
+        self.addCleanup(icmp._unsupported_families.clear)
+
+    def test_checksum(self):
+        # Echo request with identifier and sequence 1 and no payload.
+        self.assertEqual(0xf7fd, icmp._checksum(
+            b'\x08\x00\x00\x00\x00\x01\x00\x01'))
+
+    @mock.patch('tacker.agent.linux.icmp._open_socket')
+    def test_ping_many_targets_from_one_socket(self, mock_open_socket):
+        fake_socket = FakeIcmpSocket(socket.AF_INET, ['192.168.0.1'])
+        mock_open_socket.return_value = fake_socket
+
+        result = icmp.ping(['192.168.0.1', '192.168.0.2'], 2, 1, 1)
+
+        self.assertEqual({'192.168.0.1': True, '192.168.0.2': False},
+                         result)
+        mock_open_socket.assert_called_once_with(socket.AF_INET)
+        # The reachable target is not probed again after its reply.
+        self.assertEqual(['192.168.0.1', '192.168.0.2', '192.168.0.2'],
+                         fake_socket.sent)
+        self.assertTrue(fake_socket.closed)
+
+    @mock.patch('tacker.agent.linux.icmp._open_socket')
+    def test_ping_ipv6(self, mock_open_socket):
+        mock_open_socket.return_value = FakeIcmpSocket(
+            socket.AF_INET6, ['fd00::1'])
+
+        result = icmp.ping(['fd00::1'], 1, 1, 1)
+
+        self.assertEqual({'fd00::1': True}, result)
+        mock_open_socket.assert_called_once_with(socket.AF_INET6)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    @mock.patch('tacker.agent.linux.icmp._open_socket')
+    def test_ping_host_name_with_command(self, mock_open_socket,
+                                         mock_execute):
+        mock_open_socket.return_value = FakeIcmpSocket(
+            socket.AF_INET, ['192.168.0.1'])
+
+        result = icmp.ping(['vnf1.example.com', '192.168.0.1'], 1, 2, 1)
+
+        self.assertEqual({'vnf1.example.com': True, '192.168.0.1': True},
+                         result)
+        mock_execute.assert_called_once_with(
+            ['ping', '-c', 1, '-W', 2, '-i', 1, 'vnf1.example.com'],
+            check_exit_code=True)
+        mock_open_socket.assert_called_once_with(socket.AF_INET)
+
+    @mock.patch('tacker.agent.linux.utils.execute')
+    @mock.patch('socket.socket')
+    def test_ping_falls_back_to_command(self, mock_socket, mock_execute):
+        mock_socket.side_effect = PermissionError()
+        mock_execute.side_effect = [None, RuntimeError(), None]
+
+        result = icmp.ping(['192.168.0.1', '192.168.0.2'], 1, 2, 1,
+                           debuglog=False)
+
+        self.assertEqual({'192.168.0.1': True, '192.168.0.2': False},
+                         result)
+        mock_execute.assert_has_calls([
+            mock.call(['ping', '-c', 1, '-W', 2, '-i', 1, '192.168.0.1'],
+                      check_exit_code=True, debuglog=False),
+            mock.call(['ping', '-c', 1, '-W', 2, '-i', 1, '192.168.0.2'],
+                      check_exit_code=True, debuglog=False)])
+        # The socket is not retried once it is known to be unavailable.
+        icmp.ping(['192.168.0.1'], 1, 2, 1)
+        mock_socket.assert_called_once_with(
+            socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
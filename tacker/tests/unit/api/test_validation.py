@@ -0,0 +1,55 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.api import validation
+from tacker.api.validation import validators
+from tacker.common import exceptions
+from tacker.tests import base
+from tacker.tests.unit import fake_request
+
+_SCHEMA = {
+    'type': 'object',
+    'properties': {'name': {'type': 'string', 'maxLength': 4}},
+    'additionalProperties': False,
+}
+
+
+class TestValidation(base.BaseTestCase):
+
+    @mock.patch.object(validators, '_SchemaValidator',
+                       wraps=validators._SchemaValidator)
+    def test_schema_validator_built_once(self, mock_validator):
+        @validation.schema(_SCHEMA)
+        def create(request, body):
+            return body
+
+        self.assertEqual({'name': 'a'}, create(None, body={'name': 'a'}))
+        self.assertEqual({'name': 'b'}, create(None, body={'name': 'b'}))
+        self.assertRaises(exceptions.ValidationError, create, None,
+                          body={'name': 'too long'})
+        mock_validator.assert_called_once_with(_SCHEMA)
+
+    @mock.patch.object(validators, '_SchemaValidator',
+                       wraps=validators._SchemaValidator)
+    def test_query_schema_validator_built_once(self, mock_validator):
+        @validation.query_schema(_SCHEMA)
+        def index(self, request):
+            return request.GET['name']
+
+        for name in ('a', 'b'):
+            req = fake_request.HTTPRequest.blank('/?name=%s' % name)
+            self.assertEqual(name, index(None, req))
+        req = fake_request.HTTPRequest.blank('/?other=a')
+        self.assertRaises(exceptions.ValidationError, index, None, req)
+        mock_validator.assert_called_once_with(_SCHEMA)
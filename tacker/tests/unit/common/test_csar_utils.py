@@ -14,6 +14,11 @@
 
 import os
 import shutil
+import zipfile
+
+import ddt
+import fixtures
+from oslo_config import cfg
 import testtools
 from unittest import mock
 
@@ -23,19 +28,38 @@ from tacker import context
 from tacker.tests import constants
 
 
+@ddt.ddt
 class TestCSARUtils(testtools.TestCase):
 
     def setUp(self):
         super(TestCSARUtils, self).setUp()
         self.context = context.get_admin_context()
         self.base_path = os.path.dirname(os.path.abspath(__file__))
+        self.csar_path = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('vnf_package_csar_path', self.csar_path,
+                              group='vnf_package')
+        self.addCleanup(cfg.CONF.clear_override, 'vnf_package_csar_path',
+                        group='vnf_package')
 
     def _get_csar_file_path(self, file_name):
         return os.path.join(
             self.base_path, "../../etc/samples", file_name)
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data(self, mock_extract_csar_zip_file):
+    def _create_csar(self, files, base_csar=None, excluded_files=()):
+        """Create a CSAR with the files of base_csar and files."""
+        zip_path = os.path.join(self.csar_path, constants.UUID + '.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            if base_csar:
+                with zipfile.ZipFile(
+                        self._get_csar_file_path(base_csar)) as base_zf:
+                    for name in base_zf.namelist():
+                        if name not in excluded_files and name not in files:
+                            zf.writestr(name, base_zf.read(name))
+            for name, data in files.items():
+                zf.writestr(name, data)
+        return zip_path
+
+    def test_load_csar_data(self):
         file_path = self._get_csar_file_path("sample_vnf_package_csar.zip")
         vnf_data, flavours = csar_utils.load_csar_data(
             self.context, constants.UUID, file_path)
@@ -44,9 +68,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(flavours[0]['flavour_id'], 'simple')
         self.assertIsNotNone(flavours[0]['sw_images'])
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_single_yaml(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_single_yaml(self):
         file_path = self._get_csar_file_path(
             "sample_vnfpkg_no_meta_single_vnfd.zip")
         vnf_data, flavours = csar_utils.load_csar_data(
@@ -56,9 +78,7 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual(flavours[0]['flavour_id'], 'simple')
         self.assertIsNotNone(flavours[0]['sw_images'])
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_instantiation_level(self):
         file_path = self._get_csar_file_path(
             "csar_without_instantiation_level.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -68,9 +88,7 @@ class TestCSARUtils(testtools.TestCase):
                ' "tosca.policies.nfv.InstantiationLevels is not defined.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_invalid_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_invalid_instantiation_level(self):
         file_path = self._get_csar_file_path(
             "csar_invalid_instantiation_level.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -81,9 +99,7 @@ class TestCSARUtils(testtools.TestCase):
                "defined levels %s") % ",".join(sorted(levels))
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_invalid_default_instantiation_level(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_invalid_default_instantiation_level(self):
         file_path = self._get_csar_file_path(
             "csar_with_invalid_default_instantiation_level.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -94,9 +110,7 @@ class TestCSARUtils(testtools.TestCase):
                "defined levels %s") % ",".join(sorted(levels))
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_vnfd_info(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_vnfd_info(self):
         file_path = self._get_csar_file_path(
             "csar_without_vnfd_info.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -104,9 +118,7 @@ class TestCSARUtils(testtools.TestCase):
                                 self.context, constants.UUID, file_path)
         self.assertEqual("VNF properties are mandatory", exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_artifacts_and_without_sw_image_data(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_artifacts_and_without_sw_image_data(self):
         file_path = self._get_csar_file_path(
             "csar_without_sw_image_data.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -116,9 +128,7 @@ class TestCSARUtils(testtools.TestCase):
                ' type tosca.artifacts.nfv.SwImage for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_with_multiple_sw_image_data(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_with_multiple_sw_image_data(self):
         file_path = self._get_csar_file_path(
             "csar_with_multiple_sw_image_data.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -128,9 +138,7 @@ class TestCSARUtils(testtools.TestCase):
                ' is added more than one time for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_csar_with_missing_sw_image_data_in_main_template(
-            self, mock_extract_csar_zip_file):
+    def test_csar_with_missing_sw_image_data_in_main_template(self):
         file_path = self._get_csar_file_path(
             "csar_with_missing_sw_image_data_in_main_template.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -140,18 +148,14 @@ class TestCSARUtils(testtools.TestCase):
                ' type tosca.artifacts.nfv.SwImage for node VDU1.')
         self.assertEqual(msg, exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_flavour_info(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_flavour_info(self):
         file_path = self._get_csar_file_path("csar_without_flavour_info.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
                                 csar_utils.load_csar_data,
                                 self.context, constants.UUID, file_path)
         self.assertEqual("No VNF flavours are available", exc.format_message())
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_flavour_info_in_main_template(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_flavour_info_in_main_template(self):
         file_path = self._get_csar_file_path(
             "csar_without_flavour_info_in_main_template.zip")
         exc = self.assertRaises(exceptions.InvalidCSAR,
@@ -160,6 +164,132 @@ class TestCSARUtils(testtools.TestCase):
         self.assertEqual("No VNF flavours are available",
                          exc.format_message())
 
+    def test_load_csar_data_with_missing_artifact(self):
+        image = 'Files/images/cirros-0.4.0-x86_64-disk.img'
+        file_path = self._create_csar({}, "sample_vnf_package_csar.zip",
+                                      excluded_files=[image])
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.load_csar_data,
+                                self.context, constants.UUID, file_path)
+        self.assertEqual('The resource "../%s" does not exist.' % image,
+                         exc.format_message())
+        # Nothing is extracted from an invalid CSAR.
+        self.assertFalse(os.path.exists(
+            os.path.join(self.csar_path, constants.UUID)))
+
+    def test_load_csar_data_with_missing_short_notation_artifact(self):
+        df_file = 'Definitions/helloworld3_df_simple.yaml'
+        with zipfile.ZipFile(self._get_csar_file_path(
+                "sample_vnf_package_csar.zip")) as zf:
+            df_data = zf.read(df_file).decode()
+        df_data = df_data.replace(
+            'sw_image:\n'
+            '          type: tosca.artifacts.nfv.SwImage\n'
+            '          file: ../Files/images/cirros-0.4.0-x86_64-disk.img',
+            'sw_image: ../Files/images/missing.img', 1)
+        file_path = self._create_csar({df_file: df_data},
+                                      "sample_vnf_package_csar.zip")
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.load_csar_data,
+                                self.context, constants.UUID, file_path)
+        self.assertEqual('The resource "../Files/images/missing.img" does '
+                         'not exist.', exc.format_message())
+
+    @ddt.data('/etc/passwd', '../../../etc/passwd')
+    def test_load_csar_data_with_artifact_outside_csar(self, artifact_file):
+        df_file = 'Definitions/helloworld3_df_simple.yaml'
+        with zipfile.ZipFile(self._get_csar_file_path(
+                "sample_vnf_package_csar.zip")) as zf:
+            df_data = zf.read(df_file).decode()
+        df_data = df_data.replace(
+            'file: ../Files/images/cirros-0.4.0-x86_64-disk.img',
+            'file: %s' % artifact_file, 1)
+        file_path = self._create_csar({df_file: df_data},
+                                      "sample_vnf_package_csar.zip")
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.load_csar_data,
+                                self.context, constants.UUID, file_path)
+        self.assertEqual('The resource "%s" is outside of the CSAR.'
+                         % artifact_file, exc.format_message())
+
+    def test_load_csar_data_with_invalid_entry_definitions(self):
+        file_path = self._create_csar(
+            {'TOSCA-Metadata/TOSCA.meta':
+                'Entry-Definitions: Definitions/missing.yaml\n'},
+            "sample_vnf_package_csar.zip")
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.load_csar_data,
+                                self.context, constants.UUID, file_path)
+        self.assertEqual('The "Entry-Definitions" file '
+                         '"Definitions/missing.yaml" defined in the CSAR '
+                         'does not exist.', exc.format_message())
+
+    def test_load_csar_data_with_invalid_zip(self):
+        file_path = os.path.join(self.csar_path, 'invalid.zip')
+        with open(file_path, 'w') as f:
+            f.write('not a zip file')
+        self.assertRaises(exceptions.InvalidZipFile,
+                          csar_utils.load_csar_data,
+                          self.context, constants.UUID, file_path)
+
+    def test_extract_csar_zip_file_skips_large_files(self):
+        cfg.CONF.set_override('lazy_extract_size', 1, group='vnf_package')
+        self.addCleanup(cfg.CONF.clear_override, 'lazy_extract_size',
+                        group='vnf_package')
+        image = 'Files/images/large.img'
+        image_data = b'x' * (2 * 1024 * 1024)
+        file_path = self._create_csar({image: image_data},
+                                      "sample_vnf_package_csar.zip")
+        extract_path = os.path.join(self.csar_path, constants.UUID)
+
+        csar_utils.extract_csar_zip_file(file_path, extract_path)
+
+        self.assertTrue(os.path.isfile(os.path.join(
+            extract_path, 'Definitions/helloworld3_top.vnfd.yaml')))
+        self.assertTrue(os.path.isfile(os.path.join(
+            extract_path, 'Files/images/cirros-0.4.0-x86_64-disk.img')))
+        self.assertFalse(os.path.exists(os.path.join(extract_path, image)))
+
+        image_path = csar_utils.extract_csar_file(constants.UUID, image)
+
+        self.assertEqual(os.path.join(extract_path, image), image_path)
+        with open(image_path, 'rb') as f:
+            self.assertEqual(image_data, f.read())
+        # No temporary file is left behind.
+        self.assertEqual(['cirros-0.4.0-x86_64-disk.img', 'large.img'],
+                         sorted(os.listdir(os.path.dirname(image_path))))
+
+    def test_extract_csar_file_without_csar_zip(self):
+        image = 'Files/images/cirros-0.4.0-x86_64-disk.img'
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.extract_csar_file,
+                                constants.UUID, image)
+        self.assertEqual('The resource "%s" of the VNF package %s cannot be '
+                         'extracted.' % (image, constants.UUID),
+                         exc.format_message())
+        self.assertFalse(os.path.exists(
+            os.path.join(self.csar_path, constants.UUID, image)))
+
+    @ddt.data('/etc/passwd', '../other/Files/images/image.img',
+              'Files/../../image.img')
+    def test_extract_csar_file_outside_csar(self, file_name):
+        self._create_csar({}, "sample_vnf_package_csar.zip")
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils.extract_csar_file,
+                                constants.UUID, file_name)
+        self.assertEqual('The resource "%s" is outside of the VNF package '
+                         '%s.' % (file_name, constants.UUID),
+                         exc.format_message())
+
+    def test_extract_csar_file_not_in_csar_zip(self):
+        self._create_csar({}, "sample_vnf_package_csar.zip")
+        self.assertRaises(exceptions.InvalidCSAR,
+                          csar_utils.extract_csar_file,
+                          constants.UUID, 'Files/images/missing.img')
+        # No temporary file is left behind.
+        self.assertFalse(os.path.exists(
+            os.path.join(self.csar_path, constants.UUID, 'Files')))
+
     @mock.patch.object(os, 'remove')
     @mock.patch.object(shutil, 'rmtree')
     def test_delete_csar_data(self, mock_rmtree, mock_remove):
@@ -167,9 +297,7 @@ class TestCSARUtils(testtools.TestCase):
         mock_rmtree.assert_called()
         mock_remove.assert_called()
 
-    @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
-    def test_load_csar_data_without_policies(
-            self, mock_extract_csar_zip_file):
+    def test_load_csar_data_without_policies(self):
         file_path = self._get_csar_file_path("csar_without_policies.zip")
         vnf_data, flavours = csar_utils.load_csar_data(
             self.context, constants.UUID, file_path)
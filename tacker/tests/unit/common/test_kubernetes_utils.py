@@ -0,0 +1,134 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gc
+import os
+from unittest import mock
+
+import fixtures
+
+from tacker.common.container import kubernetes_utils
+from tacker.tests.unit import base
+
+
+def _auth_plugin(**kwargs):
+    auth_plugin = {'auth_url': 'https://localhost:6443',
+                   'username': 'None',
+                   'password': None,
+                   'bearer_token': 'secret_token',
+                   'ssl_ca_cert': '-----BEGIN CERTIFICATE----- abc '
+                                  '-----END CERTIFICATE-----'}
+    auth_plugin.update(kwargs)
+    return auth_plugin
+
+
+class TestKubernetesHTTPAPI(base.TestCase):
+
+    def setUp(self):
+        super(TestKubernetesHTTPAPI, self).setUp()
+        self.state_path = self.useFixture(fixtures.TempDir()).path
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.object(kubernetes_utils.CONF, 'state_path',
+                          self.state_path).start()
+        mock.patch.object(kubernetes_utils, '_api_client_cache',
+                          None).start()
+        self.mock_api_client = mock.patch.object(
+            kubernetes_utils.api_client, 'ApiClient').start()
+        self.mock_api_client.side_effect = (
+            lambda *args, **kwargs: mock.Mock(**kwargs))
+        self.kubernetes = kubernetes_utils.KubernetesHTTPAPI()
+
+    def test_get_k8s_client_cached(self):
+        k8s_client = self.kubernetes.get_k8s_client(_auth_plugin())
+
+        self.assertIs(k8s_client,
+                      self.kubernetes.get_k8s_client(_auth_plugin()))
+        self.assertEqual(1, self.mock_api_client.call_count)
+        config = k8s_client.configuration
+        self.assertTrue(config.verify_ssl)
+        self.assertEqual(os.path.join(self.state_path, 'k8s_ca_certs'),
+                         os.path.dirname(config.ssl_ca_cert))
+        with open(config.ssl_ca_cert) as f:
+            self.assertEqual('-----BEGIN CERTIFICATE-----\nabc\n'
+                             '-----END CERTIFICATE-----', f.read())
+        self.assertEqual(
+            [os.path.basename(config.ssl_ca_cert)],
+            os.listdir(os.path.dirname(config.ssl_ca_cert)))
+
+    def test_get_k8s_client_with_other_credentials(self):
+        k8s_client = self.kubernetes.get_k8s_client(_auth_plugin())
+
+        self.assertIsNot(k8s_client, self.kubernetes.get_k8s_client(
+            _auth_plugin(bearer_token='other_token')))
+        self.assertIsNot(k8s_client, self.kubernetes.get_k8s_client(
+            _auth_plugin(ssl_ca_cert='None')))
+        self.assertEqual(3, self.mock_api_client.call_count)
+
+    def test_get_k8s_client_with_ca_cert_file_not_cached(self):
+        auth_plugin = _auth_plugin(ca_cert_file='/tmp/ca_cert')
+        self.kubernetes.get_k8s_client(auth_plugin)
+        k8s_client = self.kubernetes.get_k8s_client(auth_plugin)
+
+        self.assertEqual(2, self.mock_api_client.call_count)
+        self.assertEqual('/tmp/ca_cert',
+                         k8s_client.configuration.ssl_ca_cert)
+        self.assertEqual(0, len(kubernetes_utils._get_api_client_cache()))
+
+    def test_get_k8s_client_cache_disabled(self):
+        self.config_fixture.config(group='vim_client',
+                                   k8s_api_client_cache_size=0)
+        self.kubernetes.get_k8s_client(_auth_plugin())
+        self.kubernetes.get_k8s_client(_auth_plugin())
+
+        self.assertEqual(2, self.mock_api_client.call_count)
+        self.assertIsNone(kubernetes_utils._api_client_cache)
+        self.assertFalse(kubernetes_utils.is_api_client_cache_enabled())
+
+    def test_invalidate_api_clients(self):
+        k8s_client = self.kubernetes.get_k8s_client(_auth_plugin())
+        other_client = self.kubernetes.get_k8s_client(
+            _auth_plugin(auth_url='https://other:6443'))
+
+        kubernetes_utils.invalidate_api_clients('https://localhost:6443/')
+
+        self.assertIsNot(k8s_client,
+                         self.kubernetes.get_k8s_client(_auth_plugin()))
+        self.assertIs(other_client, self.kubernetes.get_k8s_client(
+            _auth_plugin(auth_url='https://other:6443')))
+        k8s_client.close.assert_called_once_with()
+        other_client.close.assert_not_called()
+
+    def test_get_k8s_client_evicted(self):
+        self.config_fixture.config(group='vim_client',
+                                   k8s_api_client_cache_size=1)
+        k8s_client = self.kubernetes.get_k8s_client(_auth_plugin())
+        ca_cert_file = k8s_client.configuration.ssl_ca_cert
+        other_client = self.kubernetes.get_k8s_client(
+            _auth_plugin(bearer_token='other_token'))
+
+        k8s_client.close.assert_called_once_with()
+        # The CA certificate file is kept while the client is in use.
+        self.assertTrue(os.path.isfile(ca_cert_file))
+        del k8s_client
+        gc.collect()
+        self.assertEqual(
+            [os.path.basename(other_client.configuration.ssl_ca_cert)],
+            os.listdir(os.path.dirname(ca_cert_file)))
+
+    def test_invalidate_api_clients_removes_ca_cert_file(self):
+        ca_cert_file = self.kubernetes.get_k8s_client(
+            _auth_plugin()).configuration.ssl_ca_cert
+
+        kubernetes_utils.invalidate_api_clients('https://localhost:6443')
+        gc.collect()
+
+        self.assertFalse(os.path.exists(ca_cert_file))
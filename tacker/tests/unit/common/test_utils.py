@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 import testtools
 
 from tacker.common import utils
@@ -111,3 +113,47 @@ class TestValidateUrl(testtools.TestCase):
         # mandatory parameter.
         result = utils.is_valid_url("https://10.10.10.10")
         self.assertFalse(result)
+
+
+class TestLRUCache(testtools.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertEqual(['a', 'c'], cache.keys())
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual('default', cache.get('b', 'default'))
+
+    def test_on_evict(self):
+        on_evict = mock.Mock()
+        cache = utils.LRUCache(2, on_evict=on_evict)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('a', 3)
+        on_evict.assert_not_called()
+        cache.set('c', 4)
+        on_evict.assert_called_once_with('b', 2)
+        self.assertEqual(['a', 'c'], cache.keys())
+
+    def test_pop_and_clear(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.pop('a'))
+        self.assertIsNone(cache.pop('a'))
+        self.assertEqual(1, len(cache))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    @mock.patch('time.monotonic')
+    def test_ttl(self, mock_monotonic):
+        cache = utils.LRUCache(2, ttl=10)
+        mock_monotonic.return_value = 100
+        cache.set('a', 1)
+        mock_monotonic.return_value = 109
+        self.assertEqual(1, cache.get('a'))
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
@@ -18,10 +18,10 @@ import shutil
 import sys
 from unittest import mock
 
+import fixtures
 from glance_store import exceptions as store_exceptions
 from oslo_config import cfg
-from six.moves import urllib
-import six.moves.urllib.error as urlerr
+import requests
 import yaml
 
 from tacker.common import coordination
@@ -119,11 +119,67 @@ class TestConductor(SqlTestCase):
                                                    password=None)
         mock_load_csar.assert_called()
         mock_load_csar_data.assert_called()
-        mock_store.assert_called()
+        mock_store.assert_called_once_with(
+            self.context, self.vnf_package.id, mock.ANY,
+            progress_callback=mock.ANY, csar_path=mock.ANY)
         mock_onboard.assert_called()
         self.assertEqual('multihash', self.vnf_package.hash)
         self.assertEqual('location', self.vnf_package.location_glance_store)
 
+    @mock.patch.object(conductor_server.Conductor, '_onboard_vnf_package')
+    @mock.patch.object(glance_store, 'store_csar')
+    @mock.patch.object(csar_utils, 'load_csar_data')
+    @mock.patch.object(glance_store, 'load_csar')
+    def test_upload_vnf_package_from_uri_with_csar_copy(
+            self, mock_load_csar, mock_load_csar_data, mock_store,
+            mock_onboard):
+        csar_path = self.useFixture(fixtures.TempDir()).path
+        self.config_fixture.config(group='vnf_package',
+                                   vnf_package_csar_path=csar_path)
+        sizes = []
+
+        def _store_csar(context, package_uuid, body, progress_callback,
+                        csar_path):
+            progress_callback(3)
+            sizes.append(objects.VnfPackage.get_by_id(
+                self.context, package_uuid).size)
+            with open(csar_path, 'wb') as f:
+                f.write(b'csar')
+            return 'location', 4, 'checksum', 'multihash', 'loc_meta'
+
+        mock_store.side_effect = _store_csar
+        mock_load_csar_data.return_value = (mock.ANY, mock.ANY)
+
+        self.conductor.upload_vnf_package_from_uri(
+            self.context, self.vnf_package, "http://test.zip")
+
+        self.assertEqual([3], sizes)
+        self.assertEqual(4, self.vnf_package.size)
+        mock_load_csar.assert_not_called()
+        mock_load_csar_data.assert_called_once_with(
+            mock.ANY, self.vnf_package.id,
+            os.path.join(csar_path, self.vnf_package.id + '.zip'))
+
+    @mock.patch.object(glance_store, 'store_csar')
+    def test_upload_vnf_package_from_uri_failed_resets_size(self,
+                                                            mock_store):
+        def _store_csar(context, package_uuid, body, progress_callback,
+                        csar_path):
+            progress_callback(3)
+            raise exceptions.UploadFailedToGlanceStore(
+                uuid=package_uuid, error='Connection reset')
+
+        mock_store.side_effect = _store_csar
+
+        self.assertRaises(exceptions.UploadFailedToGlanceStore,
+                          self.conductor.upload_vnf_package_from_uri,
+                          self.context, self.vnf_package, "http://test.zip")
+
+        vnf_package = objects.VnfPackage.get_by_id(self.context,
+                                                   self.vnf_package.id)
+        self.assertEqual('CREATED', vnf_package.onboarding_state)
+        self.assertEqual(0, vnf_package.size)
+
     @mock.patch.object(glance_store, 'delete_csar')
     def test_delete_vnf_package(self, mock_delete_csar):
         self.vnf_package.__setattr__('onboarding_state', 'ONBOARDED')
@@ -473,6 +529,23 @@ class TestConductor(SqlTestCase):
         mock_rmtree.assert_called()
         mock_remove.assert_called()
 
+    def test_run_purge_events(self):
+        cfg.CONF.set_override('retention_period', 3600, group='events')
+        self.addCleanup(cfg.CONF.clear_override, 'retention_period',
+                        group='events')
+        with mock.patch.object(self.conductor._cos_db_plg,
+                               'purge_events') as mock_purge_events:
+            mock_purge_events.return_value = 2
+            self.conductor._run_purge_events(self.context)
+        mock_purge_events.assert_called_once_with(
+            mock.ANY, mock.ANY, CONF.events.purge_batch_size)
+
+    def test_run_purge_events_disabled(self):
+        with mock.patch.object(self.conductor._cos_db_plg,
+                               'purge_events') as mock_purge_events:
+            self.conductor._run_purge_events(self.context)
+        mock_purge_events.assert_not_called()
+
     @mock.patch.object(sys, 'exit')
     @mock.patch.object(conductor_server.LOG, 'error')
     @mock.patch.object(glance_store, 'initialize_glance_store')
@@ -487,15 +560,15 @@ class TestConductor(SqlTestCase):
                       " correctly. VNF package CSAR path directory %s doesn't"
                       " exist", mock_log_error.call_args[0][0])
 
-    @mock.patch.object(urllib.request, 'urlopen')
+    @mock.patch.object(glance_store, '_get_http_session')
     def test_upload_vnf_package_from_uri_with_invalid_auth(self,
-                                                           mock_url_open):
+                                                           mock_session):
         address_information = "http://localhost/test.zip"
         user_name = "username"
         password = "password"
-        mock_url_open.side_effect = urlerr.HTTPError(
-            url='', code=401, msg='HTTP Error 401 Unauthorized', hdrs={},
-            fp=None)
+        response = mock_session.return_value.get.return_value
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            '401 Client Error: Unauthorized')
         self.assertRaises(exceptions.VNFPackageURLInvalid,
                           self.conductor.upload_vnf_package_from_uri,
                           self.context,
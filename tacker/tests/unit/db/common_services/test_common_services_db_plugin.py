@@ -59,6 +59,22 @@ class TestCommonServicesDbPlugin(db_base.SqlTestCase):
         self.assertIn('event_details', result)
         self.assertIn('timestamp', result)
 
+    def test_create_events(self):
+        evt_obj = self._get_dummy_event_obj()
+        self.event_db_plugin.create_events(self.context, [
+            {'res_id': evt_obj['resource_id'],
+             'res_type': evt_obj['resource_type'],
+             'res_state': evt_obj['resource_state'],
+             'evt_type': evt_type,
+             'tstamp': evt_obj['timestamp'],
+             'details': evt_obj['event_details']}
+            for evt_type in ('scale_up', 'scale_down')])
+        result = self.event_db_plugin.get_events(self.context)
+        self.assertEqual(['scale_up', 'scale_down'],
+                         [event['event_type'] for event in result])
+        self.assertEqual(evt_obj['resource_id'], result[0]['resource_id'])
+        self.assertEqual(evt_obj['timestamp'], result[0]['timestamp'])
+
     def test_event_not_found(self):
         self.assertRaises(common_services.EventNotFoundException,
                           self.event_db_plugin.get_event, self.context, '99')
@@ -157,3 +173,50 @@ class TestCommonServicesDbPlugin(db_base.SqlTestCase):
         self.assertIn('event_type', result[0])
         self.assertNotIn('event_details', result[0])
         self.assertNotIn('timestamp', result[0])
+
+    def _create_events(self, timestamps):
+        evt_obj = self._get_dummy_event_obj()
+        self.event_db_plugin.create_events(self.context, [
+            {'res_id': evt_obj['resource_id'],
+             'res_type': evt_obj['resource_type'],
+             'res_state': evt_obj['resource_state'],
+             'evt_type': evt_type,
+             'tstamp': timeutils.parse_strtime(timestamp),
+             'details': evt_obj['event_details']}
+            for evt_type, timestamp in timestamps])
+
+    def test_get_events_by_page(self):
+        # The ids are not in timestamp order.
+        self._create_events([('scale_down', '2016-07-20T05:45:00.000000'),
+                             ('scale_up', '2016-07-20T05:43:00.000000'),
+                             ('heal', '2016-07-20T05:44:00.000000'),
+                             ('scale_in', '2016-07-20T05:44:00.000000')])
+
+        page = self.event_db_plugin.get_events(self.context, limit=2)
+        self.assertEqual(['scale_up', 'heal'],
+                         [event['event_type'] for event in page])
+
+        page = self.event_db_plugin.get_events(self.context, limit=2,
+                                               marker=page[-1]['id'])
+        self.assertEqual(['scale_in', 'scale_down'],
+                         [event['event_type'] for event in page])
+
+        page = self.event_db_plugin.get_events(
+            self.context, sorts=[('id', False)], limit=3)
+        self.assertEqual(['scale_down', 'scale_in', 'heal'],
+                         [event['event_type'] for event in page])
+
+    def test_purge_events(self):
+        self._create_events([('scale_up', '2016-07-20T05:43:00.000000'),
+                             ('heal', '2016-07-20T05:44:00.000000'),
+                             ('scale_in', '2016-07-20T05:45:00.000000'),
+                             ('scale_down', '2016-07-20T05:46:00.000000')])
+
+        before = timeutils.parse_strtime('2016-07-20T05:46:00.000000')
+        deleted = self.event_db_plugin.purge_events(self.context, before,
+                                                    batch_size=2)
+
+        self.assertEqual(3, deleted)
+        result = self.event_db_plugin.get_events(self.context)
+        self.assertEqual(['scale_down'],
+                         [event['event_type'] for event in result])
@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from tacker import context
+from tacker.db.common_services import event_writer
+from tacker.plugins.common import constants
+from tacker.tests.unit.db import base as db_base
+from tacker.vnfm import utils as vnfm_utils
+
+
+def _event(evt_type):
+    return {'res_id': '6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+            'res_type': constants.RES_TYPE_VNF,
+            'res_state': 'ACTIVE',
+            'evt_type': evt_type,
+            'tstamp': timeutils.utcnow(),
+            'details': ''}
+
+
+class TestEventWriter(db_base.SqlTestCase):
+
+    def setUp(self):
+        super(TestEventWriter, self).setUp()
+        self.addCleanup(mock.patch.stopall)
+        self.context = context.get_admin_context()
+        # Keep the events in the queue until flush() is called.
+        mock.patch.object(event_writer.EventWriter, '_start').start()
+        self.writer = event_writer.EventWriter()
+
+    def _override(self, **kwargs):
+        for name, value in kwargs.items():
+            cfg.CONF.set_override(name, value, group='events')
+            self.addCleanup(cfg.CONF.clear_override, name, group='events')
+
+    def test_flush_writes_batches(self):
+        self._override(batch_size=2)
+        mock_create_events = mock.patch.object(
+            self.writer._cos_db_plg, 'create_events').start()
+        events = [_event('CREATE'), _event('MONITOR'), _event('DELETE')]
+        for event in events:
+            self.writer.write(event)
+        mock_create_events.assert_not_called()
+
+        self.writer.flush()
+
+        mock_create_events.assert_has_calls([
+            mock.call(mock.ANY, events[:2]),
+            mock.call(mock.ANY, events[2:])])
+        self.assertEqual(0, self.writer._queue.unfinished_tasks)
+
+    def test_write_to_full_queue(self):
+        self._override(max_queue_size=1, queue_timeout=0)
+        writer = event_writer.EventWriter()
+        mock_create_events = mock.patch.object(
+            writer._cos_db_plg, 'create_events').start()
+        writer.write(_event('CREATE'))
+        mock_create_events.assert_not_called()
+
+        # No room left, the event is written by the caller.
+        event = _event('MONITOR')
+        writer.write(event)
+        mock_create_events.assert_called_once_with(mock.ANY, [event])
+
+    def test_run_writes_to_database(self):
+        self._override(batch_size=2)
+        self.writer.write(_event('CREATE'))
+        self.writer.write(_event('MONITOR'))
+        self.writer.write(_event('DELETE'))
+
+        # Run a single iteration of the background thread.
+        with mock.patch.object(self.writer._queue, 'get',
+                               side_effect=[self.writer._queue.get_nowait(),
+                                            self.writer._queue.get_nowait(),
+                                            SystemExit]):
+            self.assertRaises(SystemExit, self.writer._run)
+
+        events = self.writer._cos_db_plg.get_events(self.context)
+        self.assertEqual(['CREATE', 'MONITOR'],
+                         [event['event_type'] for event in events])
+        self.assertEqual(1, self.writer._queue.unfinished_tasks)
+
+    @mock.patch('tacker.db.common_services.event_writer.get_writer')
+    @mock.patch('tacker.db.common_services.common_services_db_plugin.'
+                'CommonServicesPluginDb.create_event')
+    def test_log_events(self, mock_create_event, mock_get_writer):
+        vnf_dict = {'id': '6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                    'status': 'ACTIVE'}
+        vnfm_utils.log_events(self.context, vnf_dict,
+                              constants.RES_EVT_MONITOR, 'details')
+        mock_create_event.assert_called_once_with(
+            self.context, res_id=vnf_dict['id'],
+            res_type=constants.RES_TYPE_VNF, res_state='ACTIVE',
+            evt_type=constants.RES_EVT_MONITOR, tstamp=mock.ANY,
+            details='details')
+        mock_get_writer.assert_not_called()
+
+        self._override(async_write=True)
+        vnfm_utils.log_events(self.context, vnf_dict,
+                              constants.RES_EVT_MONITOR, 'details')
+        mock_get_writer.return_value.write.assert_called_once_with(
+            {'res_id': vnf_dict['id'],
+             'res_type': constants.RES_TYPE_VNF,
+             'res_state': 'ACTIVE',
+             'evt_type': constants.RES_EVT_MONITOR,
+             'tstamp': mock.ANY,
+             'details': 'details'})
+        self.assertEqual(1, mock_create_event.call_count)
@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import io
+import os
 from unittest import mock
 
+import ddt
+import fixtures
 import glance_store
+import requests
 from six.moves import urllib
 import six.moves.urllib.error as urlerr
 
@@ -28,6 +33,19 @@ from tacker.tests.unit import base
 CONF = tacker.conf.CONF
 
 
+def _response(chunks, status_code=200, headers=None, error=None):
+    def _iter_content(chunk_size):
+        for chunk in chunks:
+            yield chunk
+        if error:
+            raise error
+
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.iter_content.side_effect = _iter_content
+    return response
+
+
+@ddt.ddt
 class StoreBaseTest(base.TestCase):
 
     def setUp(self):
@@ -37,22 +55,183 @@ class StoreBaseTest(base.TestCase):
         self.body = {"address_information": "http://welcome.com/test.zip",
                      "user_name": "user1", "password": "pass1"}
 
-    @mock.patch.object(urllib.request, 'urlopen')
-    def test_get_csar_data_iter_with_username_password(self, mock_url_open):
-        store.get_csar_data_iter(self.body)
-        mock_url_open.assert_called_once()
+    @mock.patch.object(store, 'CsarURLReader')
+    def test_get_csar_data_iter_with_username_password(self, mock_reader):
+        progress_callback = mock.Mock()
+        self.assertEqual(mock_reader.return_value, store.get_csar_data_iter(
+            self.body, progress_callback=progress_callback))
+        mock_reader.assert_called_once_with(
+            "http://welcome.com/test.zip", "user1", "pass1",
+            progress_callback=progress_callback)
 
     @mock.patch.object(urllib.request, 'urlopen')
     def test_get_csar_data_iter_without_username_password(self, mock_url_open):
-        body = {"address_information": "http://welcome.com/test.zip",
+        body = {"address_information": "ftp://welcome.com/test.zip",
                 "user_name": None, "password": None}
         store.get_csar_data_iter(body)
         mock_url_open.assert_called_once()
 
+    @mock.patch.object(store, '_get_http_session')
+    def test_get_csar_data_iter_unauthorised(self, mock_session):
+        response = mock_session.return_value.get.return_value
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            '401 Client Error: Unauthorized')
+        self.assertRaises(exceptions.VNFPackageURLInvalid,
+                          store.get_csar_data_iter, self.body)
+        response.close.assert_called_once_with()
+
     @mock.patch.object(urllib.request, 'urlopen')
-    def test_get_csar_data_iter_unauthorised(self, mock_url_open):
+    def test_get_csar_data_iter_ftp_unauthorised(self, mock_url_open):
         mock_url_open.side_effect = urlerr.HTTPError(
             url='', code=401, msg='HTTP Error 401 Unauthorized', hdrs={},
             fp=None)
+        body = dict(self.body, address_information="ftp://welcome.com/a.zip")
         self.assertRaises(exceptions.VNFPackageURLInvalid,
-                          store.get_csar_data_iter, self.body)
+                          store.get_csar_data_iter, body)
+
+    @mock.patch.object(store.time, 'sleep')
+    @mock.patch.object(store, '_get_http_session')
+    def test_csar_url_reader_resume(self, mock_session, mock_sleep):
+        mock_get = mock_session.return_value.get
+        mock_get.side_effect = [
+            _response([b'0123'], headers={
+                'Content-Length': '10', 'ETag': '"v1"',
+                'Accept-Ranges': 'bytes'},
+                error=requests.exceptions.ChunkedEncodingError('reset')),
+            _response([b'45'], status_code=206,
+                      headers={'Content-Range': 'bytes 4-9/10'}),
+            _response([b'6789'], status_code=206,
+                      headers={'Content-Range': 'bytes 6-9/10'})]
+
+        reader = store.CsarURLReader('http://welcome.com/test.zip',
+                                     'user1', 'pass1')
+        data = b''.join(iter(lambda: reader.read(3), b''))
+
+        self.assertEqual(b'0123456789', data)
+        self.assertEqual(10, reader.bytes_read)
+        mock_get.assert_has_calls([
+            mock.call('http://welcome.com/test.zip',
+                      headers={'Accept-Encoding': 'identity'},
+                      auth=('user1', 'pass1'), stream=True, timeout=60),
+            mock.call('http://welcome.com/test.zip',
+                      headers={'Accept-Encoding': 'identity',
+                               'Range': 'bytes=4-', 'If-Range': '"v1"'},
+                      auth=('user1', 'pass1'), stream=True, timeout=60),
+            mock.call('http://welcome.com/test.zip',
+                      headers={'Accept-Encoding': 'identity',
+                               'Range': 'bytes=6-', 'If-Range': '"v1"'},
+                      auth=('user1', 'pass1'), stream=True, timeout=60)])
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(2)])
+
+    @mock.patch.object(store.time, 'sleep')
+    @mock.patch.object(store, '_get_http_session')
+    def test_csar_url_reader_resume_failed(self, mock_session, mock_sleep):
+        self.config_fixture.config(group='vnf_package',
+                                   uri_download_retries=1)
+        mock_get = mock_session.return_value.get
+        mock_get.side_effect = [
+            _response([b'0123'], headers={
+                'Content-Length': '10', 'Accept-Ranges': 'bytes',
+                'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}),
+            requests.exceptions.ConnectionError('refused')]
+
+        reader = store.CsarURLReader('http://welcome.com/test.zip')
+
+        exc = self.assertRaises(exceptions.VNFPackageDownloadFailed,
+                                reader.read)
+        self.assertIn('refused', str(exc))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual('Wed, 21 Oct 2015 07:28:00 GMT',
+                         mock_get.call_args[1]['headers']['If-Range'])
+
+    @ddt.data({'Content-Length': '10', 'ETag': '"v1"'},
+              {'Content-Length': '10', 'ETag': 'W/"v1"',
+               'Accept-Ranges': 'bytes'})
+    @mock.patch.object(store, '_get_http_session')
+    def test_csar_url_reader_not_resumable(self, headers, mock_session):
+        mock_get = mock_session.return_value.get
+        mock_get.return_value = _response(
+            [b'0123'], headers=headers,
+            error=requests.exceptions.ConnectionError('reset'))
+
+        reader = store.CsarURLReader('http://welcome.com/test.zip')
+
+        self.assertRaises(exceptions.VNFPackageDownloadFailed, reader.read)
+        mock_get.assert_called_once()
+
+    @mock.patch.object(store.time, 'sleep')
+    @mock.patch.object(store, '_get_http_session')
+    def test_csar_url_reader_package_changed(self, mock_session, mock_sleep):
+        mock_session.return_value.get.side_effect = [
+            _response([b'0123'], headers={
+                'Content-Length': '10', 'ETag': '"v1"',
+                'Accept-Ranges': 'bytes'}),
+            _response([b'0123456789'], headers={'ETag': '"v2"'})]
+
+        reader = store.CsarURLReader('http://welcome.com/test.zip')
+
+        self.assertRaises(exceptions.VNFPackageDownloadFailed, reader.read)
+
+    @mock.patch.object(store.time, 'monotonic')
+    @mock.patch.object(store, '_get_http_session')
+    def test_csar_url_reader_progress(self, mock_session, mock_monotonic):
+        self.config_fixture.config(group='vnf_package',
+                                   uri_download_progress_interval=1)
+        mock_monotonic.side_effect = [0, 1, 1.5, 2]
+        mock_session.return_value.get.return_value = _response(
+            [b'01', b'23', b'45'])
+        progress_callback = mock.Mock()
+
+        reader = store.CsarURLReader('http://welcome.com/test.zip',
+                                     progress_callback=progress_callback)
+
+        self.assertEqual(b'012345', reader.read())
+        progress_callback.assert_has_calls([mock.call(2), mock.call(6)])
+        self.assertEqual(2, progress_callback.call_count)
+
+    @mock.patch.object(glance_store, 'add_to_backend_with_multihash')
+    def test_store_csar_with_csar_path(self, mock_add):
+        csar_path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'package.zip')
+        mock_add.side_effect = (
+            lambda conf, package_uuid, data, size, hashing_algo, context: (
+                'location', len(data.read(65536)), 'checksum', 'multihash',
+                {}))
+
+        self.assertEqual(
+            ('location', 4, 'checksum', 'multihash', {}),
+            store.store_csar(None, 'package', io.BytesIO(b'csar'),
+                             csar_path=csar_path))
+        with open(csar_path, 'rb') as f:
+            self.assertEqual(b'csar', f.read())
+        self.assertFalse(os.path.exists(csar_path + '.part'))
+
+    @mock.patch.object(glance_store, 'add_to_backend_with_multihash')
+    def test_store_csar_with_csar_path_failed(self, mock_add):
+        csar_path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'package.zip')
+        mock_add.side_effect = Exception('store failure')
+
+        self.assertRaises(exceptions.UploadFailedToGlanceStore,
+                          store.store_csar, None, 'package',
+                          io.BytesIO(b'csar'), csar_path=csar_path)
+        self.assertEqual([], os.listdir(os.path.dirname(csar_path)))
+
+    def test_get_csar_local_path(self):
+        csar_path = self.useFixture(fixtures.TempDir()).path
+        self.config_fixture.config(group='vnf_package',
+                                   vnf_package_csar_path=csar_path)
+        store_path = os.path.join(csar_path, 'store_file')
+        for path in (os.path.join(csar_path, 'package.zip'), store_path):
+            with open(path, 'wb') as f:
+                f.write(b'csar')
+
+        self.assertEqual(os.path.join(csar_path, 'package.zip'),
+                         store.get_csar_local_path('package',
+                                                   'file://' + store_path, 4))
+        self.assertEqual(store_path, store.get_csar_local_path(
+            'other', 'file://' + store_path, 4))
+        self.assertIsNone(store.get_csar_local_path(
+            'other', 'http://store/' + store_path, 4))
+        self.assertIsNone(store.get_csar_local_path(
+            'package', 'file://' + store_path, 5))
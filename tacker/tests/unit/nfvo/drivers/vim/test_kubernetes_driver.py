@@ -156,6 +156,12 @@ class TestKubernetes_Driver(base.TestCase):
         self.keymgr.delete.assert_called_once_with(
             t_context.generate_tacker_service_context(), 'fake-secret-uuid')
 
+    @mock.patch.object(kubernetes_driver.kubernetes_utils,
+                       'invalidate_api_clients')
+    def test_deregister_vim_invalidates_api_clients(self, mock_invalidate):
+        self.kubernetes_driver.deregister_vim(self.get_vim_obj_barbican())
+        mock_invalidate.assert_called_once_with('https://localhost:6443')
+
     def test_encode_vim_auth_barbican(self):
         self.config_fixture.config(group='k8s_vim',
                                    use_barbican=True)
@@ -305,7 +305,10 @@ class TestNfvoPlugin(db_base.SqlTestCase):
         self.assertEqual(False, res['is_default'])
         self.assertEqual('openstack', res['type'])
 
-    def test_delete_vim(self):
+    @mock.patch('tacker.vnfm.vim_client.invalidate_vim_auth')
+    @mock.patch('tacker.vnfm.keystone.invalidate_clients')
+    def test_delete_vim(self, mock_invalidate_clients,
+                        mock_invalidate_vim_auth):
         self._insert_dummy_vim()
         vim_type = u'openstack'
         vim_id = '6261579e-d6f3-49ad-8bc3-a9cb974778ff'
@@ -324,6 +327,8 @@ class TestNfvoPlugin(db_base.SqlTestCase):
         self._driver_manager.invoke.assert_called_once_with(
             vim_type, 'deregister_vim',
             vim_obj=vim_obj)
+        mock_invalidate_clients.assert_called_once_with(vim_obj['auth_url'])
+        mock_invalidate_vim_auth.assert_called_once_with(vim_id)
         self._cos_db_plugin.create_event.assert_called_with(
             self.context, evt_type=constants.RES_EVT_DELETE, res_id=mock.ANY,
             res_state=mock.ANY, res_type=constants.RES_TYPE_VIM,
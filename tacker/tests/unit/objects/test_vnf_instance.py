@@ -130,6 +130,64 @@ class TestVnfInstance(SqlTestCase):
         self.assertTrue(result.objects, list)
         self.assertTrue(result.objects)
 
+    def _create_instantiated_vnf_instance(self, **updates):
+        vnf_instance_data = fakes.get_vnf_instance_data(
+            self.vnf_package.vnfd_id)
+        vnf_instance_data.update(updates)
+        vnf_instance = objects.VnfInstance(context=self.context,
+                                           **vnf_instance_data)
+        vnf_instance.create()
+        vnf_instance.instantiated_vnf_info = objects.InstantiatedVnfInfo(
+            context=self.context, vnf_instance_id=vnf_instance.id,
+            flavour_id='simple', vnf_state='STARTED', ext_cp_info=[])
+        vnf_instance.instantiation_state = 'INSTANTIATED'
+        vnf_instance.save()
+        return vnf_instance
+
+    def test_get_by_filters(self):
+        vnf_instance = self._create_instantiated_vnf_instance()
+        self._create_instantiated_vnf_instance(vnf_instance_name='other')
+        filters = {'field': 'vnf_instance_name', 'model': 'VnfInstance',
+                   'value': vnf_instance.vnf_instance_name, 'op': '=='}
+
+        result = objects.VnfInstanceList.get_by_filters(self.context,
+                                                        filters=filters)
+
+        self.assertEqual([vnf_instance.id], [obj.id for obj in result])
+        self.assertIn('instantiated_vnf_info', result[0])
+        self.assertEqual('simple',
+                         result[0].instantiated_vnf_info.flavour_id)
+
+    def test_get_by_filters_paging(self):
+        vnf_instance_ids = sorted(
+            self._create_instantiated_vnf_instance().id for _ in range(3))
+
+        result = objects.VnfInstanceList.get_by_filters(
+            self.context, limit=2, marker=vnf_instance_ids[0])
+
+        self.assertEqual(vnf_instance_ids[1:], [obj.id for obj in result])
+
+    @mock.patch.object(objects.vnf_instance, '_vnf_instance_get_by_id',
+                       wraps=objects.vnf_instance._vnf_instance_get_by_id)
+    def test_get_by_filters_lazy_loads_instantiated_vnf_info(
+            self, mock_vnf_instance_get_by_id):
+        self._create_instantiated_vnf_instance()
+        mock_vnf_instance_get_by_id.reset_mock()
+
+        result = objects.VnfInstanceList.get_by_filters(self.context,
+                                                        expected_attrs=[])
+
+        self.assertNotIn('instantiated_vnf_info', result[0])
+        self.assertNotIn('instantiated_vnf_info', result[0].to_dict(
+            include_instantiated_info=False))
+        mock_vnf_instance_get_by_id.assert_not_called()
+        self.assertEqual('simple',
+                         result[0].instantiated_vnf_info.flavour_id)
+        mock_vnf_instance_get_by_id.assert_called_once_with(
+            self.context, result[0].id,
+            columns_to_join=['instantiated_vnf_info'])
+        self.assertEqual({}, result[0].obj_get_changes())
+
     @mock.patch('tacker.objects.vnf_instance._destroy_vnf_instance')
     def test_destroy(self, mock_vnf_destroy):
         vnf_instance_data = fakes.get_vnf_instance_data(
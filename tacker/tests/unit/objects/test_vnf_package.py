@@ -180,6 +180,40 @@ class TestVnfPackage(SqlTestCase):
             self.context, filters=filters)
         self.assertEqual(1, len(vnfpkgm_list))
 
+    def test_vnf_package_list_by_filter_paging(self):
+        package_ids = sorted([self.vnf_package.id] + [
+            self._create_vnf_package().id for _i in range(2)])
+
+        vnfpkgm_list = objects.VnfPackagesList.get_by_filters(
+            self.context, limit=2)
+        self.assertEqual(package_ids[:2], [p.id for p in vnfpkgm_list])
+
+        vnfpkgm_list = objects.VnfPackagesList.get_by_filters(
+            self.context, limit=2, marker=package_ids[1])
+        self.assertEqual(package_ids[2:], [p.id for p in vnfpkgm_list])
+
+    @mock.patch.object(objects.VnfSoftwareImage, 'get_by_id')
+    @mock.patch.object(objects.VnfDeploymentFlavour, 'get_by_id')
+    def test_vnf_package_list_by_filter_with_flavours(
+            self, mock_flavour_get_by_id, mock_sw_image_get_by_id):
+        flavour_data = dict(fakes.vnf_deployment_flavour,
+                            package_uuid=self.vnf_package.id)
+        flavour = objects.VnfDeploymentFlavour(context=self.context,
+                                               **flavour_data)
+        flavour.create()
+        sw_image_data = dict(fakes.software_image, flavour_uuid=flavour.id)
+        sw_image = objects.VnfSoftwareImage(context=self.context,
+                                            **sw_image_data)
+        sw_image.create()
+
+        vnfpkgm_list = objects.VnfPackagesList.get_by_filters(
+            self.context, expected_attrs=['vnf_deployment_flavours'])
+
+        sw_images = vnfpkgm_list[0].vnf_deployment_flavours[0].software_images
+        self.assertEqual({'key1': 'value1'}, sw_images[0].metadata)
+        mock_flavour_get_by_id.assert_not_called()
+        mock_sw_image_get_by_id.assert_not_called()
+
     def test_obj_make_compatible(self):
         data = {'id': self.vnf_package.id}
         vnf_package_obj = objects.VnfPackage(context=self.context, **data)
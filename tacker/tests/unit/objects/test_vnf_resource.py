@@ -116,3 +116,23 @@ class TestVnfResource(SqlTestCase):
             self.context, self.vnf_instance.id)
         self.assertIsInstance(result.objects, list)
         self.assertTrue(result.objects)
+
+    def test_get_by_resource_identifier(self):
+        vnf_resource = objects.VnfResource(
+            context=self.context,
+            **fakes.fake_vnf_resource_data(self.vnf_instance.id))
+        vnf_resource.create()
+        deleted_vnf_resource = objects.VnfResource(
+            context=self.context,
+            **fakes.fake_vnf_resource_data(self.vnf_instance.id))
+        deleted_vnf_resource.create()
+        deleted_vnf_resource.destroy(self.context)
+
+        result = objects.VnfResourceList.get_by_resource_identifier(
+            self.context, 'image', uuidsentinel.image_id)
+        self.assertEqual([vnf_resource.id],
+                         [res.id for res in result.objects])
+
+        result = objects.VnfResourceList.get_by_resource_identifier(
+            self.context, 'image', uuidsentinel.other_image_id)
+        self.assertEqual([], result.objects)
@@ -97,3 +97,103 @@ class TestAlarmReceiver(base.TestCase):
                          body_dict['trigger']['policy_name'])
         self.assertEqual(self.alarm_url['04_action_name'],
                          body_dict['trigger']['action_name'])
+
+
+@mock.patch('tacker.vnfm.monitor_drivers.token.Token.create_token',
+            return_value='fake_token')
+@mock.patch('eventlet.spawn_n')
+class TestAlarmReceiverAsync(base.TestCase):
+    def setUp(self):
+        super(TestAlarmReceiverAsync, self).setUp()
+        self.config_fixture.config(group='alarm_receiver',
+                                   async_dispatch=True, queue_size=2,
+                                   dispatch_workers=3)
+        self.app = mock.Mock(side_effect=self._app)
+        self.requests = []
+        self.alarmrc = AlarmReceiver(self.app)
+
+    def _app(self, environ, start_response):
+        self.requests.append(Request(environ))
+        start_response('202 Accepted', [])
+        return [b'']
+
+    def _alarm_request(self, action='respawn', key='8ef785'):
+        req = Request.blank('http://tacker:9890/v1.0/vnfs/vnf-uuid/'
+                            'mon-policy-name/%s/%s' % (action, key))
+        req.method = 'POST'
+        req.body = jsonutils.dump_as_bytes({'fake_key': 'fake_value'})
+        return req
+
+    def _dispatch_queued_alarms(self):
+        while self.alarmrc._queue.qsize():
+            self.alarmrc._dispatch_alarm(*self.alarmrc._queue.get())
+
+    def test_alarm_accepted_and_dispatched(self, mock_spawn_n,
+                                           mock_create_token):
+        resp = self._alarm_request().get_response(self.alarmrc)
+
+        self.assertEqual(202, resp.status_int)
+        self.assertEqual(3, mock_spawn_n.call_count)
+        self.assertEqual([], self.requests)
+        mock_create_token.assert_not_called()
+
+        self._dispatch_queued_alarms()
+
+        self.assertEqual(1, len(self.requests))
+        req = self.requests[0]
+        self.assertEqual('/vnfs/vnf-uuid/triggers', req.path_info)
+        self.assertEqual('fake_token', req.headers['X_AUTH_TOKEN'])
+        body = jsonutils.loads(req.body)
+        self.assertEqual('respawn', body['trigger']['action_name'])
+        self.assertEqual({'fake_key': 'fake_value'},
+                         body['trigger']['params']['data'])
+
+    def test_alarm_copied_without_lock(self, mock_spawn_n,
+                                       mock_create_token):
+        copy = Request.copy
+
+        def _copy(req):
+            self.assertFalse(self.alarmrc._queue_lock.locked())
+            return copy(req)
+
+        with mock.patch.object(Request, 'copy', autospec=True,
+                               side_effect=_copy) as mock_copy:
+            resp = self._alarm_request().get_response(self.alarmrc)
+
+        self.assertEqual(202, resp.status_int)
+        mock_copy.assert_called_once()
+        self.assertEqual(1, self.alarmrc._queue.qsize())
+
+    def test_duplicated_alarms_dropped(self, mock_spawn_n,
+                                       mock_create_token):
+        for _i in range(3):
+            resp = self._alarm_request().get_response(self.alarmrc)
+            self.assertEqual(202, resp.status_int)
+        self._alarm_request(action='log').get_response(self.alarmrc)
+        self._alarm_request(key='other').get_response(self.alarmrc)
+
+        self.assertEqual(2, self.alarmrc._queue.qsize())
+        self._dispatch_queued_alarms()
+        self.assertEqual(2, len(self.requests))
+
+    def test_duplicated_alarms_after_window(self, mock_spawn_n,
+                                            mock_create_token):
+        self.config_fixture.config(group='alarm_receiver', dedup_window=0)
+        self._alarm_request().get_response(self.alarmrc)
+        self._alarm_request().get_response(self.alarmrc)
+
+        self.assertEqual(2, self.alarmrc._queue.qsize())
+
+    def test_alarm_rejected_when_queue_full(self, mock_spawn_n,
+                                            mock_create_token):
+        self._alarm_request(action='respawn').get_response(self.alarmrc)
+        self._alarm_request(action='log').get_response(self.alarmrc)
+        resp = self._alarm_request(action='scale').get_response(
+            self.alarmrc)
+
+        self.assertEqual(503, resp.status_int)
+        self._dispatch_queued_alarms()
+        # Not deduplicated since it was not dispatched
+        resp = self._alarm_request(action='scale').get_response(
+            self.alarmrc)
+        self.assertEqual(202, resp.status_int)
@@ -971,7 +971,7 @@ class TestController(base.TestCase):
 
         self.assertEqual(expected_message, exception.msg)
 
-    @mock.patch.object(objects.VnfInstanceList, "get_all")
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
     def test_index(self, mock_vnf_list):
         req = fake_request.HTTPRequest.blank('/vnf_instances')
         vnf_instance_1 = fakes.return_vnf_instance()
@@ -984,8 +984,12 @@ class TestController(base.TestCase):
             fakes.fake_vnf_instance_response(
             fields.VnfInstanceState.INSTANTIATED)]
         self.assertEqual(expected_result, resp)
+        mock_vnf_list.assert_called_once_with(
+            req.context, filters=None,
+            expected_attrs=['instantiated_vnf_info'], limit=None,
+            marker=None)
 
-    @mock.patch.object(objects.VnfInstanceList, "get_all")
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
     def test_index_empty_response(self, mock_vnf_list):
         req = fake_request.HTTPRequest.blank('/vnf_instances')
 
@@ -993,6 +997,73 @@ class TestController(base.TestCase):
         resp = self.controller.index(req)
         self.assertEqual([], resp)
 
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_filter(self, mock_vnf_list):
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?filter=(eq,instantiationState,INSTANTIATED)')
+        mock_vnf_list.return_value = []
+
+        self.controller.index(req)
+
+        filters = {'field': 'instantiation_state', 'model': 'VnfInstance',
+                   'value': 'INSTANTIATED', 'op': '=='}
+        self.assertEqual(filters, mock_vnf_list.call_args[1]['filters'])
+
+    @ddt.data('(eq,vnfPkgId,%s)' % constants.UUID,
+              '(eq,instantiationState,UNKNOWN)')
+    def test_index_invalid_filter(self, filter_rule):
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?filter=%s' % filter_rule)
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.BAD_REQUEST, resp.status_code)
+
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_exclude_default(self, mock_vnf_list):
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?exclude_default')
+        mock_vnf_list.return_value = [fakes.return_vnf_instance(
+            fields.VnfInstanceState.INSTANTIATED)]
+
+        resp = self.controller.index(req)
+
+        expected_result = fakes.fake_vnf_instance_response(
+            fields.VnfInstanceState.INSTANTIATED)
+        del expected_result['instantiatedVnfInfo']
+        del expected_result['vimConnectionInfo']
+        self.assertEqual([expected_result], resp)
+        self.assertEqual([], mock_vnf_list.call_args[1]['expected_attrs'])
+
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_paging(self, mock_vnf_list):
+        self.config_fixture.config(group='vnf_lcm', list_page_size=1)
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_instances?nextpage_opaque_marker=marker')
+        mock_vnf_list.return_value = [
+            fakes.return_vnf_instance(),
+            fakes.return_vnf_instance(fields.VnfInstanceState.INSTANTIATED)]
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([fakes.fake_vnf_instance_response()], resp.obj)
+        self.assertEqual(
+            '<%s?nextpage_opaque_marker=%s>; rel="next"' % (
+                req.path_url, uuidsentinel.vnf_instance_id),
+            resp.headers['Link'])
+        self.assertEqual(2, mock_vnf_list.call_args[1]['limit'])
+        self.assertEqual('marker', mock_vnf_list.call_args[1]['marker'])
+
+    @mock.patch.object(objects.VnfInstanceList, "get_by_filters")
+    def test_index_last_page(self, mock_vnf_list):
+        self.config_fixture.config(group='vnf_lcm', list_page_size=1)
+        req = fake_request.HTTPRequest.blank('/vnf_instances')
+        mock_vnf_list.return_value = [fakes.return_vnf_instance()]
+
+        resp = self.controller.index(req)
+
+        self.assertEqual([fakes.fake_vnf_instance_response()], resp)
+
     @ddt.data('HEAD', 'PUT', 'DELETE', 'PATCH')
     def test_index_invalid_http_method(self, method):
         # Wrong HTTP method
@@ -14,10 +14,14 @@
 # limitations under the License.
 
 import os
+from unittest import mock
 
 import ddt
+import fixtures
 from oslo_config import cfg
+import yaml
 
+from tacker import objects
 from tacker.tests.unit import base
 from tacker.tests.unit.vnflcm import fakes
 from tacker.tests import uuidsentinel
@@ -39,11 +43,95 @@ class VnfLcmUtilsTestCase(base.TestCase):
     def test_create_grant_request_with_software_image_path(self, image_path,
                                                            extracted_path):
         vnf_package_id = uuidsentinel.package_uuid
+        vnf_package_path = self.useFixture(fixtures.TempDir()).path
+        self.config_fixture.config(group='vnf_package',
+                                   vnf_package_csar_path=vnf_package_path)
+        expected_image_path = os.path.join(vnf_package_path, vnf_package_id,
+                                           extracted_path)
+        os.makedirs(os.path.dirname(expected_image_path))
+        open(expected_image_path, 'w').close()
         vnfd_dict = fakes.get_vnfd_dict(image_path=image_path)
         vnf_software_images = vnflcm_utils._create_grant_request(
             vnfd_dict, vnf_package_id)
-        vnf_package_path = cfg.CONF.vnf_package.vnf_package_csar_path
-        expected_image_path = os.path.join(vnf_package_path, vnf_package_id,
-                                           extracted_path)
         self.assertEqual(expected_image_path,
                          vnf_software_images['VDU1'].image_path)
+
+
+class VnfPackageCacheTestCase(base.TestCase):
+
+    def setUp(self):
+        super(VnfPackageCacheTestCase, self).setUp()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(vnflcm_utils.invalidate_vnf_package_cache,
+                        uuidsentinel.package_uuid)
+        csar_base_path = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('vnf_package_csar_path', csar_base_path,
+                              group='vnf_package')
+        self.addCleanup(cfg.CONF.clear_override, 'vnf_package_csar_path',
+                        group='vnf_package')
+        csar_path = os.path.join(csar_base_path, uuidsentinel.package_uuid)
+        for dir_name, file_name, data in (
+                ('Definitions', 'df_simple.yaml',
+                 {'topology_template': {'substitution_mappings': {
+                     'properties': {'flavour_id': 'simple'},
+                     'requirements': {'virtual_link_external': []}}}}),
+                ('BaseHOT', 'base_hot.yaml',
+                 {'heat_template_version': '2013-05-23'})):
+            os.makedirs(os.path.join(csar_path, dir_name))
+            with open(os.path.join(csar_path, dir_name, file_name),
+                      'w') as f:
+                yaml.safe_dump(data, f)
+
+        mock.patch.object(
+            objects.VnfPackageVnfd, 'get_by_id',
+            return_value=mock.Mock(
+                package_uuid=uuidsentinel.package_uuid)).start()
+        self.vnf_package = mock.Mock(hash='checksum')
+        mock.patch.object(objects.VnfPackage, 'get_by_id',
+                          return_value=self.vnf_package).start()
+        self.safe_load = mock.patch.object(
+            yaml, 'safe_load', side_effect=yaml.safe_load).start()
+
+    def test_get_vnfd_dict_is_cached(self):
+        vnfd_dict = vnflcm_utils._get_vnfd_dict(
+            None, uuidsentinel.vnfd_id, 'simple')
+        self.assertNotIn('requirements', vnfd_dict['topology_template'][
+            'substitution_mappings'])
+        vnfd_dict['topology_template'].clear()
+        load_count = self.safe_load.call_count
+
+        # Callers modify the returned dict, the cached one is unchanged.
+        self.assertEqual(
+            {'properties': {'flavour_id': 'simple'}},
+            vnflcm_utils._get_vnfd_dict(
+                None, uuidsentinel.vnfd_id, 'simple')[
+                    'topology_template']['substitution_mappings'])
+        self.assertEqual(load_count, self.safe_load.call_count)
+
+    def test_get_base_hot_dict_is_cached(self):
+        for i in range(2):
+            self.assertEqual(
+                {'heat_template_version': '2013-05-23'},
+                vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id))
+        self.assertEqual(1, self.safe_load.call_count)
+
+    def test_cache_is_invalidated(self):
+        vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id)
+
+        vnflcm_utils.invalidate_vnf_package_cache(uuidsentinel.package_uuid)
+        vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id)
+        self.assertEqual(2, self.safe_load.call_count)
+
+        # The package was uploaded again with different contents.
+        self.vnf_package.hash = 'new-checksum'
+        vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id)
+        self.assertEqual(3, self.safe_load.call_count)
+
+    def test_cache_disabled(self):
+        cfg.CONF.set_override('vnfd_cache_size', 0, group='vnf_package')
+        self.addCleanup(cfg.CONF.clear_override, 'vnfd_cache_size',
+                        group='vnf_package')
+        vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id)
+        vnflcm_utils._get_base_hot_dict(None, uuidsentinel.vnfd_id)
+        self.assertEqual(2, self.safe_load.call_count)
+        objects.VnfPackage.get_by_id.assert_not_called()
@@ -27,6 +27,7 @@ from tacker.objects import fields
 from tacker.tests.unit.db import base as db_base
 from tacker.tests.unit.vnflcm import fakes
 from tacker.tests import uuidsentinel
+from tacker.vnflcm import utils as vnflcm_utils
 from tacker.vnflcm import vnflcm_driver
 from tacker.vnfm import vim_client
 
@@ -100,6 +101,14 @@ class TestVnflcmDriver(db_base.SqlTestCase):
         self._mock_vim_client()
         self._stub_get_vim()
         self.temp_dir = self.useFixture(fixtures.TempDir()).path
+        self._mock_vnf_package()
+
+    def _mock_vnf_package(self):
+        # Every test copies its own CSAR for the same package.
+        mock.patch.object(objects.VnfPackage, 'get_by_id',
+                          return_value=mock.Mock(hash='checksum')).start()
+        self.addCleanup(vnflcm_utils.invalidate_vnf_package_cache,
+                        fakes.return_vnf_package_vnfd().package_uuid)
 
     def _mock_vnf_manager(self, fail_method_name=None, vnf_resource_count=1):
         self._vnf_manager = mock.Mock(wraps=FakeDriverManager(
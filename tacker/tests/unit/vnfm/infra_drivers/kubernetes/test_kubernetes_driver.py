@@ -0,0 +1,127 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from kubernetes import client
+
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
+from tacker.vnfm.infra_drivers.kubernetes import kubernetes_driver
+
+
+def _pod(name, phase, deployment_name=None):
+    labels = None
+    if deployment_name:
+        labels = {translate_outputs.DEPLOYMENT_LABEL: deployment_name}
+    return client.V1Pod(
+        metadata=client.V1ObjectMeta(name=name, labels=labels),
+        status=client.V1PodStatus(phase=phase))
+
+
+def _deployment(name, labelled):
+    labels = {'selector': name}
+    if labelled:
+        labels[translate_outputs.DEPLOYMENT_LABEL] = name
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(name=name),
+        spec=client.V1DeploymentSpec(
+            selector=client.V1LabelSelector(match_labels={'selector': name}),
+            template=client.V1PodTemplateSpec(
+                metadata=client.V1ObjectMeta(labels=labels))))
+
+
+class TestKubernetes(base.TestCase):
+
+    def setUp(self):
+        super(TestKubernetes, self).setUp()
+        self.kubernetes = kubernetes_driver.Kubernetes()
+        self.core_v1_api_client = mock.Mock()
+        self.extension_api_client = mock.Mock()
+        self.extension_api_client.read_namespaced_deployment.side_effect = (
+            lambda namespace, name: _deployment(name, labelled=True))
+
+    def test_get_pods_information(self):
+        pods = [_pod('vdu1-5d8c7b9f4-x2k8p', 'Running', 'vdu1'),
+                _pod('vdu2-7f9c6d8b5-q4m7z', 'Pending', 'vdu2')]
+        self.core_v1_api_client.list_namespaced_pod.return_value = \
+            client.V1PodList(items=pods)
+
+        pods_information = self.kubernetes._get_pods_information(
+            core_v1_api_client=self.core_v1_api_client,
+            extension_api_client=self.extension_api_client,
+            deployment_info=['default', 'vdu1', 'default', 'vdu2'])
+
+        self.assertEqual(pods, pods_information)
+        self.core_v1_api_client.list_namespaced_pod.assert_called_once_with(
+            namespace='default', label_selector='tacker_deployment in '
+                                                '(vdu1,vdu2)')
+        self.assertEqual('Pending',
+                         self.kubernetes._get_pod_status(pods_information))
+
+    def test_get_pods_information_without_label(self):
+        self.extension_api_client.read_namespaced_deployment.side_effect = (
+            lambda namespace, name: _deployment(name, labelled=False))
+        labelled_pod = _pod('vdu1-5d8c7b9f4-x2k8p', 'Running', 'vdu1')
+        unlabelled_pod = _pod('vdu2-7f9c6d8b5-q4m7z', 'Running')
+        self.core_v1_api_client.list_namespaced_pod.side_effect = [
+            client.V1PodList(items=[labelled_pod]),
+            client.V1PodList(items=[labelled_pod, unlabelled_pod,
+                                    _pod('other-6c7d8e9f1-a1b2c', 'Pending')])]
+
+        pods_information = self.kubernetes._get_pods_information(
+            core_v1_api_client=self.core_v1_api_client,
+            extension_api_client=self.extension_api_client,
+            deployment_info=['default', 'vdu1', 'default', 'vdu2'])
+
+        self.assertEqual([labelled_pod, unlabelled_pod], pods_information)
+        self.core_v1_api_client.list_namespaced_pod.assert_has_calls([
+            mock.call(namespace='default',
+                      label_selector='tacker_deployment in (vdu1,vdu2)'),
+            mock.call(namespace='default')])
+
+    def test_get_pods_information_per_namespace(self):
+        self.core_v1_api_client.list_namespaced_pod.side_effect = [
+            client.V1PodList(items=[_pod('vdu1-5d8c7b9f4-x2k8p', 'Running',
+                                         'vdu1')]),
+            client.V1PodList(items=[_pod('vdu2-7f9c6d8b5-q4m7z', 'Running',
+                                         'vdu2')])]
+
+        pods_information = self.kubernetes._get_pods_information(
+            core_v1_api_client=self.core_v1_api_client,
+            extension_api_client=self.extension_api_client,
+            deployment_info=['ns1', 'vdu1', 'ns2', 'vdu2'])
+
+        self.assertEqual(2, len(pods_information))
+        self.core_v1_api_client.list_namespaced_pod.assert_has_calls([
+            mock.call(namespace='ns1',
+                      label_selector='tacker_deployment in (vdu1)'),
+            mock.call(namespace='ns2',
+                      label_selector='tacker_deployment in (vdu2)')])
+
+    def test_get_pods_information_labelled_deployment_without_pods(self):
+        self.core_v1_api_client.list_namespaced_pod.return_value = \
+            client.V1PodList(items=[])
+
+        for i in range(2):
+            pods_information = self.kubernetes._get_pods_information(
+                core_v1_api_client=self.core_v1_api_client,
+                extension_api_client=self.extension_api_client,
+                deployment_info=['default', 'vdu1'])
+
+        self.assertEqual([], pods_information)
+        self.assertEqual(
+            [mock.call(namespace='default',
+                       label_selector='tacker_deployment in (vdu1)')] * 2,
+            self.core_v1_api_client.list_namespaced_pod.call_args_list)
+        self.extension_api_client.read_namespaced_deployment.\
+            assert_called_once_with(namespace='default', name='vdu1')
@@ -20,6 +20,7 @@ import tempfile
 from unittest import mock
 
 import ddt
+import eventlet
 import requests
 import yaml
 
@@ -1011,6 +1012,82 @@ class TestOpenStack(base.FixturedTestCase):
         self.assertEqual(import_image_url.call_count, 1)
         self.assertEqual(get_image_url.call_count, 10)
 
+    def _mock_glance_client(self, events, fail_image=None):
+        glance_client = mock.patch('tacker.vnfm.infra_drivers.openstack.'
+                                   'glance_client.GlanceClient').start()
+
+        def _create(name, **kwargs):
+            events.append(('create', name))
+            if name == fail_image:
+                raise Exception('create failed')
+            return mock.Mock(id=name + '-id')
+
+        def _image_create_wait(image_id, *args):
+            events.append(('wait', image_id))
+            # Let the other images be created in the meantime.
+            eventlet.sleep(0)
+            events.append(('active', image_id))
+
+        glance_client.return_value.create.side_effect = _create
+        mock.patch.object(self.openstack, '_image_create_wait',
+                          side_effect=_image_create_wait).start()
+        return glance_client.return_value
+
+    def _get_vnf_software_images(self, *names):
+        vnf_software_images = {}
+        for name in names:
+            vnf_software_image = fd_utils.get_vnf_software_image_object(
+                image_path='/images/' + name + '.img')
+            vnf_software_image.name = name
+            vnf_software_images[name + '-node'] = vnf_software_image
+        return vnf_software_images
+
+    @ddt.data((1, [('create', 'image1'), ('wait', 'image1-id'),
+                   ('active', 'image1-id'), ('create', 'image2'),
+                   ('wait', 'image2-id'), ('active', 'image2-id')]),
+              (2, [('create', 'image1'), ('wait', 'image1-id'),
+                   ('create', 'image2'), ('wait', 'image2-id'),
+                   ('active', 'image1-id'), ('active', 'image2-id')]))
+    @ddt.unpack
+    def test_pre_instantiation_vnf_creates_images_concurrently(
+            self, workers, expected_events):
+        self.config_fixture.config(group='openstack_vim',
+                                   image_create_workers=workers)
+        events = []
+        self._mock_glance_client(events)
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        vnf_resources = self.openstack.pre_instantiation_vnf(
+            self.context, vnf_instance, None,
+            self._get_vnf_software_images('image1', 'image2'))
+
+        self.assertEqual(expected_events, events)
+        self.assertEqual(
+            {'image1-node': 'image1-id', 'image2-node': 'image2-id'},
+            {node_name: resources[0].resource_identifier
+             for node_name, resources in vnf_resources.items()})
+
+    def test_pre_instantiation_vnf_rolls_back_concurrent_images(self):
+        self.config_fixture.config(group='openstack_vim',
+                                   image_create_workers=2)
+        events = []
+        glance_client = self._mock_glance_client(events,
+                                                 fail_image='image2')
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        self.assertRaises(exceptions.VnfPreInstantiationFailed,
+                          self.openstack.pre_instantiation_vnf,
+                          self.context, vnf_instance, None,
+                          self._get_vnf_software_images(
+                              'image1', 'image2', 'image3'))
+
+        # image3 is not created once image2 failed, and image1 is deleted
+        # after it became active.
+        self.assertEqual([('create', 'image1'), ('wait', 'image1-id'),
+                          ('create', 'image2'), ('active', 'image1-id')],
+                         events)
+        glance_client.delete.assert_called_once_with('image1-id')
+
     def _exception_response_in_import_image(self):
         url = os.path.join(self.glance_url, 'images', uuidsentinel.image_id,
                            'import')
@@ -1051,6 +1128,162 @@ class TestOpenStack(base.FixturedTestCase):
         delete_call_count = 2 if exception_in_delete else 1
         self.assertEqual(delete_image_url.call_count, delete_call_count)
 
+    @mock.patch.object(objects.VnfResource, 'create')
+    @mock.patch('tacker.common.coordination.Coordinator.get_lock')
+    def test_pre_instantiation_vnf_reuses_image(self, mock_get_lock,
+                                                mock_create):
+        self.config_fixture.config(group='openstack_vim', reuse_images=True)
+        events = []
+        glance_client = self._mock_glance_client(events)
+        glance_client.list.return_value = [
+            mock.Mock(id='other-id', hash_value='other-hash'),
+            mock.Mock(id='shared-id', hash_value='hash')]
+        glance_client.get.return_value = mock.Mock(status='active')
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        vnf_resources = self.openstack.pre_instantiation_vnf(
+            self.context, vnf_instance, None,
+            self._get_vnf_software_images('image1'))
+
+        self.assertEqual([], events)
+        glance_client.list.assert_called_once_with(
+            tag='tacker-sw-image-hash', status='active',
+            owner=glance_client.project_id)
+        glance_client.get.assert_called_once_with('shared-id')
+        mock_get_lock.assert_called_once_with('image-shared-id')
+        vnf_resource = vnf_resources['image1-node'][0]
+        self.assertEqual('shared-id', vnf_resource.resource_identifier)
+        mock_create.assert_called_once_with()
+
+    @mock.patch.object(objects.VnfResource, 'create')
+    @mock.patch('tacker.common.coordination.Coordinator.get_lock')
+    def test_pre_instantiation_vnf_creates_reusable_image(self,
+                                                          mock_get_lock,
+                                                          mock_create):
+        self.config_fixture.config(group='openstack_vim', reuse_images=True)
+        events = []
+        glance_client = self._mock_glance_client(events)
+        glance_client.list.return_value = [
+            mock.Mock(id='deleted-id', hash_value='hash')]
+        # The image was deleted after it was listed.
+        glance_client.get.return_value = None
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        vnf_resources = self.openstack.pre_instantiation_vnf(
+            self.context, vnf_instance, None,
+            self._get_vnf_software_images('image1'))
+
+        self.assertEqual([('create', 'image1'), ('wait', 'image1-id'),
+                          ('active', 'image1-id')], events)
+        glance_client.create.assert_called_once_with(
+            'image1', min_disk=10, min_ram=4, disk_format='qcow2',
+            container_format='bare', visibility='private',
+            filename='/images/image1.img', tags=['tacker-sw-image-hash'])
+        self.assertEqual('image1-id',
+                         vnf_resources['image1-node'][0].resource_identifier)
+        mock_create.assert_called_once_with()
+
+    def _mock_vnf_resources(self, events):
+        vnf_resources = []
+
+        def _create(vnf_resource):
+            events.append(('save', vnf_resource.resource_identifier))
+            vnf_resource.id = uuidsentinel.vnf_resource_id
+            vnf_resources.append(vnf_resource)
+
+        def _destroy(vnf_resource, context):
+            events.append(('destroy', vnf_resource.resource_identifier))
+            vnf_resources.remove(vnf_resource)
+
+        mock.patch.object(objects.VnfResource, 'create', autospec=True,
+                          side_effect=_create).start()
+        mock.patch.object(objects.VnfResource, 'destroy', autospec=True,
+                          side_effect=_destroy).start()
+        mock.patch.object(
+            objects.VnfResourceList, 'get_by_resource_identifier',
+            side_effect=lambda context, resource_type, image_id: [
+                vnf_resource for vnf_resource in vnf_resources
+                if vnf_resource.resource_identifier == image_id]).start()
+
+    @mock.patch('tacker.common.coordination.Coordinator.get_lock')
+    def test_pre_instantiation_vnf_reusable_image_released_while_created(
+            self, mock_get_lock):
+        self.config_fixture.config(group='openstack_vim', reuse_images=True)
+        events = []
+        glance_client = self._mock_glance_client(events)
+        glance_client.list.return_value = []
+        self._mock_vnf_resources(events)
+        other_resource = objects.VnfResource(
+            context=self.context, resource_type='image',
+            resource_identifier='image1-id')
+
+        def _image_create_wait(image_id, *args):
+            # Another VNF instance reuses the image as soon as it is
+            # active, and is terminated before it is created.
+            events.append(('active', image_id))
+            self.openstack._release_shared_image(
+                self.context, glance_client, other_resource, image_id)
+
+        self.openstack._image_create_wait.side_effect = _image_create_wait
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        vnf_resources = self.openstack.pre_instantiation_vnf(
+            self.context, vnf_instance, None,
+            self._get_vnf_software_images('image1'))
+
+        self.assertEqual([('create', 'image1'), ('save', 'image1-id'),
+                          ('active', 'image1-id')], events)
+        glance_client.delete.assert_not_called()
+        self.assertEqual(uuidsentinel.vnf_resource_id,
+                         vnf_resources['image1-node'][0].id)
+        mock_get_lock.assert_has_calls([mock.call('image-image1-id')])
+
+    @mock.patch('tacker.common.coordination.Coordinator.get_lock')
+    def test_pre_instantiation_vnf_reusable_image_not_active(self,
+                                                             mock_get_lock):
+        self.config_fixture.config(group='openstack_vim', reuse_images=True)
+        events = []
+        glance_client = self._mock_glance_client(events)
+        glance_client.list.return_value = []
+        self._mock_vnf_resources(events)
+        self.openstack._image_create_wait.side_effect = Exception(
+            'image error')
+        vnf_instance = fd_utils.get_vnf_instance_object()
+
+        self.assertRaises(exceptions.VnfPreInstantiationFailed,
+                          self.openstack.pre_instantiation_vnf,
+                          self.context, vnf_instance, None,
+                          self._get_vnf_software_images('image1'))
+
+        self.assertEqual([('create', 'image1'), ('save', 'image1-id'),
+                          ('destroy', 'image1-id')], events)
+        glance_client.delete.assert_called_once_with('image1-id')
+
+    @ddt.data(([], 1), (['other-resource'], 0))
+    @ddt.unpack
+    @mock.patch.object(objects.VnfResourceList, 'get_by_resource_identifier')
+    @mock.patch('tacker.common.coordination.Coordinator.get_lock')
+    def test_delete_vnf_instance_resource_shared_image(
+            self, other_resources, delete_count, mock_get_lock,
+            mock_get_by_resource_identifier):
+        self.config_fixture.config(group='openstack_vim', reuse_images=True)
+        glance_client = self._mock_glance_client([])
+        mock_get_by_resource_identifier.return_value = other_resources
+        vnf_instance = fd_utils.get_vnf_instance_object()
+        vnf_resource = fd_utils.get_vnf_resource_object(
+            resource_type='image')
+
+        with mock.patch.object(vnf_resource, 'destroy') as mock_destroy:
+            self.openstack.delete_vnf_instance_resource(
+                self.context, vnf_instance, None, vnf_resource)
+
+        mock_get_lock.assert_called_once_with(
+            'image-' + vnf_resource.resource_identifier)
+        mock_destroy.assert_called_once_with(self.context)
+        mock_get_by_resource_identifier.assert_called_once_with(
+            self.context, 'image', vnf_resource.resource_identifier)
+        self.assertEqual(delete_count, glance_client.delete.call_count)
+
     @mock.patch('tacker.vnfm.infra_drivers.openstack.openstack.LOG')
     def test_delete_vnf_instance_resource(self, mock_log):
         vnf_instance = fd_utils.get_vnf_instance_object()
@@ -0,0 +1,152 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.extensions import vnfm
+from tacker.tests.unit import base
+from tacker.vnfm.infra_drivers.openstack import openstack
+from tacker.vnfm.infra_drivers.openstack import stack_poller
+
+
+def _stack(stack_id, status, reason=''):
+    return mock.Mock(id=stack_id, stack_status=status,
+                     stack_status_reason=reason)
+
+
+class TestStackPoller(base.TestCase):
+
+    def setUp(self):
+        super(TestStackPoller, self).setUp()
+        self.config_fixture.config(group='openstack_vim',
+                                   stack_poll_min_wait=1,
+                                   stack_retry_wait=1)
+        mock.patch.dict(stack_poller._pollers, clear=True).start()
+        self.addCleanup(mock.patch.stopall)
+        self.poller = stack_poller.StackPoller()
+        self.heatclient = mock.Mock()
+
+    def test_poll_wakes_completed_stacks(self):
+        waiter_1 = stack_poller._Waiter('stack-1', 'CREATE_IN_PROGRESS')
+        waiter_2 = stack_poller._Waiter('stack-2', 'DELETE_IN_PROGRESS')
+        self.poller._waiters = {'stack-1': [waiter_1],
+                                'stack-2': [waiter_2]}
+        self.heatclient.stacks.list.return_value = [
+            _stack('stack-1', 'CREATE_COMPLETE'),
+            _stack('stack-2', 'DELETE_IN_PROGRESS')]
+
+        self.assertTrue(self.poller._poll(self.heatclient,
+                                          ['stack-1', 'stack-2']))
+
+        self.heatclient.stacks.list.assert_called_once_with(
+            filters={'id': ['stack-1', 'stack-2']}, show_deleted=True)
+        self.assertTrue(waiter_1.event.is_set())
+        self.assertEqual('CREATE_COMPLETE', waiter_1.stack.stack_status)
+        self.assertFalse(waiter_2.event.is_set())
+        self.assertEqual({'stack-2': [waiter_2]}, self.poller._waiters)
+
+    @mock.patch.object(stack_poller, 'MAX_STACKS_PER_REQUEST', 2)
+    def test_poll_splits_requests(self):
+        stack_ids = ['stack-1', 'stack-2', 'stack-3']
+        self.heatclient.stacks.list.return_value = []
+
+        self.assertFalse(self.poller._poll(self.heatclient, stack_ids))
+
+        self.heatclient.stacks.list.assert_has_calls([
+            mock.call(filters={'id': ['stack-1', 'stack-2']},
+                      show_deleted=True),
+            mock.call(filters={'id': ['stack-3']}, show_deleted=True)])
+
+    def test_poll_with_api_error(self):
+        waiter = stack_poller._Waiter('stack-1', 'CREATE_IN_PROGRESS')
+        self.poller._waiters = {'stack-1': [waiter]}
+        self.heatclient.stacks.list.side_effect = Exception('unavailable')
+
+        self.assertFalse(self.poller._poll(self.heatclient, ['stack-1']))
+        self.assertFalse(waiter.event.is_set())
+        self.assertEqual({'stack-1': [waiter]}, self.poller._waiters)
+
+    def test_wait(self):
+        self.heatclient.stacks.list.side_effect = [
+            [_stack('stack-1', 'CREATE_IN_PROGRESS')],
+            [_stack('stack-1', 'CREATE_FAILED', reason='failed')]]
+
+        stack = self.poller.wait(self.heatclient, 'stack-1',
+                                 'CREATE_IN_PROGRESS', 10)
+
+        self.assertEqual('CREATE_FAILED', stack.stack_status)
+        self.assertEqual('failed', stack.stack_status_reason)
+        self.assertEqual(2, self.heatclient.stacks.list.call_count)
+        self.assertEqual({}, self.poller._waiters)
+
+    def test_wait_timeout(self):
+        self.heatclient.stacks.list.return_value = [
+            _stack('stack-1', 'CREATE_IN_PROGRESS')]
+
+        self.assertIsNone(self.poller.wait(self.heatclient, 'stack-1',
+                                           'CREATE_IN_PROGRESS', 0.1))
+        self.assertEqual({}, self.poller._waiters)
+
+    def test_get_poller_per_vim(self):
+        auth_attr = {'auth_url': 'http://keystone/v3', 'username': 'admin',
+                     'project_name': 'admin'}
+        poller = stack_poller.get_poller(auth_attr, 'RegionOne')
+        self.assertIs(poller, stack_poller.get_poller(dict(auth_attr),
+                                                      'RegionOne'))
+        self.assertIsNot(poller, stack_poller.get_poller(auth_attr,
+                                                         'RegionTwo'))
+
+
+@mock.patch('tacker.vnfm.infra_drivers.openstack.heat_client.HeatClient')
+@mock.patch.object(stack_poller, 'get_poller')
+class TestOpenStackSharedStackPoller(base.TestCase):
+
+    def setUp(self):
+        super(TestOpenStackSharedStackPoller, self).setUp()
+        self.config_fixture.config(group='openstack_vim',
+                                   shared_stack_poller=True)
+        self.openstack = openstack.OpenStack()
+
+    def test_create_wait(self, mock_get_poller, mock_heat_client):
+        mock_wait = mock_get_poller.return_value.wait
+        mock_wait.return_value = _stack('stack-1', 'CREATE_COMPLETE')
+        heatclient = mock_heat_client.return_value
+        heatclient.get.return_value = mock.Mock(outputs=[])
+        vnf_dict = {'attributes': {}, 'placement_attr': {}}
+
+        self.openstack.create_wait(None, None, vnf_dict, 'stack-1', {})
+
+        mock_wait.assert_called_once_with(
+            heatclient, 'stack-1', 'CREATE_IN_PROGRESS',
+            self.openstack.STACK_RETRIES * self.openstack.STACK_RETRY_WAIT)
+        heatclient.get.assert_called_once_with('stack-1')
+        heatclient.stacks.get.assert_not_called()
+
+    def test_delete_wait_failed(self, mock_get_poller, mock_heat_client):
+        mock_get_poller.return_value.wait.return_value = _stack(
+            'stack-1', 'DELETE_FAILED', reason='delete failed')
+
+        exc = self.assertRaises(vnfm.VNFDeleteWaitFailed,
+                                self.openstack.delete_wait,
+                                None, None, 'stack-1', {})
+        self.assertIn('delete failed', str(exc))
+        mock_heat_client.return_value.get.assert_not_called()
+
+    def test_heal_wait_timeout(self, mock_get_poller, mock_heat_client):
+        mock_get_poller.return_value.wait.return_value = None
+        vnf_dict = {'instance_id': 'stack-1'}
+
+        exc = self.assertRaises(vnfm.VNFHealWaitFailed,
+                                self.openstack.heal_wait,
+                                None, None, vnf_dict, {})
+        self.assertIn('action is not completed within 600 seconds on '
+                      'stack stack-1', str(exc))
@@ -14,7 +14,7 @@
 
 from unittest import mock
 
-import six.moves.urllib.error as urlerr
+import requests
 import testtools
 
 from tacker.vnfm.monitor_drivers.http_ping import http_ping
@@ -26,19 +26,20 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
         super(TestVNFMonitorHTTPPing, self).setUp()
         self.monitor_http_ping = http_ping.VNFMonitorHTTPPing()
 
-    @mock.patch('six.moves.urllib.request.urlopen')
-    def test_monitor_call_for_success(self, mock_urlopen):
+    @mock.patch('requests.Session.request')
+    def test_monitor_call_for_success(self, mock_request):
         test_vnf = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
         }
         self.monitor_http_ping.monitor_call(test_vnf,
                                             test_kwargs)
-        mock_urlopen.assert_called_once_with('http://a.b.c.d:80', timeout=5)
+        mock_request.assert_called_once_with('GET', 'http://a.b.c.d:80/',
+                                             timeout=5)
 
-    @mock.patch('six.moves.urllib.request.urlopen')
-    def test_monitor_call_for_failure(self, mock_urlopen):
-        mock_urlopen.side_effect = urlerr.URLError("MOCK Error")
+    @mock.patch('requests.Session.request')
+    def test_monitor_call_for_failure(self, mock_request):
+        mock_request.side_effect = requests.ConnectionError("MOCK Error")
         test_vnf = {}
         test_kwargs = {
             'mgmt_ip': 'a.b.c.d'
@@ -46,6 +47,49 @@ class TestVNFMonitorHTTPPing(testtools.TestCase):
         monitor_return = self.monitor_http_ping.monitor_call(test_vnf,
                                                              test_kwargs)
         self.assertEqual('failure', monitor_return)
+        self.assertEqual(5, mock_request.call_count)
+
+    @mock.patch('requests.Session.request')
+    def test_monitor_call_for_error_status(self, mock_request):
+        mock_request.return_value.raise_for_status.side_effect = (
+            requests.HTTPError("MOCK Error"))
+        test_kwargs = {
+            'mgmt_ip': 'a.b.c.d',
+            'retry': 2
+        }
+        monitor_return = self.monitor_http_ping.monitor_call({},
+                                                             test_kwargs)
+        self.assertEqual('failure', monitor_return)
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch('requests.Session.request')
+    def test_monitor_call_with_params(self, mock_request):
+        test_kwargs = {
+            'mgmt_ip': 'a:b:c:d:e:f:1:2',
+            'port': 8080,
+            'method': 'HEAD',
+            'path': 'healthz'
+        }
+        self.monitor_http_ping.monitor_call({}, test_kwargs)
+        mock_request.assert_called_once_with(
+            'HEAD', 'http://[a:b:c:d:e:f:1:2]:8080/healthz', timeout=5)
+
+    @mock.patch('tacker.vnfm.monitor_drivers.http_ping.http_ping.time')
+    @mock.patch('requests.Session.request')
+    def test_get_latency_percentiles(self, mock_request, mock_time):
+        # Response times of 1 to 10 seconds for vnf1, 1 second for vnf2.
+        mock_time.monotonic.side_effect = [
+            value for latency in list(range(1, 11)) + [1]
+            for value in (0, latency)]
+        for _ in range(10):
+            self.monitor_http_ping.monitor_call(
+                {'id': 'vnf1'}, {'mgmt_ip': '10.0.0.1'})
+        self.monitor_http_ping.monitor_call(
+            {'id': 'vnf2'}, {'mgmt_ip': '10.0.0.2'})
+
+        self.assertEqual(
+            {'10.0.0.1': {'count': 10, 'p50': 6, 'p90': 10, 'p99': 10}},
+            self.monitor_http_ping.get_latency_percentiles('vnf1'))
 
     def test_monitor_url(self):
         test_vnf = {
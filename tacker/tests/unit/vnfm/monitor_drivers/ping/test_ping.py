@@ -23,6 +23,10 @@ class TestVNFMonitorPing(testtools.TestCase):
     def setUp(self):
         super(TestVNFMonitorPing, self).setUp()
         self.monitor_ping = ping.VNFMonitorPing()
+        # Exercise the ping command fallback of the ICMP prober.
+        mock.patch('tacker.agent.linux.icmp._open_socket',
+                   return_value=None).start()
+        self.addCleanup(mock.patch.stopall)
 
     @mock.patch('tacker.agent.linux.utils.execute')
     def test_monitor_call_for_success(self, mock_utils_execute):
@@ -51,6 +55,17 @@ class TestVNFMonitorPing(testtools.TestCase):
                                                         test_kwargs)
         self.assertEqual('failure', monitor_return)
 
+    @mock.patch('tacker.agent.linux.icmp.ping')
+    def test_monitor_call_with_icmp_socket(self, mock_icmp_ping):
+        mock_icmp_ping.return_value = {'192.168.120.1': True}
+        test_kwargs = {
+            'mgmt_ip': '192.168.120.1'
+        }
+        monitor_return = self.monitor_ping.monitor_call({}, test_kwargs)
+        self.assertTrue(monitor_return)
+        mock_icmp_ping.assert_called_once_with(['192.168.120.1'], 5, 5.0,
+                                               1.0)
+
     def test_monitor_url(self):
         test_vnf = {
             'monitor_url': 'a.b.c.d'
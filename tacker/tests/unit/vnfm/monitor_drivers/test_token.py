@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm.monitor_drivers import token
+
+
+def _token(**kwargs):
+    attrs = {'username': 'admin', 'password': 'devstack',
+             'project_name': 'admin',
+             'auth_url': 'http://keystone/identity/v3',
+             'user_domain_name': 'default',
+             'project_domain_name': 'default'}
+    attrs.update(kwargs)
+    return token.Token(**attrs)
+
+
+class TestToken(base.TestCase):
+
+    def setUp(self):
+        super(TestToken, self).setUp()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.dict(token._sessions, clear=True).start()
+        self.mock_password = mock.patch.object(token.v3,
+                                               'Password').start()
+        self.mock_session = mock.patch.object(token.session,
+                                              'Session').start()
+        self.mock_session.side_effect = (
+            lambda auth: mock.Mock(auth=auth))
+
+    def test_create_token_reuses_session(self):
+        self.mock_password.return_value.get_token.return_value = 'token'
+
+        self.assertEqual('token', _token().create_token())
+        self.assertEqual('token', _token().create_token())
+
+        self.mock_password.assert_called_once_with(
+            auth_url='http://keystone/identity/v3', username='admin',
+            password='devstack', project_name='admin',
+            user_domain_name='default', project_domain_name='default')
+        self.assertEqual(1, self.mock_session.call_count)
+        self.assertEqual(
+            2, self.mock_password.return_value.get_token.call_count)
+
+    def test_create_token_with_other_credentials(self):
+        _token().create_token()
+        _token(password='changed').create_token()
+
+        self.assertEqual(2, self.mock_session.call_count)
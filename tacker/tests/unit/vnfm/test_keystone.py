@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.tests.unit import base
+from tacker.vnfm import keystone
+
+
+def _auth_attr(**kwargs):
+    auth_attr = {'auth_url': 'http://keystone/identity/v3',
+                 'username': 'nfv_user',
+                 'password': 'devstack',
+                 'project_name': 'nfv',
+                 'user_domain_name': 'Default',
+                 'project_domain_name': 'Default',
+                 'cert_verify': 'False'}
+    auth_attr.update(kwargs)
+    return auth_attr
+
+
+class TestKeystone(base.TestCase):
+
+    def setUp(self):
+        super(TestKeystone, self).setUp()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.object(keystone, '_client_cache', None).start()
+        self.mock_client = mock.patch.object(keystone.client,
+                                             'Client').start()
+        self.mock_client.side_effect = lambda *args, **kwargs: mock.Mock()
+        self.mock_session = mock.patch.object(keystone.session,
+                                              'Session').start()
+        self.keystone = keystone.Keystone()
+
+    def test_initialize_client_cached(self):
+        cli = self.keystone.initialize_client(**_auth_attr())
+
+        self.assertIs(cli, self.keystone.initialize_client(**_auth_attr()))
+        self.mock_session.assert_called_once_with(auth=mock.ANY,
+                                                  verify=False)
+        self.assertEqual(1, self.mock_client.call_count)
+
+    def test_initialize_client_with_other_credentials(self):
+        cli = self.keystone.initialize_client(**_auth_attr())
+
+        self.assertIsNot(cli, self.keystone.initialize_client(
+            **_auth_attr(password='changed')))
+        self.assertIsNot(cli, self.keystone.initialize_client(
+            **_auth_attr(project_name='other')))
+        self.assertEqual(3, self.mock_client.call_count)
+
+    def test_initialize_client_with_token_not_cached(self):
+        auth_attr = {'auth_url': 'http://keystone/identity/v3',
+                     'token': 'token', 'project_id': 'project'}
+        self.keystone.initialize_client(**dict(auth_attr))
+        self.keystone.initialize_client(**dict(auth_attr))
+
+        self.assertEqual(2, self.mock_client.call_count)
+        self.assertEqual(0, len(keystone._get_client_cache()))
+
+    def test_initialize_client_cache_disabled(self):
+        self.config_fixture.config(group='vim_client', session_cache_size=0)
+        self.keystone.initialize_client(**_auth_attr())
+        self.keystone.initialize_client(**_auth_attr())
+
+        self.assertEqual(2, self.mock_client.call_count)
+        self.assertIsNone(keystone._client_cache)
+
+    def test_invalidate_clients(self):
+        cli = self.keystone.initialize_client(**_auth_attr())
+        other_cli = self.keystone.initialize_client(
+            **_auth_attr(auth_url='http://other/identity/v3'))
+
+        keystone.invalidate_clients('http://keystone/identity/')
+
+        self.assertIsNot(cli, self.keystone.initialize_client(**_auth_attr()))
+        self.assertIs(other_cli, self.keystone.initialize_client(
+            **_auth_attr(auth_url='http://other/identity/v3')))
@@ -14,6 +14,7 @@
 
 from unittest import mock
 
+from oslo_config import cfg
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 import testtools
@@ -207,6 +208,223 @@ class TestVNFMonitor(testtools.TestCase):
             'vnf']['status']
         self.assertEqual('PENDING_HEAL', test_device_status)
 
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.time.monotonic')
+    def test_get_due_vnfs(self, mock_monotonic, mock_monitor_run):
+        mock_monotonic.return_value = 100
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=10)
+        hosting_vnfs = {
+            'due': {'id': 'due', 'next_check_at': 90,
+                    'vnf': {'status': 'ACTIVE'}},
+            'not_due': {'id': 'not_due', 'next_check_at': 110,
+                        'vnf': {'status': 'ACTIVE'}},
+            'in_progress': {'id': 'in_progress', 'next_check_at': 90,
+                            'in_progress': True,
+                            'vnf': {'status': 'ACTIVE'}},
+            'pending_heal': {'id': 'pending_heal', 'next_check_at': 90,
+                             'vnf': {'status': constants.PENDING_HEAL}},
+        }
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs,
+                             hosting_vnfs, clear=True):
+            due_vnfs = test_vnfmonitor._get_due_vnfs()
+
+        self.assertEqual(['due'], [vnf['id'] for vnf in due_vnfs])
+        self.assertTrue(hosting_vnfs['due']['in_progress'])
+        self.assertEqual(110, hosting_vnfs['due']['next_check_at'])
+        self.assertEqual(110, hosting_vnfs['pending_heal']['next_check_at'])
+        self.assertNotIn('in_progress', hosting_vnfs['pending_heal'])
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.run_monitor')
+    def test_monitor_vnf_clears_in_progress(self, mock_run_monitor,
+                                            mock_monitor_run):
+        mock_run_monitor.side_effect = Exception
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        hosting_vnf = {'id': MOCK_VNF_ID, 'in_progress': True}
+        test_vnfmonitor._monitor_vnf(hosting_vnf)
+        mock_run_monitor.assert_called_once_with(hosting_vnf)
+        self.assertFalse(hosting_vnf['in_progress'])
+
+    @mock.patch('tacker.vnfm.utils.log_events_bulk')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_load_hosting_vnfs(self, mock_monitor_run, mock_log_events):
+        test_vnfmonitor = monitor.VNFMonitor(30)
+
+        def _hosting_vnf(vnf_id):
+            return {'id': vnf_id, 'mgmt_ip_addresses': {},
+                    'vnf': {'id': vnf_id, 'status': 'ACTIVE',
+                            'attributes': {'monitoring_policy': '{}'}}}
+
+        added = _hosting_vnf('added')
+        deleted = _hosting_vnf('deleted')
+
+        def _get_hosting_vnfs():
+            # VNFs added and deleted while the database is read.
+            test_vnfmonitor.add_hosting_vnf(added)
+            test_vnfmonitor.delete_hosting_vnf('deleted')
+            return [_hosting_vnf('added'), _hosting_vnf('deleted'),
+                    _hosting_vnf('new')]
+
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs,
+                             {'deleted': deleted}, clear=True):
+            added_vnfs = test_vnfmonitor.load_hosting_vnfs(
+                _get_hosting_vnfs)
+            hosting_vnfs = dict(monitor.VNFMonitor._hosting_vnfs)
+
+        self.assertEqual(['new'], [vnf['id'] for vnf in added_vnfs])
+        self.assertEqual({'added', 'new'}, set(hosting_vnfs))
+        self.assertIs(added, hosting_vnfs['added'])
+        self.assertEqual(1, len(mock_log_events.call_args[0][1]))
+        self.assertEqual(0, monitor.VNFMonitor._loads)
+        self.assertEqual(set(), monitor.VNFMonitor._deleted_vnf_ids)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_delete_hosting_vnf_not_loading(self, mock_monitor_run):
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        test_vnfmonitor.delete_hosting_vnf(MOCK_VNF_ID)
+        self.assertEqual(set(), monitor.VNFMonitor._deleted_vnf_ids)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_get_due_vnfs_of_own_shard(self, mock_monitor_run):
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        test_vnfmonitor._partitioner = mock.Mock()
+        test_vnfmonitor._partitioner.belongs_to_self.side_effect = (
+            lambda vnf_id: vnf_id == 'own')
+        hosting_vnfs = {
+            'own': {'id': 'own', 'vnf': {'status': 'ACTIVE'}},
+            'other': {'id': 'other', 'vnf': {'status': 'ACTIVE'}},
+        }
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs,
+                             hosting_vnfs, clear=True):
+            due_vnfs = test_vnfmonitor._get_due_vnfs()
+
+        self.assertEqual(['own'], [vnf['id'] for vnf in due_vnfs])
+        self.assertNotIn('next_check_at', hosting_vnfs['other'])
+
+    @mock.patch('tacker.vnfm.utils.log_events_bulk')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_vnf_created_on_other_member(self, mock_monitor_run,
+                                         mock_log_events):
+        # Members A and B share the VNFs, the VNF created through A is
+        # assigned to B.
+        test_vnfmonitor = monitor.VNFMonitor(30, check_intvl=10)
+        owners = {MOCK_VNF_ID: 'B'}
+        partitioners = {}
+        for member in ('A', 'B'):
+            partitioners[member] = mock.Mock()
+            partitioners[member].belongs_to_self.side_effect = (
+                lambda vnf_id, member=member: owners[vnf_id] == member)
+
+        def _hosting_vnf():
+            return {'id': MOCK_VNF_ID, 'mgmt_ip_addresses': {},
+                    'next_check_at': 0,
+                    'vnf': {'id': MOCK_VNF_ID, 'status': 'ACTIVE',
+                            'attributes': {'monitoring_policy': '{}'}}}
+
+        # Member A handles the creation of the VNF but does not check it.
+        test_vnfmonitor._partitioner = partitioners['A']
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs, clear=True):
+            test_vnfmonitor.add_hosting_vnf(_hosting_vnf())
+            monitor.VNFMonitor._hosting_vnfs[MOCK_VNF_ID][
+                'next_check_at'] = 0
+            self.assertEqual([], test_vnfmonitor._get_due_vnfs())
+
+            # On the next load, A drops the VNF assigned to B.
+            test_vnfmonitor.load_hosting_vnfs(lambda: [_hosting_vnf()])
+            self.assertEqual({}, monitor.VNFMonitor._hosting_vnfs)
+
+        # Member B loads the VNF from the database and checks it.
+        test_vnfmonitor._partitioner = partitioners['B']
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs, clear=True):
+            with mock.patch.object(monitor.time, 'monotonic',
+                                   return_value=100):
+                test_vnfmonitor.load_hosting_vnfs(lambda: [_hosting_vnf()])
+            with mock.patch.object(monitor.time, 'monotonic',
+                                   return_value=110):
+                due_vnfs = test_vnfmonitor._get_due_vnfs()
+            self.assertEqual([MOCK_VNF_ID], [vnf['id'] for vnf in due_vnfs])
+
+            # After a rebalance, the VNF is assigned to A again and deleted
+            # from the database, B does not check it anymore.
+            owners[MOCK_VNF_ID] = 'A'
+            test_vnfmonitor.load_hosting_vnfs(lambda: [])
+            self.assertEqual({}, monitor.VNFMonitor._hosting_vnfs)
+
+    @mock.patch('tacker.vnfm.utils.log_events_bulk')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_load_hosting_vnfs_of_shard_keeps_new_vnfs(self, mock_monitor_run,
+                                                       mock_log_events):
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        test_vnfmonitor._partitioner = mock.Mock()
+        test_vnfmonitor._partitioner.belongs_to_self.return_value = True
+        new_vnf = {'id': 'new', 'mgmt_ip_addresses': {},
+                   'vnf': {'id': 'new', 'status': 'ACTIVE',
+                           'attributes': {'monitoring_policy': '{}'}}}
+
+        def _get_hosting_vnfs():
+            # VNF created after the database is read.
+            test_vnfmonitor.add_hosting_vnf(new_vnf)
+            return []
+
+        get_hosting_vnfs = mock.Mock(side_effect=_get_hosting_vnfs)
+
+        with mock.patch.dict(monitor.VNFMonitor._hosting_vnfs, clear=True):
+            test_vnfmonitor.load_hosting_vnfs(get_hosting_vnfs)
+            self.assertEqual({'new': new_vnf},
+                             monitor.VNFMonitor._hosting_vnfs)
+        self.assertEqual(get_hosting_vnfs, test_vnfmonitor._get_hosting_vnfs)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.vnfm.monitor.time.monotonic')
+    def test_is_sync_due(self, mock_monotonic, mock_monitor_run):
+        mock_monotonic.return_value = 100
+        test_vnfmonitor = monitor.VNFMonitor(30)
+        test_vnfmonitor._get_hosting_vnfs = None
+        self.assertFalse(test_vnfmonitor._is_sync_due(True))
+
+        test_vnfmonitor._get_hosting_vnfs = mock.Mock()
+        test_vnfmonitor._next_sync_at = 110
+        test_vnfmonitor._syncing = False
+        self.assertFalse(test_vnfmonitor._is_sync_due([]))
+        self.assertTrue(test_vnfmonitor._is_sync_due([None]))
+        # A single load runs at a time.
+        self.assertFalse(test_vnfmonitor._is_sync_due([None]))
+
+        test_vnfmonitor._sync_shard()
+        test_vnfmonitor._get_hosting_vnfs.assert_called_once_with()
+        mock_monotonic.return_value = 110
+        self.assertTrue(test_vnfmonitor._is_sync_due([]))
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.common.coordination.Coordinator')
+    def test_join_monitor_group(self, mock_coordinator, mock_monitor_run):
+        cfg.CONF.set_override('enable_sharding', True, group='monitor')
+        self.addCleanup(cfg.CONF.clear_override, 'enable_sharding',
+                        group='monitor')
+        test_vnfmonitor = monitor.VNFMonitor(30)
+
+        coordinator = mock_coordinator.return_value
+        coordinator.start.assert_called_once_with()
+        coordinator.join_partitioned_group.assert_called_once_with(
+            monitor.MONITOR_GROUP)
+        self.assertEqual(coordinator.join_partitioned_group.return_value,
+                         test_vnfmonitor._partitioner)
+
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    @mock.patch('tacker.common.coordination.Coordinator')
+    def test_join_monitor_group_failed(self, mock_coordinator,
+                                       mock_monitor_run):
+        cfg.CONF.set_override('enable_sharding', True, group='monitor')
+        self.addCleanup(cfg.CONF.clear_override, 'enable_sharding',
+                        group='monitor')
+        coordinator = mock_coordinator.return_value
+        coordinator.join_partitioned_group.side_effect = Exception
+        test_vnfmonitor = monitor.VNFMonitor(30)
+
+        coordinator.stop.assert_called_once_with()
+        self.assertIsNone(test_vnfmonitor._coordinator)
+        self.assertTrue(test_vnfmonitor._is_monitored_here(MOCK_VNF_ID))
+
 
 class TestVNFReservationAlarmMonitor(testtools.TestCase):
 
@@ -19,6 +19,7 @@ from unittest.mock import patch
 
 import ddt
 from oslo_utils import uuidutils
+from sqlalchemy import event
 import yaml
 
 from tacker._i18n import _
@@ -67,6 +68,7 @@ class FakeException(Exception):
 class TestVNFMPluginMonitor(db_base.SqlTestCase):
     def setUp(self):
         super(TestVNFMPluginMonitor, self).setUp()
+        self.context = context.get_admin_context()
         self._mock_vnf_manager()
 
     def _mock_vnf_manager(self):
@@ -78,47 +80,73 @@ class TestVNFMPluginMonitor(db_base.SqlTestCase):
         self._mock(
             'tacker.common.driver_manager.DriverManager', fake_vnf_manager)
 
-    @mock.patch('tacker.db.vnfm.vnfm_db.VNFMPluginDb.get_vnfs')
+    def _insert_dummy_vnfd_and_vim(self):
+        session = self.context.session
+        session.add(vnfm_db.VNFD(
+            id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+            tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+            name='fake_template',
+            description='fake_template_description',
+            template_source='onboarded',
+            deleted_at=datetime.min))
+        session.add(nfvo_db.Vim(
+            id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+            tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+            name='fake_vim',
+            description='fake_vim_description',
+            type='test_vim',
+            status='Active',
+            deleted_at=datetime.min,
+            placement_attr={'regions': ['RegionOne']}))
+        session.flush()
+
+    def _insert_dummy_vnf(self, vnf_id, mgmt_ip_address,
+                          monitoring_policy=None):
+        session = self.context.session
+        vnf_db = vnfm_db.VNF(
+            id=vnf_id,
+            tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+            name='fake_vnf_' + vnf_id,
+            description='fake_vnf_description',
+            instance_id='da85ea1a-4ec4-4201-bbb2-8d9249eca7ec',
+            vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+            vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+            placement_attr={'region': 'RegionOne'},
+            mgmt_ip_address=mgmt_ip_address,
+            status='ACTIVE',
+            deleted_at=datetime.min)
+        session.add(vnf_db)
+        session.flush()
+        if monitoring_policy:
+            session.add(vnfm_db.VNFAttribute(
+                id=uuidutils.generate_uuid(), vnf_id=vnf_id,
+                key='monitoring_policy', value=monitoring_policy))
+        session.add(vnfm_db.VNFAttribute(
+            id=uuidutils.generate_uuid(), vnf_id=vnf_id,
+            key='heat_template', value='fake_heat_template'))
+        session.flush()
+
+    @mock.patch('tacker.vnfm.plugin.VNFMPlugin.spawn_n')
     @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
-    def test_init_monitoring(self, mock_run, mock_get_vnfs):
+    def test_init_monitoring(self, mock_run, mock_spawn_n):
+        mock_spawn_n.side_effect = lambda func, *args, **kwargs: func(
+            *args, **kwargs)
         vnf_id = uuidutils.generate_uuid()
-        vnfs = [{
-            'id': vnf_id,
-            'vnf': {
-                'id': vnf_id,
-                'status': 'ACTIVE',
-                'name': 'fake_vnf',
-                'attributes': {
-                    'monitoring_policy':
-                        '{"vdus": '
-                        '{"VDU1": {"ping": {"actions": {"failure": "respawn"},'
-                        '"name": "ping", "parameters": {"count": 3,'
-                        '"interval": 1, "monitoring_delay": 45, "timeout": 2},'
-                        '"monitoring_params": {"count": 3, "interval": 1,'
-                        '"monitoring_delay": 45, "timeout": 2}}}}}'}
-            },
-            'name': 'fake_vnf',
-            'tenant_id': 'ad7ebc56538745a08ef7c5e97f8bd437',
-            'description': 'fake_vnf_description',
-            'instance_id': 'da85ea1a-4ec4-4201-bbb2-8d9249eca7ec',
-            'vnfd_id': 'eb094833-995e-49f0-a047-dfb56aaf7c4e',
-            'vim_id': '6261579e-d6f3-49ad-8bc3-a9cb974778ff',
-            'placement_attr': {'region': 'RegionOne'},
-            'status': 'ACTIVE',
-            'attributes': {
-                    'monitoring_policy':
-                        '{"vdus": '
-                        '{"VDU1": {"ping": {"actions": {"failure": "respawn"},'
-                        '"name": "ping", "parameters": {"count": 3,'
-                        '"interval": 1, "monitoring_delay": 45, "timeout": 2},'
-                        '"monitoring_params": {"count": 3, "interval": 1,'
-                        '"monitoring_delay": 45, "timeout": 2}}}}}'},
-            'mgmt_ip_address': '{"VDU1": "a.b.c.d"}',
-            'deleted_at': datetime.min,
-            'mgmt_ip_addresses': 'a.b.c.d'
-        }]
+        monitoring_policy = (
+            '{"vdus": '
+            '{"VDU1": {"ping": {"actions": {"failure": "respawn"},'
+            '"name": "ping", "parameters": {"count": 3,'
+            '"interval": 1, "monitoring_delay": 45, "timeout": 2},'
+            '"monitoring_params": {"count": 3, "interval": 1,'
+            '"monitoring_delay": 45, "timeout": 2}}}}}')
+        self._insert_dummy_vnfd_and_vim()
+        self._insert_dummy_vnf(vnf_id, '{"VDU1": "a.b.c.d"}',
+                               monitoring_policy)
+        self._insert_dummy_vnf(uuidutils.generate_uuid(),
+                               '{"VDU1": "a.b.c.e"}')
+        self._insert_dummy_vnf(uuidutils.generate_uuid(), None,
+                               monitoring_policy)
 
-        mock_get_vnfs.return_value = vnfs
         # NOTE(bhagyashris): VNFMonitor class is using a singleton pattern
         # and '_hosting_vnfs' is defined as a class level attribute.
         # If one of the unit test adds a VNF to monitor it will show up here
@@ -127,9 +155,35 @@ class TestVNFMPluginMonitor(db_base.SqlTestCase):
         monitor.VNFMonitor._hosting_vnfs = dict()
         vnfm_plugin = plugin.VNFMPlugin()
         hosting_vnfs = vnfm_plugin._vnf_monitor._hosting_vnfs.values()
+        self.assertEqual(1, len(hosting_vnfs))
         hosting_vnf = list(hosting_vnfs)[0]['vnf']
+        self.assertEqual(vnf_id, hosting_vnf['id'])
         self.assertEqual('{"VDU1": "a.b.c.d"}', hosting_vnf['mgmt_ip_address'])
-        self.assertEqual(1, len(hosting_vnfs))
+        self.assertEqual({'monitoring_policy': monitoring_policy},
+                         hosting_vnf['attributes'])
+        events = vnfm_plugin._cos_db_plg.get_events(self.context)
+        self.assertEqual([(vnf_id, constants.RES_EVT_MONITOR)],
+                         [(event['resource_id'], event['event_type'])
+                          for event in events])
+
+    @mock.patch('tacker.vnfm.plugin.VNFMPlugin.get_vnf')
+    @mock.patch('tacker.vnfm.monitor.VNFMonitor.__run__')
+    def test_action_cb_loads_vnf(self, mock_run, mock_get_vnf):
+        vnf_dict = {
+            'id': uuidutils.generate_uuid(),
+            'mgmt_ip_address': '{"VDU1": "a.b.c.d"}',
+            'attributes': {'monitoring_policy': '{"vdus": {}}'}}
+        mock_get_vnf.return_value = dict(vnf_dict, vnfd={})
+        vnfm_plugin = plugin.VNFMPlugin()
+        hosting_vnf = vnfm_plugin._to_hosting_vnf(self.context, vnf_dict)
+
+        hosting_vnf['action_cb']('respawn', vdu_name='VDU1')
+
+        mock_get_vnf.assert_called_once_with(self.context, vnf_dict['id'])
+        self._vnf_manager.invoke.assert_called_with(
+            'respawn', 'execute_action', plugin=vnfm_plugin,
+            context=self.context, vnf_dict=mock_get_vnf.return_value,
+            args={'vdu_name': 'VDU1'})
 
 
 @ddt.ddt
@@ -421,6 +475,83 @@ class TestVNFMPlugin(db_base.SqlTestCase):
                           self.vnfm_plugin.create_vnfd,
                           self.context, vnfd_obj)
 
+    def _insert_dummy_vnfs(self, count):
+        session = self.context.session
+        for i in range(count):
+            vnf_id = uuidutils.generate_uuid()
+            session.add(vnfm_db.VNF(
+                id=vnf_id,
+                tenant_id='ad7ebc56538745a08ef7c5e97f8bd437',
+                name='fake_vnf_' + vnf_id,
+                vnfd_id='eb094833-995e-49f0-a047-dfb56aaf7c4e',
+                vim_id='6261579e-d6f3-49ad-8bc3-a9cb974778ff',
+                status='ACTIVE',
+                deleted_at=datetime.min))
+            session.flush()
+            session.add(vnfm_db.VNFAttribute(
+                id=uuidutils.generate_uuid(), vnf_id=vnf_id,
+                key='heat_template', value='fake_heat_template'))
+        session.flush()
+        # Relationships must be loaded from the database by get_vnfs.
+        session.expire_all()
+
+    def _count_queries(self, func, *args, **kwargs):
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, *args):
+            # Ignore the pings of oslo.db when a connection is checked out.
+            if statement != 'SELECT 1':
+                statements.append(statement)
+
+        engine = self.context.session.get_bind()
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            event.remove(engine, 'before_cursor_execute',
+                         _before_cursor_execute)
+        return result, statements
+
+    def test_get_vnfs(self):
+        self._insert_dummy_vnf_template()
+        self._insert_dummy_vnfd_attributes('fake_vnfd_template')
+        self._insert_dummy_vnfs(3)
+
+        vnfs, statements = self._count_queries(self.vnfm_plugin.get_vnfs,
+                                               self.context)
+
+        self.assertEqual(3, len(vnfs))
+        for vnf in vnfs:
+            self.assertEqual({'heat_template': 'fake_heat_template'},
+                             vnf['attributes'])
+            self.assertEqual('fake_template', vnf['vnfd']['name'])
+            self.assertEqual([], vnf['vnfd']['service_types'])
+            self.assertNotIn('attributes', vnf['vnfd'])
+        # VNFs, VNFDs, service types of the VNFDs and VNF attributes.
+        self.assertEqual(4, len(statements))
+        self.assertFalse([statement for statement in statements
+                          if 'vnfd_attribute' in statement])
+
+        # The number of queries does not depend on the number of VNFs.
+        self._insert_dummy_vnfs(2)
+        vnfs, statements = self._count_queries(self.vnfm_plugin.get_vnfs,
+                                               self.context)
+        self.assertEqual(5, len(vnfs))
+        self.assertEqual(4, len(statements))
+
+    def test_get_vnfs_with_fields(self):
+        self._insert_dummy_vnf_template()
+        self._insert_dummy_vnfs(3)
+
+        vnfs, statements = self._count_queries(
+            self.vnfm_plugin.get_vnfs, self.context,
+            filters={'status': ['ACTIVE']}, fields=['id', 'status'])
+
+        self.assertEqual(3, len(vnfs))
+        for vnf in vnfs:
+            self.assertEqual(['id', 'status'], sorted(vnf))
+        self.assertEqual(1, len(statements))
+
     def test_create_vnf_sync(self):
         self._insert_dummy_vnf_template()
         vnf_obj = utils.get_dummy_vnf_obj()
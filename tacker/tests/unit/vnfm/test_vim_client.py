@@ -104,3 +104,59 @@ class TestVIMClient(base.TestCase):
         vim_regions = ['TestRegionOne', 'TestRegionTwo']
         region_name = 'TestRegionOne'
         self.assertTrue(self.vimclient.region_valid(vim_regions, region_name))
+
+
+class TestVIMClientAuthCache(base.TestCase):
+
+    def setUp(self):
+        super(TestVIMClientAuthCache, self).setUp()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.object(vim_client, '_auth_cache', None).start()
+        self.mock_decode = mock.patch.object(
+            vim_client.VimClient, '_decode_vim_auth',
+            side_effect=lambda vim_id, auth, value: 'decoded-' + value
+        ).start()
+        self.vimclient = vim_client.VimClient()
+
+    def _vim_info(self, password='encrypted'):
+        return {'id': 'aaaa', 'type': 'openstack',
+                'auth_url': 'http://127.0.0.1/identity/v3',
+                'auth_cred': {'username': 'admin', 'password': password,
+                              'key_type': 'fernet_key'}}
+
+    def test_build_vim_auth_cached(self):
+        vim_auth = self.vimclient._build_vim_auth(self._vim_info())
+        vim_auth['ca_cert_file'] = '/tmp/ca_cert'
+
+        vim_info = self._vim_info()
+        cached_auth = self.vimclient._build_vim_auth(vim_info)
+
+        self.assertEqual({'username': 'admin',
+                          'password': 'decoded-encrypted',
+                          'auth_url': 'http://127.0.0.1/identity/v3'},
+                         cached_auth)
+        self.assertIs(vim_info['auth_cred'], cached_auth)
+        self.assertEqual(1, self.mock_decode.call_count)
+
+    def test_build_vim_auth_with_updated_credentials(self):
+        self.vimclient._build_vim_auth(self._vim_info())
+        vim_auth = self.vimclient._build_vim_auth(
+            self._vim_info(password='re-encrypted'))
+
+        self.assertEqual('decoded-re-encrypted', vim_auth['password'])
+        self.assertEqual(2, self.mock_decode.call_count)
+
+    def test_build_vim_auth_cache_disabled(self):
+        self.config_fixture.config(group='vim_client', auth_cache_size=0)
+        self.vimclient._build_vim_auth(self._vim_info())
+        self.vimclient._build_vim_auth(self._vim_info())
+
+        self.assertEqual(2, self.mock_decode.call_count)
+        self.assertIsNone(vim_client._auth_cache)
+
+    def test_invalidate_vim_auth(self):
+        self.vimclient._build_vim_auth(self._vim_info())
+        vim_client.invalidate_vim_auth('aaaa')
+        self.vimclient._build_vim_auth(self._vim_info())
+
+        self.assertEqual(2, self.mock_decode.call_count)
@@ -12,9 +12,11 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import os
 from unittest import mock
 
 import ddt
+import fixtures
 from oslo_serialization import jsonutils
 from six.moves import http_client
 from six.moves import urllib
@@ -33,6 +35,7 @@ from tacker.tests import constants
 from tacker.tests.unit import base
 from tacker.tests.unit import fake_request
 from tacker.tests.unit.vnfpkgm import fakes
+from tacker.tests import uuidsentinel
 
 
 @ddt.ddt
@@ -105,6 +108,67 @@ class TestController(base.TestCase):
             'softwareImages', 'checksum', 'userDefinedData'])
         self.assertEqual(expected_result, res_dict)
 
+    @mock.patch.object(VnfPackagesList, "get_by_filters")
+    @ddt.data(
+        ({}, ['vnfd']),
+        ({'fields': 'checksum'}, ['vnfd']),
+        ({'fields': 'softwareImages/minRam'},
+         ['vnfd', 'vnf_deployment_flavours']),
+        ({'exclude_fields': 'softwareImages'}, ['vnfd']),
+        ({'all_fields': ''}, ['vnfd', 'vnf_deployment_flavours']),
+    )
+    @ddt.unpack
+    def test_index_expected_attrs(self, params, expected_attrs,
+            mock_vnf_list):
+        query = urllib.parse.urlencode(params)
+        req = fake_request.HTTPRequest.blank('/vnfpkgm/v1/vnf_packages?' +
+            query)
+        mock_vnf_list.return_value = fakes.return_vnf_package_list()
+        self.controller.index(req)
+        mock_vnf_list.assert_called_once_with(
+            req.context, read_deleted='no', filters=None,
+            expected_attrs=expected_attrs, limit=None, marker=None)
+
+    @mock.patch.object(VnfPackagesList, "get_by_filters")
+    def test_index_paging(self, mock_vnf_list):
+        self.config_fixture.config(group='vnf_package', list_page_size=1)
+        params = {'filter': '(eq,id,%s)' % constants.UUID,
+                  'nextpage_opaque_marker': 'marker'}
+        query = urllib.parse.urlencode(params)
+        req = fake_request.HTTPRequest.blank('/vnfpkgm/v1/vnf_packages?' +
+            query)
+        vnf_packages = VnfPackagesList(objects=[
+            fakes.return_vnfpkg_obj(),
+            fakes.return_vnfpkg_obj(
+                vnf_package_updates={'id': uuidsentinel.next_id})])
+        mock_vnf_list.return_value = vnf_packages
+
+        resp = self.controller.index(req)
+
+        self.assertEqual(fakes.index_response(remove_attrs=[
+            'softwareImages', 'checksum', 'userDefinedData']), resp.obj)
+        link = resp.headers['Link']
+        self.assertTrue(link.startswith('<%s?' % req.path_url))
+        self.assertTrue(link.endswith('>; rel="next"'))
+        next_params = urllib.parse.parse_qs(
+            urllib.parse.urlparse(link[1:link.index('>')]).query)
+        self.assertEqual({'filter': [params['filter']],
+                          'nextpage_opaque_marker': [constants.UUID]},
+                         next_params)
+        self.assertEqual(2, mock_vnf_list.call_args[1]['limit'])
+        self.assertEqual('marker', mock_vnf_list.call_args[1]['marker'])
+
+    @mock.patch.object(VnfPackagesList, "get_by_filters")
+    def test_index_last_page(self, mock_vnf_list):
+        self.config_fixture.config(group='vnf_package', list_page_size=1)
+        req = fake_request.HTTPRequest.blank('/vnfpkgm/v1/vnf_packages')
+        mock_vnf_list.return_value = fakes.return_vnf_package_list()
+
+        res_dict = self.controller.index(req)
+
+        self.assertEqual(fakes.index_response(remove_attrs=[
+            'softwareImages', 'checksum', 'userDefinedData']), res_dict)
+
     @mock.patch.object(VnfPackagesList, "get_by_filters")
     def test_index_attribute_selector_all_fields(self, mock_vnf_list):
         params = {'all_fields': ''}
@@ -920,6 +984,94 @@ class TestController(base.TestCase):
                           req, constants.UUID)
         self.assertEqual(http_client.INTERNAL_SERVER_ERROR, resp.status_code)
 
+    def _create_local_csar(self, content=b'0123456789'):
+        csar_path = self.useFixture(fixtures.TempDir()).path
+        self.config_fixture.config(group='vnf_package',
+                                   vnf_package_csar_path=csar_path)
+        with open(os.path.join(csar_path, constants.UUID + '.zip'),
+                  'wb') as f:
+            f.write(content)
+        return fakes.return_vnfpkg_obj(
+            vnf_package_updates={'size': len(content)})
+
+    @mock.patch.object(glance_store, 'load_csar_iter')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_from_local_file(
+            self, mock_vnf_by_id, mock_load_csar_iter):
+        mock_vnf_by_id.return_value = self._create_local_csar()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.OK, resp.status_int)
+        self.assertEqual(b'0123456789', resp.body)
+        self.assertEqual('10', resp.headers['Content-Length'])
+        self.assertEqual('"fake vnf package hash"', resp.headers['ETag'])
+        mock_load_csar_iter.assert_not_called()
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_range_from_local_file(
+            self, mock_vnf_by_id):
+        mock_vnf_by_id.return_value = self._create_local_csar()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['Range'] = 'bytes=2-5'
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_int)
+        self.assertEqual(b'2345', resp.body)
+        self.assertEqual('bytes 2-5/10', resp.headers['Content-Range'])
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_with_file_wrapper(self,
+                                                         mock_vnf_by_id):
+        mock_vnf_by_id.return_value = self._create_local_csar()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['Range'] = 'bytes=4-'
+        file_wrapper = mock.Mock(side_effect=lambda f: [f.read()])
+        req.environ['wsgi.file_wrapper'] = file_wrapper
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(b'456789', resp.body)
+        file_wrapper.assert_called_once_with(mock.ANY)
+
+    @mock.patch.object(glance_store, 'get_csar_size')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_not_modified(self, mock_vnf_by_id,
+                                                    mock_get_csar_size):
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['If-None-Match'] = '"fake vnf package hash"'
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.NOT_MODIFIED, resp.status_int)
+        self.assertEqual(b'', resp.body)
+        mock_get_csar_size.assert_not_called()
+
+    @mock.patch.object(glance_store, 'load_csar_iter')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_from_store(self, mock_vnf_by_id,
+                                                  mock_load_csar_iter):
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj(
+            vnf_package_updates={'size': 10})
+        mock_load_csar_iter.return_value = ([b'01234', b'56789'], 10)
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['If-None-Match'] = '"other hash"'
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.OK, resp.status_int)
+        self.assertEqual(b'0123456789', resp.body)
+        mock_load_csar_iter.assert_called_once_with(
+            constants.UUID, 'fake location', offset=0, chunk_size=None)
+
     def test_fetch_vnf_package_content_valid_range(self):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/')
@@ -936,10 +1088,108 @@ class TestController(base.TestCase):
                           self.controller._get_range_from_request,
                           request, 120)
 
-    def test_fetch_vnf_package_content_invalid_multiple_range(self):
+    def test_fetch_vnf_package_content_valid_multiple_range(self):
+        request = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content/')
+        request.headers["Range"] = 'bytes=-5,30-40, 10-20,150-'
+        ranges = self.controller._get_range_from_request(request, 120)
+        self.assertEqual([(10, 21), (30, 41), (115, 120)],
+                         [(range_.start, range_.end) for range_ in ranges])
+
+    @ddt.data(('bytes=10-20, 21-30,15-25', [(10, 31)]),
+              ('bytes=0-9,5-,-100', [(0, 120)]),
+              ('bytes=' + ','.join(['0-'] * 64), [(0, 120)]),
+              ('bytes=50-59,0-9,5-14,-1', [(0, 15), (50, 60), (119, 120)]))
+    @ddt.unpack
+    def test_fetch_vnf_package_content_overlapping_ranges(
+            self, range_str, expected_ranges):
+        request = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content/')
+        request.headers["Range"] = range_str
+        ranges = self.controller._get_range_from_request(request, 120)
+        if len(expected_ranges) == 1:
+            ranges = [ranges]
+        self.assertEqual(expected_ranges,
+                         [(range_.start, range_.end) for range_ in ranges])
+
+    @ddt.data('bytes=10-20,a-b', 'bytes=150-,200-')
+    def test_fetch_vnf_package_content_invalid_multiple_range(
+            self, range_str):
+        request = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content/')
+        request.headers["Range"] = range_str
+        self.assertRaises(exc.HTTPRequestRangeNotSatisfiable,
+                          self.controller._get_range_from_request, request,
+                          120)
+
+    @mock.patch.object(controller, 'MAX_BYTE_RANGES', 2)
+    def test_fetch_vnf_package_content_too_many_ranges(self):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/')
-        request.headers["Range"] = 'bytes=10-20,21-30'
+        request.headers["Range"] = 'bytes=0-1,2-3,4-5'
         self.assertRaises(exc.HTTPBadRequest,
                           self.controller._get_range_from_request, request,
                           120)
+
+    def _assert_multipart_byteranges(self, resp, expected_parts):
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_int)
+        self.assertEqual('multipart/byteranges', resp.content_type)
+        boundary = resp.headers['Content-Type'].split('boundary=')[1]
+        expected_body = b''.join(
+            b'\r\n--%s\r\nContent-Type: application/zip\r\n'
+            b'Content-Range: %s\r\n\r\n%s' % (
+                boundary.encode(), content_range, data)
+            for content_range, data in expected_parts)
+        expected_body += b'\r\n--%s--\r\n' % boundary.encode()
+        self.assertEqual(expected_body, resp.body)
+        self.assertEqual(str(len(expected_body)),
+                         resp.headers['Content-Length'])
+
+    @mock.patch.object(glance_store, 'load_csar_iter')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_multiple_range_from_local_file(
+            self, mock_vnf_by_id, mock_load_csar_iter):
+        mock_vnf_by_id.return_value = self._create_local_csar()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['Range'] = 'bytes=0-1,4-6,-2'
+
+        resp = req.get_response(self.app)
+
+        self._assert_multipart_byteranges(resp, [
+            (b'bytes 0-1/10', b'01'), (b'bytes 4-6/10', b'456'),
+            (b'bytes 8-9/10', b'89')])
+        mock_load_csar_iter.assert_not_called()
+
+    @mock.patch.object(glance_store, 'load_csar_iter')
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_multiple_range_from_store(
+            self, mock_vnf_by_id, mock_load_csar_iter):
+        mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj(
+            vnf_package_updates={'size': 10})
+        content = b'0123456789'
+        mock_load_csar_iter.side_effect = (
+            lambda uuid, location, offset, chunk_size: (
+                [content[offset:offset + chunk_size]], chunk_size))
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['Range'] = 'bytes=1-2,5-'
+
+        resp = req.get_response(self.app)
+
+        self._assert_multipart_byteranges(resp, [
+            (b'bytes 1-2/10', b'12'), (b'bytes 5-9/10', b'56789')])
+        self.assertEqual(2, mock_load_csar_iter.call_count)
+
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_fetch_vnf_package_content_repeated_ranges(self, mock_vnf_by_id):
+        mock_vnf_by_id.return_value = self._create_local_csar()
+        req = fake_request.HTTPRequest.blank(
+            '/vnf_packages/%s/package_content' % constants.UUID)
+        req.headers['Range'] = 'bytes=' + ','.join(['0-'] * 64)
+
+        resp = req.get_response(self.app)
+
+        self.assertEqual(http_client.PARTIAL_CONTENT, resp.status_int)
+        self.assertEqual('bytes 0-9/10', resp.headers['Content-Range'])
+        self.assertEqual(b'0123456789', resp.body)
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import io
 import os
 import six
@@ -23,6 +24,7 @@ from oslo_log import log as logging
 from oslo_utils import uuidutils
 from toscaparser import tosca_template
 
+from tacker.common import csar_utils
 from tacker.common import exceptions
 from tacker.common import utils
 from tacker.extensions import nfvo
@@ -34,6 +36,11 @@ from tacker.vnfm import vim_client
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+# Parsed VNFDs and BaseHOTs, created on first use as the size of the cache
+# is read from the configuration.
+_vnf_package_cache = None
+_CACHE_MISS = object()
+
 
 def _get_vim(context, vim_connection_info):
     vim_client_obj = vim_client.VimClient()
@@ -63,11 +70,53 @@ def _get_vim(context, vim_connection_info):
     return vim_info
 
 
-def _get_vnfd_dict(context, vnfd_id, flavour_id):
+def _get_vnf_package_cache():
+    global _vnf_package_cache
+    if _vnf_package_cache is None:
+        _vnf_package_cache = utils.LRUCache(
+            cfg.CONF.vnf_package.vnfd_cache_size)
+    return _vnf_package_cache
+
+
+def _get_vnf_package_data(context, vnfd_id, data_key, load_func):
+    """Return data parsed from the extracted CSAR of a VNF package.
+
+    VNF packages cannot change once they are onboarded, so the data is
+    cached, keyed by package, package checksum and data_key. A copy of the
+    cached data is returned, which the caller can modify.
+
+    :param data_key: tuple identifying the data in the package
+    :param load_func: function loading the data from the CSAR path
+    """
     vnf_package_id = _get_vnf_package_id(context, vnfd_id)
     vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
     vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
-    vnfd_dict = _get_flavour_based_vnfd(vnf_package_csar_path, flavour_id)
+    if not cfg.CONF.vnf_package.vnfd_cache_size:
+        return load_func(vnf_package_csar_path)
+
+    vnf_package = objects.VnfPackage.get_by_id(context, vnf_package_id)
+    key = (vnf_package_id, vnf_package.hash) + data_key
+    cache = _get_vnf_package_cache()
+    data = cache.get(key, _CACHE_MISS)
+    if data is _CACHE_MISS:
+        data = load_func(vnf_package_csar_path)
+        cache.set(key, data)
+    return copy.deepcopy(data)
+
+
+def invalidate_vnf_package_cache(vnf_package_id):
+    """Drop the parsed data of a VNF package from the cache."""
+    if _vnf_package_cache is None:
+        return
+    for key in _vnf_package_cache.keys():
+        if key[0] == vnf_package_id:
+            _vnf_package_cache.pop(key)
+
+
+def _get_vnfd_dict(context, vnfd_id, flavour_id):
+    vnfd_dict = _get_vnf_package_data(
+        context, vnfd_id, ('vnfd', flavour_id),
+        lambda csar_path: _get_flavour_based_vnfd(csar_path, flavour_id))
 
     # Remove requirements from substitution mapping
     vnfd_dict.get('topology_template').get(
@@ -119,11 +168,10 @@ def _create_grant_request(vnfd_dict, package_uuid):
         return vnf_sw_image
 
     def _get_image_path(artifact_image_path, package_uuid):
-        vnf_package_path = cfg.CONF.vnf_package.vnf_package_csar_path
-        artifact_image_path = os.path.join(
-            vnf_package_path, package_uuid,
-            artifact_image_path.split('../')[-1])
-        return artifact_image_path
+        # NOTE: Large images are not extracted when the package is
+        # onboarded, but the first time they are used.
+        return csar_utils.extract_csar_file(
+            package_uuid, artifact_image_path.split('../')[-1])
 
     for node, value in node_templates.items():
         if not value.get(
@@ -739,9 +787,11 @@ def _get_vnf_package_path(context, vnfd_id):
 
 
 def _get_base_hot_dict(context, vnfd_id):
-    vnf_package_id = _get_vnf_package_id(context, vnfd_id)
-    vnf_package_base_path = cfg.CONF.vnf_package.vnf_package_csar_path
-    vnf_package_csar_path = vnf_package_base_path + '/' + vnf_package_id
+    return _get_vnf_package_data(context, vnfd_id, ('base_hot',),
+                                 _load_base_hot_dict)
+
+
+def _load_base_hot_dict(vnf_package_csar_path):
     base_hot_dir = 'BaseHOT'
     ext = [".yaml", ".yml"]
 
@@ -160,7 +160,9 @@ class VnfLcmDriver(abstract_driver.VnfInstanceAbstractDriver):
         # save the vnf resources in the db
         for _, resources in vnf_resources.items():
             for vnf_resource in resources:
-                vnf_resource.create()
+                # NOTE: Shared images are saved by the infra driver.
+                if not vnf_resource.obj_attr_is_set('id'):
+                    vnf_resource.create()
 
         vnfd_dict_to_create_final_dict = copy.deepcopy(vnfd_dict)
         final_vnf_dict = vnflcm_utils._make_final_vnf_dict(
@@ -28,6 +28,8 @@ WHITE_SPACE_CHARACTER = ' '
 NON_WHITE_SPACE_CHARACTER = ''
 HYPHEN_CHARACTER = '-'
 DASH_CHARACTER = '_'
+# Label set on the pods of a deployment, to select them by deployment name.
+DEPLOYMENT_LABEL = 'tacker_deployment'
 
 
 class Transformer(object):
@@ -131,7 +133,8 @@ class Transformer(object):
     def config_labels(self, deployment_name=None, scaling_name=None):
         label = dict()
         if deployment_name:
-            label.update({"selector": deployment_name})
+            label.update({"selector": deployment_name,
+                          DEPLOYMENT_LABEL: deployment_name})
         if scaling_name:
             label.update({"scaling_name": scaling_name})
         return label
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import time
 import yaml
 
@@ -27,6 +28,7 @@ from tacker.common import log
 from tacker.common import utils
 from tacker.extensions import vnfm
 from tacker.vnfm.infra_drivers import abstract_driver
+from tacker.vnfm.infra_drivers.kubernetes.k8s import translate_outputs
 from tacker.vnfm.infra_drivers.kubernetes import translate_template
 from tacker.vnfm.infra_drivers import scale_driver
 
@@ -68,6 +70,9 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         self.STACK_RETRIES = cfg.CONF.kubernetes_vim.stack_retries
         self.STACK_RETRY_WAIT = cfg.CONF.kubernetes_vim.stack_retry_wait
         self.kubernetes = kubernetes_utils.KubernetesHTTPAPI()
+        # Whether the pod template of a (namespace, deployment) carries the
+        # deployment label, which never changes once the deployment exists.
+        self._labelled_deployments = dict()
 
     def get_type(self):
         return 'kubernetes'
@@ -120,10 +125,13 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         try:
             core_v1_api_client = \
                 self.kubernetes.get_core_v1_api_client(auth=auth_cred)
+            extension_api_client = \
+                self.kubernetes.get_extension_api_client(auth=auth_cred)
             deployment_info = vnf_id.split(COMMA_CHARACTER)
             mgmt_ips = dict()
             pods_information = self._get_pods_information(
                 core_v1_api_client=core_v1_api_client,
+                extension_api_client=extension_api_client,
                 deployment_info=deployment_info)
             status = self._get_pod_status(pods_information)
             stack_retries = self.STACK_RETRIES
@@ -133,6 +141,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                 pods_information = \
                     self._get_pods_information(
                         core_v1_api_client=core_v1_api_client,
+                        extension_api_client=extension_api_client,
                         deployment_info=deployment_info)
                 status = self._get_pod_status(pods_information)
                 LOG.debug('status: %s', status)
@@ -172,19 +181,55 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         finally:
             self.clean_authenticate_vim(auth_cred, file_descriptor)
 
-    def _get_pods_information(self, core_v1_api_client, deployment_info):
-        """Get pod information"""
-        pods_information = list()
+    def _get_pods_information(self, core_v1_api_client,
+                              extension_api_client, deployment_info):
+        """Get pod information
+
+        The pods of the deployments of a namespace are listed with a single
+        request, selected by their deployment label.
+        """
+        deployment_names = collections.OrderedDict()
         for i in range(0, len(deployment_info), 2):
             namespace = deployment_info[i]
-            deployment_name = deployment_info[i + 1]
-            respone = \
-                core_v1_api_client.list_namespaced_pod(namespace=namespace)
-            for item in respone.items:
-                if deployment_name in item.metadata.name:
-                    pods_information.append(item)
+            deployment_names.setdefault(namespace, []).append(
+                deployment_info[i + 1])
+
+        pods_information = list()
+        for namespace, names in deployment_names.items():
+            label_selector = '%s in (%s)' % (
+                translate_outputs.DEPLOYMENT_LABEL,
+                COMMA_CHARACTER.join(names))
+            respone = core_v1_api_client.list_namespaced_pod(
+                namespace=namespace, label_selector=label_selector)
+            pods_information.extend(respone.items)
+
+            # NOTE: The pods of the deployments created before the label was
+            # added are found by name in all the pods of the namespace.
+            labelled = set(item.metadata.labels.get(
+                translate_outputs.DEPLOYMENT_LABEL)
+                for item in respone.items)
+            unlabelled = [name for name in names if name not in labelled and
+                          not self._is_labelled_deployment(
+                              extension_api_client, namespace, name)]
+            if unlabelled:
+                respone = core_v1_api_client.list_namespaced_pod(
+                    namespace=namespace)
+                for item in respone.items:
+                    if any(name in item.metadata.name
+                           for name in unlabelled):
+                        pods_information.append(item)
         return pods_information
 
+    def _is_labelled_deployment(self, extension_api_client, namespace, name):
+        key = (namespace, name)
+        if key not in self._labelled_deployments:
+            deployment = extension_api_client.read_namespaced_deployment(
+                namespace=namespace, name=name)
+            labels = deployment.spec.template.metadata.labels or {}
+            self._labelled_deployments[key] = (
+                translate_outputs.DEPLOYMENT_LABEL in labels)
+        return self._labelled_deployments[key]
+
     def _get_pod_status(self, pods_information):
         pending_flag = False
         unknown_flag = False
@@ -317,6 +362,8 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
                     LOG.debug(e)
                     pass
                 # delete Deployment if it exists
+                self._labelled_deployments.pop((namespace, deployment_name),
+                                               None)
                 try:
                     body = client.V1DeleteOptions(
                         propagation_policy='Foreground',
@@ -476,10 +523,13 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         try:
             core_v1_api_client = self.kubernetes.get_core_v1_api_client(
                 auth=auth_cred)
+            extension_api_client = self.kubernetes.get_extension_api_client(
+                auth=auth_cred)
             deployment_info = policy['instance_id'].split(",")
 
             pods_information = self._get_pods_information(
                 core_v1_api_client=core_v1_api_client,
+                extension_api_client=extension_api_client,
                 deployment_info=deployment_info)
             status = self._get_pod_status(pods_information)
 
@@ -490,6 +540,7 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
 
                 pods_information = self._get_pods_information(
                     core_v1_api_client=core_v1_api_client,
+                    extension_api_client=extension_api_client,
                     deployment_info=deployment_info)
                 status = self._get_pod_status(pods_information)
 
@@ -532,6 +583,9 @@ class Kubernetes(abstract_driver.VnfAbstractDriver,
         return auth_cred, file_descriptor
 
     def _create_ssl_ca_file(self, auth_attr):
+        if kubernetes_utils.is_api_client_cache_enabled():
+            # The CA certificate file is managed by the ApiClient cache.
+            return None
         ca_cert = utils.none_from_string(auth_attr.get('ssl_ca_cert'))
         if ca_cert is not None:
             file_descriptor, file_path = \
@@ -55,6 +55,13 @@ class GlanceClient(object):
             type_, value, tb = sys.exc_info()
             raise vnflcm.GlanceClientException(msg=value)
 
+    @property
+    def project_id(self):
+        return self.connection.current_project_id
+
+    def list(self, **filters):
+        return list(self.connection.image.images(**filters))
+
     def get(self, image_id):
         try:
             return self.connection.image.get_image(image_id)
@@ -30,6 +30,7 @@ from oslo_utils import excutils
 import yaml
 
 from tacker._i18n import _
+from tacker.common import coordination
 from tacker.common import exceptions
 from tacker.common import log
 from tacker.common import utils
@@ -41,6 +42,7 @@ from tacker.vnfm.infra_drivers import abstract_driver
 from tacker.vnfm.infra_drivers.openstack import constants as infra_cnst
 from tacker.vnfm.infra_drivers.openstack import glance_client as gc
 from tacker.vnfm.infra_drivers.openstack import heat_client as hc
+from tacker.vnfm.infra_drivers.openstack import stack_poller
 from tacker.vnfm.infra_drivers.openstack import translate_template
 from tacker.vnfm.infra_drivers.openstack import vdu
 from tacker.vnfm.infra_drivers import scale_driver
@@ -60,6 +62,35 @@ OPTS = [
                default=10,
                help=_("Wait time (in seconds) between consecutive stack"
                       " create/delete retries")),
+    cfg.BoolOpt('shared_stack_poller',
+                default=False,
+                help=_("Wait for the stacks of a VIM with a single poller "
+                       "listing all of them per request, instead of "
+                       "getting each stack separately. The interval "
+                       "between requests grows from stack_poll_min_wait to "
+                       "stack_retry_wait seconds while no stack completes. "
+                       "stack_retries * stack_retry_wait is still the "
+                       "timeout of each wait.")),
+    cfg.IntOpt('stack_poll_min_wait',
+               default=1,
+               min=1,
+               help=_("Minimum wait time (in seconds) between consecutive "
+                      "requests of the shared stack poller")),
+    cfg.IntOpt('image_create_workers',
+               default=4,
+               min=1,
+               help=_("Maximum number of software images of a VNF created "
+                      "and waited for concurrently when it is "
+                      "instantiated")),
+    cfg.BoolOpt('reuse_images',
+                default=False,
+                help=_("Share the software images created in a VIM project "
+                       "between the VNF instances whose images have the "
+                       "same hash, instead of creating one image per VNF "
+                       "instance. A shared image is deleted when the last "
+                       "VNF instance using it is terminated. Keep it "
+                       "enabled as long as VNF instances using shared "
+                       "images exist.")),
 ]
 
 CONF.register_opts(OPTS, group='openstack_vim')
@@ -84,6 +115,9 @@ heat_template_version: 2013-05-23
 """
 
 OUTPUT_PREFIX = 'mgmt_ip-'
+# Tag of the images which can be shared by VNF instances, followed by the
+# hash of the image.
+REUSABLE_IMAGE_TAG_PREFIX = 'tacker-sw-image-'
 ALARMING_POLICY = 'tosca.policies.tacker.Alarming'
 SCALING_POLICY = 'tosca.policies.tacker.Scaling'
 
@@ -293,6 +327,11 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                                 expected_status, exception_class,
                                 region_name=None):
         heatclient = hc.HeatClient(auth_attr, region_name)
+        if cfg.CONF.openstack_vim.shared_stack_poller:
+            return self._wait_until_stack_ready_shared(
+                heatclient, vnf_id, auth_attr, wait_status, expected_status,
+                exception_class, region_name=region_name)
+
         stack_retries = self.STACK_RETRIES
         status = wait_status
         stack = None
@@ -326,6 +365,31 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                 LOG.warning(error_reason)
                 raise exception_class(reason=error_reason)
 
+    def _wait_until_stack_ready_shared(self, heatclient, vnf_id, auth_attr,
+                                       wait_status, expected_status,
+                                       exception_class, region_name=None):
+        wait = self.STACK_RETRIES * self.STACK_RETRY_WAIT
+        stack = stack_poller.get_poller(auth_attr, region_name).wait(
+            heatclient, vnf_id, wait_status, wait)
+        if stack is None:
+            error_reason = _("action is not completed within {wait} "
+                             "seconds on stack {stack}").format(
+                wait=wait, stack=vnf_id)
+            raise exception_class(reason=error_reason)
+
+        status = stack.stack_status
+        if status != expected_status:
+            error_reason = stack.stack_status_reason
+            LOG.warning(error_reason)
+            raise exception_class(reason=error_reason)
+
+        LOG.debug('stack status: %(stack)s %(status)s',
+                  {'stack': vnf_id, 'status': status})
+        if status == infra_cnst.STACK_DELETE_COMPLETE:
+            return stack
+        # Stacks returned by stacks.list() do not contain the outputs.
+        return heatclient.get(vnf_id)
+
     def _find_mgmt_ips(self, outputs):
         LOG.debug('outputs %s', outputs)
         mgmt_ips = dict((output['output_key'][len(OUTPUT_PREFIX):],
@@ -589,96 +653,212 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                               vim_connection_info, vnf_software_images):
         glance_client = gc.GlanceClient(vim_connection_info)
         vnf_resources = {}
+        failures = []
 
         def _roll_back_images():
             # Delete all previously created images for vnf
             for key, resources in vnf_resources.items():
                 for vnf_resource in resources:
                     try:
-                        glance_client.delete(vnf_resource.resource_identifier)
+                        self._release_image(context, glance_client,
+                                            vnf_resource)
                     except Exception:
                         LOG.error("Failed to delete image %(uuid)s "
                                   "for vnf %(id)s",
                                   {"uuid": vnf_resource.resource_identifier,
                                   "id": vnf_instance.id})
 
-        for node_name, vnf_sw_image in vnf_software_images.items():
-            name = vnf_sw_image.name
-            image_path = vnf_sw_image.image_path
-            is_url = utils.is_url(image_path)
+        def _create_image(node_name, vnf_sw_image):
+            # Do not start new uploads once an image has failed, they
+            # would be deleted anyway.
+            if failures:
+                return
+            try:
+                vnf_resources[node_name] = [self._create_image(
+                    context, vnf_instance, glance_client, vnf_sw_image)]
+            except Exception as exp:
+                failures.append(exp)
 
-            if not is_url:
-                filename = image_path
-            else:
-                filename = None
+        # NOTE: Images are uploaded and waited for concurrently, the
+        # images created successfully are deleted if any of them fails.
+        pool = eventlet.GreenPool(cfg.CONF.openstack_vim.image_create_workers)
+        for node_name, vnf_sw_image in vnf_software_images.items():
+            pool.spawn_n(_create_image, node_name, vnf_sw_image)
+        pool.waitall()
 
-            try:
-                LOG.info("Creating image %(name)s for vnf %(id)s",
-                         {"name": name, "id": vnf_instance.id})
+        if failures:
+            # Delete previously created images
+            _roll_back_images()
+            raise failures[0]
 
-                image_data = {"min_disk": vnf_sw_image.min_disk,
-                    "min_ram": vnf_sw_image.min_ram,
-                    "disk_format": vnf_sw_image.disk_format,
-                    "container_format": vnf_sw_image.container_format,
-                    "visibility": "private"}
+        return vnf_resources
 
-                if filename:
-                    image_data.update({"filename": filename})
+    def _create_image(self, context, vnf_instance, glance_client,
+                      vnf_sw_image):
+        """Create a software image and wait until it is active
 
-                image = glance_client.create(name, **image_data)
+        The image is deleted if it does not become active.
 
-                LOG.info("Image %(name)s created successfully for vnf %(id)s",
-                         {"name": name, "id": vnf_instance.id})
-            except Exception as exp:
-                with excutils.save_and_reraise_exception():
-                    exp.reraise = False
-                    LOG.error("Failed to create image %(name)s for vnf %(id)s"
-                              "due to error: %(error)s",
-                              {"name": name, "id": vnf_instance.id,
-                              "error": encodeutils.exception_to_unicode(exp)})
-
-                    # Delete previously created images
-                    _roll_back_images()
-
-                    raise exceptions.VnfPreInstantiationFailed(
-                        id=vnf_instance.id,
-                        error=encodeutils.exception_to_unicode(exp))
-            try:
-                if is_url:
-                    glance_client.import_image(image, image_path)
+        :returns: the VnfResource of the image
+        :raises: VnfPreInstantiationFailed
+        """
+        name = vnf_sw_image.name
+        image_path = vnf_sw_image.image_path
+        is_url = utils.is_url(image_path)
+        reuse_images = cfg.CONF.openstack_vim.reuse_images
 
-                self._image_create_wait(image.id, vnf_sw_image.hash,
-                    glance_client, 'active', vnflcm.ImageCreateWaitFailed)
+        if not is_url:
+            filename = image_path
+        else:
+            filename = None
 
-                vnf_resource = objects.VnfResource(context=context,
-                    vnf_instance_id=vnf_instance.id,
-                    resource_name=name, resource_type="image",
-                    resource_status="CREATED", resource_identifier=image.id)
-                vnf_resources[node_name] = [vnf_resource]
-            except Exception as exp:
-                with excutils.save_and_reraise_exception():
-                    exp.reraise = False
-                    LOG.error("Image %(name)s not active for vnf %(id)s"
-                              "error: %(error)s",
-                              {"name": name, "id": vnf_instance.id,
-                              "error": encodeutils.exception_to_unicode(exp)})
-
-                    err_msg = "Failed to delete image %(uuid)s for vnf %(id)s"
-                    # Delete the image
-                    try:
+        try:
+            if reuse_images:
+                vnf_resource = self._reuse_image(context, vnf_instance,
+                                                 glance_client, vnf_sw_image)
+                if vnf_resource is not None:
+                    return vnf_resource
+
+            LOG.info("Creating image %(name)s for vnf %(id)s",
+                     {"name": name, "id": vnf_instance.id})
+
+            image_data = {"min_disk": vnf_sw_image.min_disk,
+                "min_ram": vnf_sw_image.min_ram,
+                "disk_format": vnf_sw_image.disk_format,
+                "container_format": vnf_sw_image.container_format,
+                "visibility": "private"}
+
+            if filename:
+                image_data.update({"filename": filename})
+            if reuse_images:
+                image_data.update({"tags": [
+                    REUSABLE_IMAGE_TAG_PREFIX + vnf_sw_image.hash]})
+
+            image = glance_client.create(name, **image_data)
+
+            LOG.info("Image %(name)s created successfully for vnf %(id)s",
+                     {"name": name, "id": vnf_instance.id})
+        except Exception as exp:
+            with excutils.save_and_reraise_exception():
+                exp.reraise = False
+                LOG.error("Failed to create image %(name)s for vnf %(id)s"
+                          "due to error: %(error)s",
+                          {"name": name, "id": vnf_instance.id,
+                          "error": encodeutils.exception_to_unicode(exp)})
+
+                raise exceptions.VnfPreInstantiationFailed(
+                    id=vnf_instance.id,
+                    error=encodeutils.exception_to_unicode(exp))
+        vnf_resource = objects.VnfResource(context=context,
+            vnf_instance_id=vnf_instance.id,
+            resource_name=name, resource_type="image",
+            resource_status="CREATED", resource_identifier=image.id)
+        try:
+            if reuse_images:
+                # NOTE: Other VNF instances may use the image as soon as it
+                # is active, and delete it when they release it if no other
+                # reference exists, so its reference is saved before.
+                self._save_shared_image(vnf_resource, image.id)
+
+            if is_url:
+                glance_client.import_image(image, image_path)
+
+            self._image_create_wait(image.id, vnf_sw_image.hash,
+                glance_client, 'active', vnflcm.ImageCreateWaitFailed)
+
+            return vnf_resource
+        except Exception as exp:
+            with excutils.save_and_reraise_exception():
+                exp.reraise = False
+                LOG.error("Image %(name)s not active for vnf %(id)s"
+                          "error: %(error)s",
+                          {"name": name, "id": vnf_instance.id,
+                          "error": encodeutils.exception_to_unicode(exp)})
+
+                err_msg = "Failed to delete image %(uuid)s for vnf %(id)s"
+                # Delete the image
+                try:
+                    if vnf_resource.obj_attr_is_set('id'):
+                        self._release_shared_image(context, glance_client,
+                                                   vnf_resource, image.id)
+                    else:
                         glance_client.delete(image.id)
-                    except Exception:
-                        LOG.error(err_msg, {"uuid": image.id,
-                                  "id": vnf_instance.id})
+                except Exception:
+                    LOG.error(err_msg, {"uuid": image.id,
+                              "id": vnf_instance.id})
 
-                    # Delete all previously created images for vnf
-                    _roll_back_images()
+                raise exceptions.VnfPreInstantiationFailed(
+                    id=vnf_instance.id,
+                    error=encodeutils.exception_to_unicode(exp))
 
-                    raise exceptions.VnfPreInstantiationFailed(
-                        id=vnf_instance.id,
-                        error=encodeutils.exception_to_unicode(exp))
+    def _reuse_image(self, context, vnf_instance, glance_client,
+                     vnf_sw_image):
+        """Use an active image of the VIM project with the same hash
 
-        return vnf_resources
+        :returns: the VnfResource of the image, already saved, or None if
+                  there is no such image
+        """
+        images = glance_client.list(
+            tag=REUSABLE_IMAGE_TAG_PREFIX + vnf_sw_image.hash,
+            status='active', owner=glance_client.project_id)
+        for image in images:
+            if image.hash_value != vnf_sw_image.hash:
+                continue
+            vnf_resource = self._use_shared_image(
+                context, vnf_instance, glance_client, vnf_sw_image.name,
+                image.id)
+            if vnf_resource is not None:
+                LOG.info("Reusing image %(uuid)s as %(name)s for vnf "
+                         "%(id)s", {"uuid": image.id,
+                         "name": vnf_sw_image.name, "id": vnf_instance.id})
+                return vnf_resource
+
+    @coordination.synchronized('image-{image_id}')
+    def _use_shared_image(self, context, vnf_instance, glance_client, name,
+                          image_id):
+        # The image may have been released since it was listed.
+        try:
+            image = glance_client.get(image_id)
+        except Exception:
+            image = None
+        if image is None or image.status != 'active':
+            return
+
+        vnf_resource = objects.VnfResource(context=context,
+            vnf_instance_id=vnf_instance.id,
+            resource_name=name, resource_type="image",
+            resource_status="CREATED", resource_identifier=image_id)
+        vnf_resource.create()
+        return vnf_resource
+
+    @coordination.synchronized('image-{image_id}')
+    def _save_shared_image(self, vnf_resource, image_id):
+        vnf_resource.create()
+
+    def _release_image(self, context, glance_client, vnf_resource):
+        """Delete an image unless other VNF instances use it"""
+        if not cfg.CONF.openstack_vim.reuse_images:
+            glance_client.delete(vnf_resource.resource_identifier)
+            return
+
+        self._release_shared_image(context, glance_client, vnf_resource,
+                                   vnf_resource.resource_identifier)
+
+    @coordination.synchronized('image-{image_id}')
+    def _release_shared_image(self, context, glance_client, vnf_resource,
+                              image_id):
+        if vnf_resource.obj_attr_is_set('id'):
+            vnf_resource.destroy(context)
+
+        vnf_resources = objects.VnfResourceList.get_by_resource_identifier(
+            context, vnf_resource.resource_type, image_id)
+        if vnf_resources:
+            LOG.info("Image %(uuid)s is still used by %(count)d vnf "
+                     "resources", {"uuid": image_id,
+                     "count": len(vnf_resources)})
+            return
+
+        glance_client.delete(image_id)
 
     def _image_create_wait(self, image_uuid, hash_value, glance_client,
                            expected_status, exception_class):
@@ -720,7 +900,7 @@ class OpenStack(abstract_driver.VnfAbstractDriver,
                  "id": vnf_instance.id})
         glance_client = gc.GlanceClient(vim_connection_info)
         try:
-            glance_client.delete(vnf_resource.resource_identifier)
+            self._release_image(context, glance_client, vnf_resource)
             LOG.info("Deleted resource '%(name)s' of type ' %(type)s' for vnf"
                  "%(id)s", {"type": vnf_resource.resource_type,
                  "name": vnf_resource.resource_name,
@@ -0,0 +1,163 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared poller of Heat stack statuses, one per VIM.
+
+Used by the OpenStack infra driver when [openstack_vim] shared_stack_poller
+is enabled.
+"""
+
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# Maximum number of stack ids passed to a single stacks.list() request, to
+# keep the query string of the request short.
+MAX_STACKS_PER_REQUEST = 100
+
+_pollers = {}
+_pollers_lock = threading.Lock()
+
+
+class _Waiter(object):
+
+    def __init__(self, stack_id, wait_status):
+        self.stack_id = stack_id
+        self.wait_status = wait_status
+        self.stack = None
+        self.event = threading.Event()
+
+
+class StackPoller(object):
+    """Polls the stacks being waited for with one stacks.list() per tick.
+
+    The interval between two ticks starts at [openstack_vim]
+    stack_poll_min_wait seconds. It is doubled, up to [openstack_vim]
+    stack_retry_wait seconds, after each tick in which no stack left its
+    wait status, and reset when a new stack is waited for or a stack
+    completes. The background thread stops when no stack is waited for.
+    """
+
+    def __init__(self):
+        self._heatclient = None
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def wait(self, heatclient, stack_id, wait_status, timeout):
+        """Wait until the status of a stack is not wait_status anymore.
+
+        :param heatclient: HeatClient of the VIM, replaces the one used so
+                           far so that updated credentials are picked up
+        :returns: the stack as returned by stacks.list(), or None if its
+                  status did not change within timeout seconds
+        """
+        waiter = _Waiter(stack_id, wait_status)
+        with self._lock:
+            self._heatclient = heatclient
+            self._waiters.setdefault(stack_id, []).append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+
+        if not waiter.event.wait(timeout):
+            self._remove(waiter)
+        return waiter.stack
+
+    def _remove(self, waiter):
+        with self._lock:
+            waiters = self._waiters.get(waiter.stack_id, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(waiter.stack_id, None)
+
+    def _run(self):
+        interval = CONF.openstack_vim.stack_poll_min_wait
+        while True:
+            self._wakeup.wait(interval)
+            if self._wakeup.is_set():
+                self._wakeup.clear()
+                interval = CONF.openstack_vim.stack_poll_min_wait
+
+            with self._lock:
+                if not self._waiters:
+                    self._thread = None
+                    return
+                heatclient = self._heatclient
+                stack_ids = list(self._waiters)
+
+            if self._poll(heatclient, stack_ids):
+                interval = CONF.openstack_vim.stack_poll_min_wait
+            else:
+                interval = min(interval * 2,
+                               CONF.openstack_vim.stack_retry_wait)
+
+    def _poll(self, heatclient, stack_ids):
+        """Wake the waiters of the stacks which left their wait status.
+
+        :returns: True if at least one waiter was woken up
+        """
+        stacks = {}
+        for start in range(0, len(stack_ids), MAX_STACKS_PER_REQUEST):
+            filters = {'id': stack_ids[start:start + MAX_STACKS_PER_REQUEST]}
+            try:
+                # Deleted stacks are only listed with show_deleted.
+                for stack in heatclient.stacks.list(filters=filters,
+                                                    show_deleted=True):
+                    stacks[stack.id] = stack
+            except Exception:
+                # Retry at the next tick to avoid temporary connection
+                # errors to the VIM, as when polling a single stack.
+                LOG.warning("Heat API request failed while waiting for "
+                            "stacks %s", stack_ids, exc_info=True)
+                return False
+
+        woken = False
+        with self._lock:
+            for stack_id, stack in stacks.items():
+                LOG.debug('status of stack %(stack)s: %(status)s',
+                          {'stack': stack_id, 'status': stack.stack_status})
+                waiters = self._waiters.get(stack_id, [])
+                for waiter in [w for w in waiters
+                               if w.wait_status != stack.stack_status]:
+                    waiter.stack = stack
+                    waiter.event.set()
+                    waiters.remove(waiter)
+                    woken = True
+                if not waiters:
+                    self._waiters.pop(stack_id, None)
+        return woken
+
+
+def _vim_key(auth_attr, region_name):
+    auth_attr = auth_attr or {}
+    return (auth_attr.get('auth_url'), auth_attr.get('username'),
+            auth_attr.get('project_id') or auth_attr.get('project_name'),
+            region_name or auth_attr.get('region'))
+
+
+def get_poller(auth_attr, region_name=None):
+    """Return the poller shared by all the stacks of a VIM."""
+    key = _vim_key(auth_attr, region_name)
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            poller = _pollers[key] = StackPoller()
+    return poller
@@ -14,20 +14,58 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
+import threading
 
 from cryptography import fernet
 from keystoneauth1 import exceptions
 from keystoneauth1 import identity
 from keystoneauth1 import session
 from keystoneclient import client
-from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+
+from tacker.common import utils
+import tacker.conf
 
 
 DEFAULT_IDENTITY_VERSION = "v3"
 LOG = logging.getLogger(__name__)
-CONF = cfg.CONF
+CONF = tacker.conf.CONF
+
+# Keystone clients, and so sessions, keyed by auth_url and a fingerprint of
+# the credentials they were created with.
+_client_cache = None
+_client_cache_lock = threading.Lock()
+
+
+def _get_client_cache():
+    global _client_cache
+    if not CONF.vim_client.session_cache_size:
+        return None
+    if _client_cache is None:
+        with _client_cache_lock:
+            if _client_cache is None:
+                _client_cache = utils.LRUCache(
+                    CONF.vim_client.session_cache_size)
+    return _client_cache
+
+
+def _get_client_cache_key(auth_attr):
+    fingerprint = hashlib.sha256(
+        jsonutils.dump_as_bytes(auth_attr, sort_keys=True)).hexdigest()
+    return (auth_attr.get('auth_url'), fingerprint)
+
+
+def invalidate_clients(auth_url):
+    """Drop the cached clients of the VIMs using a Keystone endpoint."""
+    if _client_cache is None:
+        return
+    auth_url = (auth_url or '').rstrip('/')
+    for key in _client_cache.keys():
+        if (key[0] or '').startswith(auth_url):
+            _client_cache.pop(key)
 
 
 class Keystone(object):
@@ -53,6 +91,21 @@ class Keystone(object):
         return ses.get_endpoint(service_type, region_name)
 
     def initialize_client(self, **kwargs):
+        """Return a keystoneclient authenticated with the given credentials.
+
+        Clients authenticated with a password are cached, so that the
+        token and the HTTP connections of their session are reused by
+        the next clients created with the same credentials. The token is
+        renewed by the session when it is about to expire.
+        """
+        cache = _get_client_cache()
+        cache_key = None
+        if cache is not None and 'token' not in kwargs:
+            cache_key = _get_client_cache_key(kwargs)
+            cli = cache.get(cache_key)
+            if cli is not None:
+                return cli
+
         verify = 'True' == kwargs.pop('cert_verify', 'True') or False
         if 'token' in kwargs:
             auth_plugin = identity.v3.Token(**kwargs)
@@ -60,6 +113,8 @@ class Keystone(object):
             auth_plugin = identity.v3.Password(**kwargs)
         ses = self.get_session(auth_plugin=auth_plugin, verify=verify)
         cli = client.Client(DEFAULT_IDENTITY_VERSION, session=ses)
+        if cache_key is not None:
+            cache.set(cache_key, cli)
         return cli
 
     @staticmethod
@@ -16,16 +16,17 @@
 
 import ast
 import copy
-import inspect
 import threading
 import time
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 
 from tacker._i18n import _
+from tacker.common import coordination
 from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker import context as t_context
@@ -38,9 +39,32 @@ OPTS = [
     cfg.IntOpt('check_intvl',
                default=10,
                help=_("check interval for monitor")),
+    cfg.IntOpt('check_workers',
+               default=100,
+               help=_("Maximum number of VNFs the monitor health-checks "
+                      "concurrently")),
+    cfg.BoolOpt('enable_sharding',
+                default=False,
+                help=_("Share the monitored VNFs between the tacker-server "
+                       "instances that use the same coordination backend, "
+                       "so that each VNF is health-checked by one of them "
+                       "only")),
+    cfg.IntOpt('shard_sync_interval',
+               default=60,
+               min=1,
+               help=_("Interval in seconds between two loads of the VNFs "
+                      "assigned to a tacker-server instance from the "
+                      "database when sharding is enabled. VNFs created, "
+                      "updated or deleted through another instance are "
+                      "picked up within this interval")),
 ]
 CONF.register_opts(OPTS, group='monitor')
 
+# Granularity of the monitor scheduler: how often it looks for VNFs whose
+# next health check is due.
+SCHEDULER_TICK = 1
+MONITOR_GROUP = 'vnf-monitor'
+
 
 def config_opts():
     return [('monitor', OPTS),
@@ -56,6 +80,10 @@ class VNFMonitor(object):
     _hosting_vnfs = dict()   # vnf_id => dict of parameters
     _status_check_intvl = 0
     _lock = threading.RLock()
+    # Number of load_hosting_vnfs() calls running, and ids of the VNFs
+    # deleted since the first of them started.
+    _loads = 0
+    _deleted_vnf_ids = set()
 
     OPTS = [
         cfg.ListOpt(
@@ -80,28 +108,121 @@ class VNFMonitor(object):
         if check_intvl is None:
             check_intvl = cfg.CONF.monitor.check_intvl
         self._status_check_intvl = check_intvl
+        self._pool = eventlet.GreenPool(cfg.CONF.monitor.check_workers)
+        self._coordinator = None
+        self._partitioner = None
+        self._get_hosting_vnfs = None
+        self._next_sync_at = None
+        self._syncing = False
+        if cfg.CONF.monitor.enable_sharding:
+            self._join_monitor_group()
         LOG.debug('Spawning VNF monitor thread')
         threading.Thread(target=self.__run__).start()
 
     def __run__(self):
         while(1):
-            time.sleep(self._status_check_intvl)
-
-            with self._lock:
-                for hosting_vnf in VNFMonitor._hosting_vnfs.values():
-                    if hosting_vnf.get('dead', False) or (
-                            hosting_vnf['vnf']['status'] ==
-                            constants.PENDING_HEAL):
-                        LOG.debug(
-                            'monitor skips for DEAD/PENDING_HEAL vnf %s',
-                            hosting_vnf)
-                        continue
-                    try:
-                        self.run_monitor(hosting_vnf)
-                    except Exception as ex:
-                        LOG.exception("Unknown exception: Monitoring failed "
-                                      "for VNF '%s' due to '%s' ",
-                                      hosting_vnf['id'], ex)
+            time.sleep(min(SCHEDULER_TICK, self._status_check_intvl))
+
+            if self._coordinator:
+                members_changed = False
+                try:
+                    members_changed = self._coordinator.run_watchers()
+                except Exception:
+                    LOG.exception("Failed to refresh the members of the "
+                                  "VNF monitor group")
+                if self._is_sync_due(members_changed):
+                    self._pool.spawn_n(self._sync_shard)
+
+            for hosting_vnf in self._get_due_vnfs():
+                self._pool.spawn_n(self._monitor_vnf, hosting_vnf)
+
+    def _join_monitor_group(self):
+        """Join the group of VNF monitors sharing the monitored VNFs.
+
+        Every monitor only checks the VNFs the consistent hash ring of the
+        group assigns to it. When a monitor joins or leaves, the ring is
+        rebuilt by run_watchers() and each monitor loads the VNFs now
+        assigned to it from the database, see load_hosting_vnfs().
+        """
+        coordinator = coordination.Coordinator(prefix='tacker-')
+        try:
+            coordinator.start()
+            self._partitioner = coordinator.join_partitioned_group(
+                MONITOR_GROUP)
+        except Exception:
+            LOG.exception("Failed to join the VNF monitor group, "
+                          "monitoring all VNFs from this node")
+            coordinator.stop()
+            return
+        self._coordinator = coordinator
+
+    def _is_monitored_here(self, vnf_id):
+        if self._partitioner is None:
+            return True
+        try:
+            return self._partitioner.belongs_to_self(vnf_id)
+        except Exception:
+            # NOTE: Checking a VNF twice is better than not checking it.
+            LOG.exception("Failed to find the monitor of VNF %s", vnf_id)
+            return True
+
+    def _is_sync_due(self, members_changed):
+        with self._lock:
+            if self._get_hosting_vnfs is None or self._syncing:
+                return False
+            if not members_changed and time.monotonic() < self._next_sync_at:
+                return False
+            self._syncing = True
+            return True
+
+    def _sync_shard(self):
+        try:
+            self.load_hosting_vnfs(self._get_hosting_vnfs)
+        except Exception:
+            LOG.exception("Failed to load the VNFs assigned to this "
+                          "monitor")
+        finally:
+            self._syncing = False
+
+    def _get_due_vnfs(self):
+        """Return the VNFs whose health check is due and reschedule them.
+
+        The lock is only held while taking the snapshot, so probes run
+        without blocking add/update/delete of hosting VNFs. A VNF whose
+        previous check is still running, or which is checked by another
+        monitor of the group, is not scheduled.
+        """
+        now = time.monotonic()
+        due_vnfs = []
+        with self._lock:
+            for hosting_vnf in VNFMonitor._hosting_vnfs.values():
+                if hosting_vnf.get('in_progress') or (
+                        hosting_vnf.get('next_check_at', now) > now):
+                    continue
+                if not self._is_monitored_here(hosting_vnf['id']):
+                    continue
+                hosting_vnf['next_check_at'] = (
+                    now + self._status_check_intvl)
+                if hosting_vnf.get('dead', False) or (
+                        hosting_vnf['vnf']['status'] ==
+                        constants.PENDING_HEAL):
+                    LOG.debug(
+                        'monitor skips for DEAD/PENDING_HEAL vnf %s',
+                        hosting_vnf)
+                    continue
+                hosting_vnf['in_progress'] = True
+                due_vnfs.append(hosting_vnf)
+        return due_vnfs
+
+    def _monitor_vnf(self, hosting_vnf):
+        try:
+            self.run_monitor(hosting_vnf)
+        except Exception as ex:
+            LOG.exception("Unknown exception: Monitoring failed "
+                          "for VNF '%s' due to '%s' ",
+                          hosting_vnf['id'], ex)
+        finally:
+            hosting_vnf['in_progress'] = False
 
     @staticmethod
     def to_hosting_vnf(vnf_dict, action_cb):
@@ -120,6 +241,9 @@ class VNFMonitor(object):
                   {'id': new_vnf['id'],
                    'ips': new_vnf['mgmt_ip_addresses']})
         new_vnf['boot_at'] = timeutils.utcnow()
+        new_vnf['added_at'] = time.monotonic()
+        new_vnf['next_check_at'] = (
+            new_vnf['added_at'] + self._status_check_intvl)
         with self._lock:
             VNFMonitor._hosting_vnfs[new_vnf['id']] = new_vnf
 
@@ -131,9 +255,99 @@ class VNFMonitor(object):
                               new_vnf['vnf'],
                               constants.RES_EVT_MONITOR, evt_details)
 
+    def add_hosting_vnfs(self, new_vnfs):
+        """Add many hosting VNFs and log their events in one batch.
+
+        VNFs which are already monitored, or which were deleted while
+        load_hosting_vnfs() was reading them, are skipped.
+
+        :returns: the VNFs added
+        """
+        boot_at = timeutils.utcnow()
+        added_at = time.monotonic()
+        next_check_at = added_at + self._status_check_intvl
+        added_vnfs = []
+        with self._lock:
+            for new_vnf in new_vnfs:
+                if (new_vnf['id'] in VNFMonitor._hosting_vnfs or
+                        new_vnf['id'] in VNFMonitor._deleted_vnf_ids):
+                    continue
+                new_vnf['boot_at'] = boot_at
+                new_vnf['added_at'] = added_at
+                new_vnf['next_check_at'] = next_check_at
+                VNFMonitor._hosting_vnfs[new_vnf['id']] = new_vnf
+                added_vnfs.append(new_vnf)
+        LOG.debug('Added %d hosts for monitoring', len(added_vnfs))
+
+        vnfm_utils.log_events_bulk(t_context.get_admin_context(), [
+            (new_vnf['vnf'], constants.RES_EVT_MONITOR,
+             ("VNF added for monitoring. mon_policy_dict = %s,") %
+             new_vnf['vnf']['attributes']['monitoring_policy'])
+            for new_vnf in added_vnfs])
+        return added_vnfs
+
+    def load_hosting_vnfs(self, get_hosting_vnfs):
+        """Add the hosting VNFs returned by get_hosting_vnfs().
+
+        get_hosting_vnfs() reads the VNFs from the database without holding
+        the lock, so VNFs added, updated or deleted meanwhile are not
+        replaced or added back from its stale result.
+
+        When the VNFs are shared between the monitors of a group, a VNF is
+        only added to the monitor of the node which handled its creation.
+        Only the VNFs assigned to this monitor are then added, the VNFs
+        which are not assigned to it anymore or were deleted are removed,
+        and get_hosting_vnfs() is called again every [monitor]
+        shard_sync_interval seconds and whenever a monitor joins or leaves
+        the group.
+
+        :returns: the VNFs added
+        """
+        started_at = time.monotonic()
+        with self._lock:
+            VNFMonitor._loads += 1
+            if self._partitioner is not None:
+                self._get_hosting_vnfs = get_hosting_vnfs
+                self._next_sync_at = (started_at +
+                                      cfg.CONF.monitor.shard_sync_interval)
+        try:
+            hosting_vnfs = get_hosting_vnfs()
+            if self._partitioner is not None:
+                hosting_vnfs = self._remove_unassigned_vnfs(hosting_vnfs,
+                                                            started_at)
+            return self.add_hosting_vnfs(hosting_vnfs)
+        finally:
+            with self._lock:
+                VNFMonitor._loads -= 1
+                if not VNFMonitor._loads:
+                    VNFMonitor._deleted_vnf_ids.clear()
+
+    def _remove_unassigned_vnfs(self, hosting_vnfs, started_at):
+        """Remove the VNFs of other monitors and the deleted VNFs.
+
+        VNFs added since started_at are kept, they are not in hosting_vnfs
+        when they were created after it was read.
+
+        :returns: the VNFs of hosting_vnfs assigned to this monitor
+        """
+        assigned_vnfs = {hosting_vnf['id']: hosting_vnf
+                         for hosting_vnf in hosting_vnfs
+                         if self._is_monitored_here(hosting_vnf['id'])}
+        with self._lock:
+            for vnf_id, hosting_vnf in list(
+                    VNFMonitor._hosting_vnfs.items()):
+                if (vnf_id not in assigned_vnfs and
+                        hosting_vnf.get('added_at', 0) < started_at):
+                    LOG.debug('VNF %s is not monitored here anymore',
+                              vnf_id)
+                    del VNFMonitor._hosting_vnfs[vnf_id]
+        return list(assigned_vnfs.values())
+
     def delete_hosting_vnf(self, vnf_id):
         LOG.debug('deleting vnf_id %(vnf_id)s', {'vnf_id': vnf_id})
         with self._lock:
+            if VNFMonitor._loads:
+                VNFMonitor._deleted_vnf_ids.add(vnf_id)
             hosting_vnf = VNFMonitor._hosting_vnfs.pop(vnf_id, None)
             if hosting_vnf:
                 LOG.debug('deleting vnf_id %(vnf_id)s, Mgmt IP %(ips)s',
@@ -194,21 +408,20 @@ class VNFMonitor(object):
     def mark_dead(self, vnf_id):
         VNFMonitor._hosting_vnfs[vnf_id]['dead'] = True
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
+    def _invoke(self, method, driver, **kwargs):
         return self._monitor_manager.invoke(
             driver, method, **kwargs)
 
     def monitor_get_config(self, vnf_dict):
-        return self._invoke(
-            vnf_dict, monitor=self, vnf=vnf_dict)
+        return self._invoke('monitor_get_config',
+                            vnf_dict, monitor=self, vnf=vnf_dict)
 
     def monitor_url(self, vnf_dict):
-        return self._invoke(
-            vnf_dict, monitor=self, vnf=vnf_dict)
+        return self._invoke('monitor_url',
+                            vnf_dict, monitor=self, vnf=vnf_dict)
 
     def monitor_call(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
+        return self._invoke('monitor_call', driver,
                             vnf=vnf_dict, kwargs=kwargs)
 
 
@@ -243,8 +456,7 @@ class VNFAppMonitor(object):
         mgmt_ip_address = vnf_dict['mgmt_ip_address']
         return self._create_app_monitoring_dict(dev_attrs, mgmt_ip_address)
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
+    def _invoke(self, method, driver, **kwargs):
         return self._application_monitor_manager.\
             invoke(driver, method, **kwargs)
 
@@ -252,7 +464,8 @@ class VNFAppMonitor(object):
         vdunode = applicationvnfdict['vdus'].keys()
         driver = applicationvnfdict['vdus'][vdunode[0]]['name']
         kwargs = applicationvnfdict
-        return self._invoke(driver, vnf=vnf_dict, kwargs=kwargs)
+        return self._invoke('add_to_appmonitor', driver, vnf=vnf_dict,
+                            kwargs=kwargs)
 
 
 class VNFAlarmMonitor(object):
@@ -331,17 +544,16 @@ class VNFAlarmMonitor(object):
         driver = trigger_dict['event_type']['implementation']
         return self.process_alarm(driver, vnf, alarm_dict)
 
-    def _invoke(self, driver, **kwargs):
-        method = inspect.stack()[1][3]
+    def _invoke(self, method, driver, **kwargs):
         return self._alarm_monitor_manager.invoke(
             driver, method, **kwargs)
 
     def call_alarm_url(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
+        return self._invoke('call_alarm_url', driver,
                             vnf=vnf_dict, kwargs=kwargs)
 
     def process_alarm(self, driver, vnf_dict, kwargs):
-        return self._invoke(driver,
+        return self._invoke('process_alarm', driver,
                             vnf=vnf_dict, kwargs=kwargs)
 
 
@@ -12,12 +12,15 @@
 #    under the License.
 #
 
-import netaddr
+import collections
+import threading
+import time
 
+import netaddr
 from oslo_config import cfg
 from oslo_log import log as logging
-import six.moves.urllib.error as urlerr
-import six.moves.urllib.request as urlreq
+import requests
+from requests import adapters
 
 from tacker._i18n import _
 from tacker.common import log
@@ -31,7 +34,17 @@ OPTS = [
     cfg.IntOpt('timeout', default=1,
                help=_('Number of seconds to wait for a response')),
     cfg.IntOpt('port', default=80,
-               help=_('HTTP port number to send request'))
+               help=_('HTTP port number to send request')),
+    cfg.StrOpt('method', default='GET', choices=['GET', 'HEAD'],
+               help=_('HTTP method of the health check request')),
+    cfg.StrOpt('path', default='/',
+               help=_('Path of the health check request')),
+    cfg.IntOpt('max_pooled_targets', default=1000,
+               help=_('Maximum number of targets to keep an idle '
+                      'keep-alive connection open to')),
+    cfg.IntOpt('latency_samples', default=100,
+               help=_('Number of recent response times kept per target '
+                      'to compute latency percentiles'))
 ]
 cfg.CONF.register_opts(OPTS, 'monitor_http_ping')
 
@@ -54,28 +67,90 @@ class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
         LOG.debug('monitor_url %s', vnf)
         return vnf.get('monitor_url', '')
 
-    def _is_pingable(self, mgmt_ip='', retry=5, timeout=5, port=80, **kwargs):
-        """Checks whether the server is reachable by using urllib.
-
-        Waits for connectivity for `timeout` seconds,
-        and if connection refused, it will retry `retry`
-        times.
+    def __init__(self):
+        super(VNFMonitorHTTPPing, self).__init__()
+        # Connections are pooled per (scheme, host, port) by the adapter,
+        # so consecutive checks of a target reuse its keep-alive connection.
+        self._session = requests.Session()
+        adapter = adapters.HTTPAdapter(
+            pool_connections=cfg.CONF.monitor_http_ping.max_pooled_targets,
+            pool_maxsize=1, max_retries=0)
+        self._session.mount('http://', adapter)
+        # (vnf_id, mgmt_ip) => recent response times, least recently
+        # checked target first.
+        self._latencies = collections.OrderedDict()
+        self._latencies_lock = threading.Lock()
+
+    def _record_latency(self, vnf_id, mgmt_ip, latency):
+        key = (vnf_id, mgmt_ip)
+        with self._latencies_lock:
+            if key not in self._latencies:
+                self._latencies[key] = collections.deque(
+                    maxlen=cfg.CONF.monitor_http_ping.latency_samples)
+                if (len(self._latencies) >
+                        cfg.CONF.monitor_http_ping.max_pooled_targets):
+                    self._latencies.popitem(last=False)
+            self._latencies.move_to_end(key)
+            self._latencies[key].append(latency)
+
+    def get_latency_percentiles(self, vnf_id):
+        """Return the response time percentiles of each VDU of a VNF.
+
+        :param vnf_id: VNF to return the statistics of
+        :return: dict mapping each VDU management IP to a dict with the
+                 number of samples and their 50th, 90th and 99th percentile
+                 in seconds
+        """
+        with self._latencies_lock:
+            samples = {mgmt_ip: sorted(latencies)
+                       for (vnf, mgmt_ip), latencies in
+                       self._latencies.items() if vnf == vnf_id}
+
+        def _percentile(values, percent):
+            return values[min(len(values) - 1,
+                              int(len(values) * percent / 100))]
+
+        return {mgmt_ip: {'count': len(values),
+                          'p50': _percentile(values, 50),
+                          'p90': _percentile(values, 90),
+                          'p99': _percentile(values, 99)}
+                for mgmt_ip, values in samples.items() if values}
+
+    def _is_pingable(self, mgmt_ip='', retry=5, timeout=5, port=80,
+                     method=None, path=None, vnf_id=None, **kwargs):
+        """Checks whether the server is reachable over HTTP.
+
+        Waits for a response for `timeout` seconds, and if the connection
+        fails or an error status is returned, it will retry `retry` times.
         :param mgmt_ip: IP to check
         :param retry: times to reconnect if connection refused
         :param timeout: seconds to wait for connection
         :param port: port number to check connectivity
+        :param method: HTTP method of the request, GET or HEAD
+        :param path: path of the health check request
+        :param vnf_id: VNF the response times are recorded for
         :return: bool - True or False depending on pingability.
         """
-        url = 'http://' + mgmt_ip + ':' + str(port)
+        method = method or cfg.CONF.monitor_http_ping.method
+        path = path or cfg.CONF.monitor_http_ping.path
+        if not path.startswith('/'):
+            path = '/' + path
+        url = 'http://' + mgmt_ip + ':' + str(port) + path
         if netaddr.valid_ipv6(mgmt_ip):
-            url = 'http://[' + mgmt_ip + ']:' + str(port)
+            url = 'http://[' + mgmt_ip + ']:' + str(port) + path
 
         for retry_index in range(int(retry)):
+            started_at = time.monotonic()
             try:
-                urlreq.urlopen(url, timeout=timeout)
-                return True
-            except urlerr.URLError:
+                response = self._session.request(method, url,
+                                                 timeout=timeout)
+                response.raise_for_status()
+            except requests.RequestException:
                 LOG.warning('Unable to reach to the url %s', url)
+                continue
+            self._record_latency(vnf_id, mgmt_ip,
+                                 time.monotonic() - started_at)
+            return True
         return 'failure'
 
     @log.log
@@ -83,4 +158,4 @@ class VNFMonitorHTTPPing(abstract_driver.VNFMonitorAbstractDriver):
         if not kwargs['mgmt_ip']:
             return
 
-        return self._is_pingable(**kwargs)
+        return self._is_pingable(vnf_id=vnf.get('id'), **kwargs)
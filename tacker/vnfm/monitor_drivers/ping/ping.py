@@ -12,13 +12,11 @@
 #    under the License.
 #
 
-import netaddr
-
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from tacker._i18n import _
-from tacker.agent.linux import utils as linux_utils
+from tacker.agent.linux import icmp
 from tacker.common import log
 from tacker.vnfm.monitor_drivers import abstract_driver
 
@@ -59,16 +57,12 @@ class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
                      interval=None, retry=None, **kwargs):
         """Checks whether an IP address is reachable by pinging.
 
-        Use linux utils to execute the ping (ICMP ECHO) command.
-        Sends 5 packets with an interval of 1 seconds and timeout of 1
-        seconds. Runtime error implies unreachability else IP is pingable.
+        Sends ICMP ECHO requests from an unprivileged ICMP socket, or runs
+        the ping command if such a socket is not available. Sends 5 packets
+        with an interval of 1 seconds and timeout of 1 seconds by default.
         :param ip: IP to check
         :return: bool - True or string 'failure' depending on pingability.
         """
-        cmd_ping = 'ping'
-        if netaddr.valid_ipv6(mgmt_ip):
-            cmd_ping = 'ping6'
-
         if not count:
             count = cfg.CONF.monitor_ping.count
         if not timeout:
@@ -78,18 +72,10 @@ class VNFMonitorPing(abstract_driver.VNFMonitorAbstractDriver):
         if not retry:
             retry = cfg.CONF.monitor_ping.retry
 
-        ping_cmd = [cmd_ping,
-                    '-c', count,
-                    '-W', timeout,
-                    '-i', interval,
-                    mgmt_ip]
-
         for retry_range in range(int(retry)):
-            try:
-                linux_utils.execute(ping_cmd, check_exit_code=True)
+            if icmp.ping([mgmt_ip], count, timeout, interval)[mgmt_ip]:
                 return True
-            except RuntimeError:
-                LOG.warning("Cannot ping ip address: %s", mgmt_ip)
+            LOG.warning("Cannot ping ip address: %s", mgmt_ip)
         return 'failure'
 
     @log.log
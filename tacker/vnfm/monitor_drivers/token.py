@@ -11,9 +11,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import threading
+
 from keystoneauth1.identity import v3
 from keystoneauth1 import session
 
+# Sessions keyed by the credentials they were created with. The auth
+# plugin of a session keeps its token until it is about to expire, so that
+# Keystone is only called again to renew it.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 class Token(object):
     def __init__(self, username, password, project_name,
@@ -25,13 +33,24 @@ class Token(object):
         self.user_domain_name = user_domain_name
         self.project_domain_name = project_domain_name
 
+    def _get_session(self):
+        key = (self.auth_url, self.username, self.password,
+               self.project_name, self.user_domain_name,
+               self.project_domain_name)
+        with _sessions_lock:
+            sess = _sessions.get(key)
+            if sess is None:
+                auth = v3.Password(
+                    auth_url=self.auth_url,
+                    username=self.username,
+                    password=self.password,
+                    project_name=self.project_name,
+                    user_domain_name=self.user_domain_name,
+                    project_domain_name=self.project_domain_name)
+                sess = _sessions[key] = session.Session(auth=auth)
+        return sess
+
     def create_token(self):
-        auth = v3.Password(auth_url=self.auth_url,
-                           username=self.username,
-                           password=self.password,
-                           project_name=self.project_name,
-                           user_domain_name=self.user_domain_name,
-                           project_domain_name=self.project_domain_name)
-        sess = session.Session(auth=auth)
+        sess = self._get_session()
         token_id = sess.auth.get_token(sess)
         return token_id
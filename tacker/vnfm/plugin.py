@@ -14,7 +14,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import inspect
 import six
 import yaml
 
@@ -67,47 +66,54 @@ class VNFMMgmtMixin(object):
         self._mgmt_manager = driver_manager.DriverManager(
             'tacker.tacker.mgmt.drivers', cfg.CONF.tacker.mgmt_driver)
 
-    def _invoke(self, vnf_dict, **kwargs):
-        method = inspect.stack()[1][3]
+    def _invoke(self, method, vnf_dict, **kwargs):
         return self._mgmt_manager.invoke(
             self._mgmt_driver_name(vnf_dict), method, **kwargs)
 
     def mgmt_create_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_create_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_create_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_create_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_update_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_update_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_update_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_update_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_delete_pre(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_delete_pre', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_delete_post(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_delete_post', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_get_config(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_get_config', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_ip_address(self, context, vnf_dict):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict)
+            'mgmt_ip_address', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict)
 
     def mgmt_call(self, context, vnf_dict, kwargs):
         return self._invoke(
-            vnf_dict, plugin=self, context=context, vnf=vnf_dict,
-            kwargs=kwargs)
+            'mgmt_call', vnf_dict, plugin=self, context=context,
+            vnf=vnf_dict, kwargs=kwargs)
 
 
 class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
@@ -148,16 +154,27 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
         self._vnf_alarm_monitor = monitor.VNFAlarmMonitor()
         self._vnf_reservation_monitor = monitor.VNFReservationAlarmMonitor()
         self._vnf_app_monitor = monitor.VNFAppMonitor()
-        self._init_monitoring()
+        # NOTE: Register the VNFs in the monitor in background so that the
+        # API does not wait for it to start serving.
+        self.spawn_n(self._init_monitoring)
 
     def _init_monitoring(self):
-        context = t_context.get_admin_context()
-        vnfs = self.get_vnfs(context)
+        try:
+            self._vnf_monitor.load_hosting_vnfs(self._get_hosting_vnfs)
+        except Exception:
+            LOG.exception("Failed to add VNFs to the monitor")
+
+    def _get_hosting_vnfs(self):
+        """Return the hosting VNFs of all the monitored VNFs."""
+        vnfs = self.get_monitored_vnfs(t_context.get_admin_context())
+        hosting_vnfs = []
         for vnf in vnfs:
             # Add tenant_id in context object as it is required
             # to get VIM in monitoring.
+            context = t_context.get_admin_context()
             context.tenant_id = vnf['tenant_id']
-            self.add_vnf_to_monitor(context, vnf)
+            hosting_vnfs.append(self._to_hosting_vnf(context, vnf))
+        return hosting_vnfs
 
     def spawn_n(self, function, *args, **kwargs):
         self._pool.spawn_n(function, *args, **kwargs)
@@ -238,20 +255,28 @@ class VNFMPlugin(vnfm_db.VNFMPluginDb, VNFMMgmtMixin):
 
         LOG.debug('vnfd %s', vnfd)
 
+    def _to_hosting_vnf(self, context, vnf_dict):
+        def action_cb(action, **kwargs):
+            LOG.debug('policy action: %s', action)
+            if 'vnfd' not in hosting_vnf['vnf']:
+                # NOTE: VNFs added to the monitor by _init_monitoring() only
+                # carry their monitoring policy, load the whole VNF before
+                # the policy action uses it.
+                hosting_vnf['vnf'] = self.get_vnf(context, hosting_vnf['id'])
+            self._vnf_action.invoke(
+                action, 'execute_action', plugin=self, context=context,
+                vnf_dict=hosting_vnf['vnf'], args=kwargs)
+
+        hosting_vnf = self._vnf_monitor.to_hosting_vnf(vnf_dict, action_cb)
+        LOG.debug('hosting_vnf: %s', hosting_vnf)
+        return hosting_vnf
+
     def add_vnf_to_monitor(self, context, vnf_dict):
         dev_attrs = vnf_dict['attributes']
         mgmt_ip_address = vnf_dict['mgmt_ip_address']
         if 'monitoring_policy' in dev_attrs and mgmt_ip_address:
-            def action_cb(action, **kwargs):
-                LOG.debug('policy action: %s', action)
-                self._vnf_action.invoke(
-                    action, 'execute_action', plugin=self, context=context,
-                    vnf_dict=hosting_vnf['vnf'], args=kwargs)
-
-            hosting_vnf = self._vnf_monitor.to_hosting_vnf(
-                vnf_dict, action_cb)
-            LOG.debug('hosting_vnf: %s', hosting_vnf)
-            self._vnf_monitor.add_hosting_vnf(hosting_vnf)
+            self._vnf_monitor.add_hosting_vnf(
+                self._to_hosting_vnf(context, vnf_dict))
 
     def add_alarm_url_to_vnf(self, context, vnf_dict):
         vnfd_yaml = vnf_dict['vnfd']['attributes'].get('vnfd', '')
@@ -20,15 +20,40 @@
 
 from oslo_utils import timeutils
 
+import tacker.conf
 from tacker.db.common_services import common_services_db_plugin
+from tacker.db.common_services import event_writer
 from tacker.plugins.common import constants
 
+CONF = tacker.conf.CONF
+
 
 def log_events(context, vnf_dict, evt_type, evt_details):
+    event = {'res_id': vnf_dict['id'],
+             'res_type': constants.RES_TYPE_VNF,
+             'res_state': vnf_dict['status'],
+             'evt_type': evt_type,
+             'tstamp': timeutils.utcnow(),
+             'details': evt_details}
+    if CONF.events.async_write:
+        event_writer.get_writer().write(event)
+        return
+    _cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
+    _cos_db_plg.create_event(context, **event)
+
+
+def log_events_bulk(context, events):
+    """Write many VNF events with a single multi-row INSERT.
+
+    :param events: list of (vnf_dict, evt_type, evt_details) tuples
+    """
     _cos_db_plg = common_services_db_plugin.CommonServicesPluginDb()
-    _cos_db_plg.create_event(context, res_id=vnf_dict['id'],
-                             res_type=constants.RES_TYPE_VNF,
-                             res_state=vnf_dict['status'],
-                             evt_type=evt_type,
-                             tstamp=timeutils.utcnow(),
-                             details=evt_details)
+    tstamp = timeutils.utcnow()
+    _cos_db_plg.create_events(context, [
+        {'res_id': vnf_dict['id'],
+         'res_type': constants.RES_TYPE_VNF,
+         'res_state': vnf_dict['status'],
+         'evt_type': evt_type,
+         'tstamp': tstamp,
+         'details': evt_details}
+        for vnf_dict, evt_type, evt_details in events])
@@ -13,14 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+import hashlib
 import os
+import threading
 
 from cryptography import fernet
-from oslo_config import cfg
 from oslo_log import log as logging
-
+from oslo_serialization import jsonutils
 
 from tacker.common import utils
+import tacker.conf
 from tacker import context as t_context
 from tacker.extensions import nfvo
 from tacker.keymgr import API as KEYMGR_API
@@ -28,7 +31,42 @@ from tacker import manager
 from tacker.plugins.common import constants
 
 LOG = logging.getLogger(__name__)
-CONF = cfg.CONF
+CONF = tacker.conf.CONF
+
+# Decrypted auth of VIMs keyed by VIM id and a fingerprint of the encrypted
+# auth, so that they are decrypted again once the VIM is updated or its
+# credentials are encrypted with another key. Never written to disk.
+_auth_cache = None
+_auth_cache_lock = threading.Lock()
+
+
+def _get_auth_cache():
+    global _auth_cache
+    if not CONF.vim_client.auth_cache_size:
+        return None
+    if _auth_cache is None:
+        with _auth_cache_lock:
+            if _auth_cache is None:
+                _auth_cache = utils.LRUCache(
+                    CONF.vim_client.auth_cache_size,
+                    ttl=CONF.vim_client.auth_cache_ttl)
+    return _auth_cache
+
+
+def _get_auth_cache_key(vim_info):
+    fingerprint = hashlib.sha256(jsonutils.dump_as_bytes(
+        [vim_info['auth_url'], vim_info['auth_cred']],
+        sort_keys=True)).hexdigest()
+    return (vim_info['id'], fingerprint)
+
+
+def invalidate_vim_auth(vim_id):
+    """Drop the decrypted auth of a VIM."""
+    if _auth_cache is None:
+        return
+    for key in _auth_cache.keys():
+        if key[0] == vim_id:
+            _auth_cache.pop(key)
 
 
 class VimClient(object):
@@ -74,6 +112,17 @@ class VimClient(object):
         LOG.debug('VIM id is %s', vim_info['id'])
         vim_auth = vim_info['auth_cred']
 
+        cache = _get_auth_cache()
+        if cache is not None:
+            cache_key = _get_auth_cache_key(vim_info)
+            cached_auth = cache.get(cache_key)
+            if cached_auth is not None:
+                # Callers update the auth, e.g. with the path of the CA
+                # certificate file, which must not leak into the cache.
+                vim_auth.clear()
+                vim_auth.update(copy.deepcopy(cached_auth))
+                return vim_auth
+
         # decode password
         if ('password' in vim_auth) and (vim_auth['password'] is not None):
             vim_auth['password'] = self._decode_vim_auth(vim_info['id'],
@@ -100,6 +149,8 @@ class VimClient(object):
         for attr in needless_attrs:
             if attr in vim_auth:
                 vim_auth.pop(attr, None)
+        if cache is not None:
+            cache.set(cache_key, copy.deepcopy(vim_auth))
         return vim_auth
 
     def _decode_vim_auth(self, vim_id, auth, secret_value):
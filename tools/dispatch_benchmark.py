@@ -0,0 +1,69 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of monitor and mgmt driver dispatch.
+
+Compares the per-call cost of finding the driver method name with
+``inspect.stack()``, as the monitors and VNFMMgmtMixin used to do, with
+passing the method name explicitly as they do now.
+
+Usage: python tools/dispatch_benchmark.py [number-of-calls]
+"""
+
+import inspect
+import sys
+import timeit
+
+from tacker.common import driver_manager
+
+
+class FakeDriver(object):
+
+    def monitor_call(self, vnf, kwargs):
+        return True
+
+
+class Dispatcher(object):
+
+    def __init__(self):
+        self._manager = driver_manager.DriverManager.__new__(
+            driver_manager.DriverManager)
+        self._manager._drivers = {'fake': FakeDriver()}
+
+    def _invoke_by_stack(self, driver, **kwargs):
+        method = inspect.stack()[1][3]
+        return self._manager.invoke(driver, method, **kwargs)
+
+    def _invoke(self, method, driver, **kwargs):
+        return self._manager.invoke(driver, method, **kwargs)
+
+    def monitor_call(self, driver, vnf_dict, kwargs):
+        return self._invoke('monitor_call', driver,
+                            vnf=vnf_dict, kwargs=kwargs)
+
+
+class StackDispatcher(Dispatcher):
+
+    def monitor_call(self, driver, vnf_dict, kwargs):
+        return self._invoke_by_stack(driver, vnf=vnf_dict, kwargs=kwargs)
+
+
+def main(number):
+    for name, dispatcher in (('inspect.stack()', StackDispatcher()),
+                             ('explicit method name', Dispatcher())):
+        elapsed = timeit.timeit(
+            lambda: dispatcher.monitor_call('fake', {}, {}), number=number)
+        print('%-22s %10.2f us/call' % (name, elapsed / number * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Download the content of a VNF package in parallel byte ranges.
+
+The package is split in N ranges fetched concurrently with the Range header
+of GET /vnfpkgm/v1/vnf_packages/{id}/package_content, each range being
+written at its offset in the output file. The checksum of the output file
+is then compared with the checksum of the VNF package.
+
+Usage: python tools/fetch_vnf_package.py <tacker-endpoint> <token>
+           <vnf-package-id> <output-file> [number-of-ranges]
+
+For example:
+    python tools/fetch_vnf_package.py http://localhost:9890 \\
+        $(openstack token issue -f value -c id) \\
+        f26f181d-7891-4720-b022-b074ec1733ef package.zip 4
+"""
+
+from concurrent import futures
+import hashlib
+import sys
+
+import requests
+
+CHUNK_SIZE = 65536
+
+
+def _get_package(session, url):
+    resp = session.get(url)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _get_size(session, content_url):
+    resp = session.get(content_url, headers={'Range': 'bytes=0-0'},
+                       stream=True)
+    resp.raise_for_status()
+    resp.close()
+    if resp.status_code != 206:
+        return int(resp.headers['Content-Length'])
+    # Content-Range: bytes 0-0/<size>
+    return int(resp.headers['Content-Range'].rsplit('/', 1)[1])
+
+
+def _split(size, count):
+    if not size:
+        return []
+    count = max(1, min(count, size))
+    step = -(-size // count)
+    return [(start, min(start + step, size) - 1)
+            for start in range(0, size, step)]
+
+
+def _fetch_range(session, content_url, output_file, start, end):
+    resp = session.get(content_url,
+                       headers={'Range': 'bytes=%d-%d' % (start, end)},
+                       stream=True)
+    resp.raise_for_status()
+    if resp.status_code != 206:
+        raise RuntimeError('Range requests are not supported by the server')
+    offset = start
+    with open(output_file, 'r+b') as f:
+        f.seek(offset)
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            f.write(chunk)
+            offset += len(chunk)
+    if offset != end + 1:
+        raise RuntimeError('Incomplete range %d-%d: got %d bytes'
+                           % (start, end, offset - start))
+
+
+def _checksum(output_file, algorithm):
+    hash_ = hashlib.new(algorithm)
+    with open(output_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
+
+def fetch_vnf_package(endpoint, token, package_id, output_file,
+                      range_count=4):
+    """Download a VNF package and verify its checksum.
+
+    :raises RuntimeError: if the checksum of the downloaded file does not
+                          match the checksum of the VNF package
+    """
+    url = '%s/vnfpkgm/v1/vnf_packages/%s' % (endpoint.rstrip('/'),
+                                             package_id)
+    content_url = url + '/package_content'
+    session = requests.Session()
+    session.headers['X-Auth-Token'] = token
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=range_count)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    checksum = _get_package(session, url)['checksum']
+    size = _get_size(session, content_url)
+    with open(output_file, 'wb') as f:
+        f.truncate(size)
+
+    with futures.ThreadPoolExecutor(max_workers=range_count) as executor:
+        tasks = [executor.submit(_fetch_range, session, content_url,
+                                 output_file, start, end)
+                 for start, end in _split(size, range_count)]
+        for task in futures.as_completed(tasks):
+            task.result()
+
+    actual = _checksum(output_file, checksum['algorithm'])
+    if actual != checksum['hash']:
+        raise RuntimeError('Checksum mismatch: expected %s, got %s'
+                           % (checksum['hash'], actual))
+    return size
+
+
+def main():
+    if len(sys.argv) not in (5, 6):
+        sys.exit(__doc__)
+    range_count = int(sys.argv[5]) if len(sys.argv) == 6 else 4
+    size = fetch_vnf_package(sys.argv[1], sys.argv[2], sys.argv[3],
+                             sys.argv[4], range_count)
+    print('Downloaded %d bytes to %s in %d ranges, checksum verified'
+          % (size, sys.argv[4], range_count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro-benchmark of the validation of instantiate request bodies.
+
+Compares the per-request cost of building the validator of the vnflcm
+instantiate schema for each request, as tacker.api.validation.schema used
+to do, with reusing the validator built when the API method is decorated,
+as it does now.
+
+Usage: python tools/validation_benchmark.py [number-of-requests]
+                                            [number-of-extVirtualLinks]
+"""
+
+import sys
+import timeit
+
+from tacker.api.schemas import vnf_lcm
+from tacker.api import validation
+from tacker.api.validation import validators
+
+
+def _instantiate_body(ext_virtual_links):
+    return {
+        'flavourId': 'simple',
+        'instantiationLevelId': 'instantiation_level_1',
+        'extVirtualLinks': [{
+            'id': 'ext-vl-%d' % i,
+            'resourceId': 'net-%d' % i,
+            'extCps': [{
+                'cpdId': 'CP%d' % i,
+                'cpConfig': [{'linkPortId': 'port-%d' % i}]}],
+            'extLinkPorts': [{
+                'id': 'port-%d' % i,
+                'resourceHandle': {'resourceId': 'port-%d' % i}}]}
+            for i in range(ext_virtual_links)],
+        'vimConnectionInfo': [{
+            'id': 'vim-connection',
+            'vimId': 'vim',
+            'vimType': 'openstack'}],
+        'additionalParams': {'key': 'value'},
+    }
+
+
+def _validate_with_new_validator(body):
+    validators._SchemaValidator(vnf_lcm.instantiate).validate(body)
+
+
+@validation.schema(vnf_lcm.instantiate)
+def _validate_with_decorator(body):
+    pass
+
+
+def main(number, ext_virtual_links):
+    body = _instantiate_body(ext_virtual_links)
+    for name, func in (
+            ('validator per request', _validate_with_new_validator),
+            ('validator per schema',
+             lambda body: _validate_with_decorator(body=body))):
+        elapsed = timeit.timeit(lambda: func(body), number=number)
+        print('%-22s %10.2f us/request' % (
+            name, elapsed / number * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)